@@ -1,8 +1,26 @@
+import json
+import time
 from typing import Dict, List
 
 from .config import Settings
 from .providers import build_chat_provider
 
+DEFAULT_TOPIC = "Is artificial consciousness possible?"
+
+_TOPIC_PROMPT = (
+    "You are the administrator of a simulation. "
+    "Generate a controversial, philosophical, or complex topic for a group of AI agents to debate. "
+    "The topic should be engaging and open to interpretation. "
+    "Output ONLY the topic sentence, nothing else."
+)
+
+_TOPIC_MESSAGES = (
+    {"role": "system", "content": "You produce a single topic sentence."},
+    {"role": "user", "content": _TOPIC_PROMPT},
+)
+
+_BATCH_TERMINAL_STATES = frozenset({"completed", "failed", "expired", "cancelled"})
+
 
 class AdminAgent:
     """
@@ -21,28 +39,107 @@ class AdminAgent:
 
     def generate_topic(self) -> str:
         """Generate a debate topic."""
-        prompt = (
-            "You are the administrator of a simulation. "
-            "Generate a controversial, philosophical, or complex topic for a group of AI agents to debate. "
-            "The topic should be engaging and open to interpretation. "
-            "Output ONLY the topic sentence, nothing else."
-        )
-
-        messages = [
-            {"role": "system", "content": "You produce a single topic sentence."},
-            {"role": "user", "content": prompt},
-        ]
-
         try:
             return self.provider.chat(
                 model=self.settings.default_chat_model,
-                messages=messages,
+                messages=list(_TOPIC_MESSAGES),
                 temperature=1.1,
                 max_tokens=64,
             ).strip()
         except Exception as exc:
             print(f"Error generating topic: {exc}")
-            return "Is artificial consciousness possible?"
+            return DEFAULT_TOPIC
+
+    def generate_topics_batch(
+        self,
+        n: int,
+        urgent: bool = False,
+        poll_interval: float = 30.0,
+        timeout: float = 24 * 3600,
+    ) -> List[str]:
+        """
+        Generate several debate topics through the OpenAI Batch API.
+
+        Batch requests are billed at a discount but may take up to 24 hours,
+        so this is meant for pre-populating a topic queue offline. With
+        ``urgent`` set, or if the batch fails or times out, topics are
+        generated synchronously instead.
+
+        Args:
+            n: Number of topics to generate
+            urgent: Skip the Batch API and call generate_topic n times
+            poll_interval: Seconds between batch status checks
+            timeout: Give up on the batch after this many seconds
+
+        Returns:
+            List of n topic sentences
+        """
+        if n <= 0:
+            return []
+        client = getattr(self.provider, "client", None)
+        if urgent or client is None:
+            return [self.generate_topic() for _ in range(n)]
+
+        body = {
+            "model": self.settings.default_chat_model,
+            "messages": list(_TOPIC_MESSAGES),
+            "temperature": 1.1,
+            "max_tokens": 64,
+        }
+        requests_jsonl = "\n".join(
+            json.dumps(
+                {
+                    "custom_id": f"topic-{i}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": body,
+                }
+            )
+            for i in range(n)
+        )
+
+        topics: Dict[int, str] = {}
+        try:
+            input_file = client.files.create(
+                file=("topics.jsonl", requests_jsonl.encode()), purpose="batch"
+            )
+            batch = client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+
+            deadline = time.monotonic() + timeout
+            while batch.status not in _BATCH_TERMINAL_STATES:
+                if time.monotonic() >= deadline:
+                    client.batches.cancel(batch.id)
+                    break
+                time.sleep(poll_interval)
+                batch = client.batches.retrieve(batch.id)
+
+            if batch.status == "completed" and batch.output_file_id:
+                output = client.files.content(batch.output_file_id).text
+                for line in output.splitlines():
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    response = record.get("response") or {}
+                    if response.get("status_code") != 200:
+                        continue
+                    choices = response.get("body", {}).get("choices") or []
+                    content = choices[0]["message"]["content"] if choices else ""
+                    if content and content.strip():
+                        index = int(record["custom_id"].rsplit("-", 1)[1])
+                        topics[index] = content.strip()
+            else:
+                print(f"Topic batch ended with status '{batch.status}'")
+        except Exception as exc:
+            print(f"Error generating topics via batch: {exc}")
+
+        # Fill anything the batch did not produce synchronously
+        return [
+            topics[i] if i in topics else self.generate_topic() for i in range(n)
+        ]
 
     def generate_response(
         self, topic: str, conversation_history: List[Dict[str, str]]
@@ -1,7 +1,14 @@
 import asyncio
+import functools
 import json
 import logging
-from typing import Dict, List, Optional, Tuple
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 from .config import Settings
 from .logger_config import get_logger, log_execution_time
@@ -12,17 +19,85 @@ from .providers import (
     build_chat_provider,
     build_embedding_provider,
 )
+from .semantic_cache import SemanticCache, make_cache_key
 from .tts import TTSClient
-from .utils import approximate_tokens, clean_placeholders, trim_messages_to_context
+from .utils import (
+    HistoryFormatter,
+    approximate_tokens,
+    clean_placeholders,
+    file_cache_key,
+    read_json_file,
+    read_json_file_cached,
+    trim_messages_to_context,
+)
 
 logger = get_logger(__name__)
 
+PROFILE_METADATA_KEYS = ("name", "model", "api", "speak_model")
+
+# Replies are only reused for near-deterministic agents, so caching does not
+# flatten the variety of higher-temperature debates
+RESPONSE_CACHE_MAX_TEMPERATURE = 0.3
+RESPONSE_CACHE_HISTORY_TAIL = 6
+
+# Fixed prompt segments. _build_messages is the one place agent prompts are
+# rendered; changing these text constants changes every cached prompt prefix.
+_TOPIC_HEADER = "Topic:\n"
+_HISTORY_HEADER = "Conversation so far:\n"
+_MEMORY_HEADER = "Relevant memories:\n"
+_NO_MEMORY_BLOCK = "Relevant memories: (none)"
+
+
+def load_profile_data(profile_path: str) -> Dict[str, Any]:
+    """Parse a profile JSON file, reusing the result until the file changes.
+
+    The returned dict is shared between callers and must not be mutated.
+    """
+    return read_json_file_cached(profile_path)
+
+
+@functools.lru_cache(maxsize=256)
+def _profile_metadata_cached(
+    profile_path: str, mtime_ns: int, size: int
+) -> Dict[str, Any]:
+    wanted = set(PROFILE_METADATA_KEYS)
+    found: Dict[str, Any] = {}
+    if ijson is not None:
+        with open(profile_path, "rb") as f:
+            for key, value in ijson.kvitems(f, "", use_float=True):
+                if key in wanted:
+                    found[key] = value
+                    if len(found) == len(wanted):
+                        break
+    else:
+        data = read_json_file(profile_path)
+        found = {key: data[key] for key in PROFILE_METADATA_KEYS if key in data}
+    return {key: found.get(key) for key in PROFILE_METADATA_KEYS}
+
+
+def get_profile_metadata(profile_path: str) -> Dict[str, Any]:
+    """Return only the top-level keys the UI lists for a profile.
+
+    With ijson installed the file is streamed and parsing stops as soon as
+    all keys have been seen, so long ``conversing`` prompts are never
+    materialised. Otherwise the whole profile is parsed in one go.
+    Results are cached until the file's mtime or size changes.
+    """
+    return dict(
+        _profile_metadata_cached(profile_path, *file_cache_key(profile_path))
+    )
+
 
 class ChatAgent:
+    response_cache: Optional[SemanticCache] = None
+    _topic_prompt: Tuple[Optional[str], str] = (None, "")
+    _prompt_cache_key: Optional[str] = None
+
     def __init__(self, name: str, config_file: str, settings: Settings):
         self.name = name
         self.settings = settings
         self.config_file = config_file
+        self._history_formatter = HistoryFormatter()
         logger.debug(f"🤖 Initializing ChatAgent: {name}")
 
         self.load_profile(config_file)
@@ -58,6 +133,12 @@ class ChatAgent:
             embedding_provider=self.embedding_provider,
         )
 
+        if settings.response_cache_enabled:
+            self.response_cache = SemanticCache(
+                embed_fn=self.embedding_provider.embed,
+                threshold=settings.response_cache_threshold,
+            )
+
         self.tts_client = None
         if settings.tts_enabled:
             logger.debug(f"🔊 Initializing TTS client")
@@ -74,11 +155,11 @@ class ChatAgent:
         logger.info(f"✅ ChatAgent '{name}' initialized successfully")
 
     def load_profile(self, config_file: str) -> None:
-        import os
-
-        with open(config_file, "r") as f:
-            data = json.load(f)
+        data = load_profile_data(config_file)
         self.full_name = data.get("name", self.name)
+        self._reply_instruction = (
+            f"Respond as {self.full_name} with a clear, direct reply."
+        )
         self.model = data.get("model")
         self.api = data.get("api", "ollama")
         self.api_url = data.get("url")
@@ -88,7 +169,7 @@ class ChatAgent:
         if not self.api_key and data.get("api_key_env"):
             self.api_key = os.getenv(data.get("api_key_env"))
 
-        self.params = data.get("params", {})
+        self.params = dict(data.get("params", {}))
 
         # Per-agent overrides
         self.sleep_seconds = data.get("sleep_seconds")
@@ -97,12 +178,12 @@ class ChatAgent:
             "max_output_tokens", data.get("max_tokens")
         )
 
-        self.system_prompt = clean_placeholders(data.get("conversing", ""))
-
         # Add extra_prompt if provided in profile
+        system_prompt = clean_placeholders(data.get("conversing", ""))
         extra_prompt = data.get("extra_prompt", "")
-        if extra_prompt:
-            self.system_prompt += "\n" + extra_prompt
+        self.system_prompt = (
+            f"{system_prompt}\n{extra_prompt}" if extra_prompt else system_prompt
+        )
 
         # Per-agent memory and context settings
         self.memory_top_k = data.get("memory_top_k")  # Optional override
@@ -110,8 +191,8 @@ class ChatAgent:
 
         # MCP configuration
         self.mcp_command = data.get("mcp_command")
-        self.mcp_args = data.get("mcp_args", [])
-        self.allowed_tools = data.get("allowed_tools", [])
+        self.mcp_args = list(data.get("mcp_args", []))
+        self.allowed_tools = list(data.get("allowed_tools", []))
 
         speak_model = data.get("speak_model", {})
         if speak_model:
@@ -180,6 +261,17 @@ class ChatAgent:
     def _build_messages(
         self, topic: str, conversation_history: List[Dict[str, str]]
     ) -> List[Dict[str, str]]:
+        """
+        Render the prompt for one turn.
+
+        This is the canonical prompt renderer. Messages go from most to
+        least stable (system, topic, history, memory, reply instruction), so
+        consecutive turns share a byte-identical prefix that provider prompt
+        caches can reuse. Edits must keep that ordering.
+
+        Over the context budget, memory snippets are dropped first and then
+        the history; the system prompt, topic and reply instruction stay.
+        """
         memory_query = topic
         if conversation_history:
             memory_query += "\n" + "\n".join(
@@ -198,27 +290,25 @@ class ChatAgent:
             for item in memory_snippets
         )
 
-        history_lines = [
-            f"{msg['sender']}: {msg['content']}" for msg in conversation_history
-        ]
-        history_text = "\n".join(history_lines)
+        history_text = self._history_formatter.format(conversation_history)
+
+        memory_block = _MEMORY_HEADER + memory_text if memory_text else _NO_MEMORY_BLOCK
+
+        # The topic only changes on a topic switch; render it once per topic
+        if self._topic_prompt[0] != topic:
+            self._topic_prompt = (topic, _TOPIC_HEADER + topic)
+            # Turns on the same topic share a prefix; key them to one cache
+            topic_hash = make_cache_key(topic)[:16]
+            self._prompt_cache_key = f"chatmode:{self.name}:{topic_hash}"
 
         messages = [
             {"role": "system", "content": self.system_prompt},
-            {
-                "role": "system",
-                "content": (
-                    f"Long-term memory snippets:\n{memory_text}"
-                    if memory_text
-                    else "Long-term memory snippets: (none)"
-                ),
-            },
-            {"role": "user", "content": f"Topic:\n{topic}"},
-            {"role": "user", "content": f"Conversation so far:\n{history_text}"},
-            {
-                "role": "user",
-                "content": f"Respond as {self.full_name} with a clear, direct reply.",
-            },
+            {"role": "user", "content": self._topic_prompt[1]},
+            {"role": "user", "content": _HISTORY_HEADER + history_text},
+            # A user turn: chat templates that only allow a leading system
+            # message (Mistral, Gemma, Llama) reject a later one
+            {"role": "user", "content": memory_block},
+            {"role": "user", "content": self._reply_instruction},
         ]
 
         # Use per-agent max_context_tokens if set, otherwise use global setting
@@ -227,6 +317,11 @@ class ChatAgent:
             if self.max_context_tokens is not None
             else self.settings.max_context_tokens
         )
+        total = sum(approximate_tokens(msg["content"]) for msg in messages)
+        for index in (3, 2):  # memory, then history
+            if total <= max_tokens:
+                break
+            total -= approximate_tokens(messages.pop(index)["content"])
         return trim_messages_to_context(
             messages,
             max_tokens=max_tokens,
@@ -251,26 +346,14 @@ class ChatAgent:
             else:
                 return {}
         except (json.JSONDecodeError, TypeError) as e:
-            print(f"Warning: Failed to parse tool arguments: {e}")
+            logger.warning("Failed to parse tool arguments: %s", e)
             return {}
 
     @log_execution_time(logger, logging.DEBUG)
     def generate_response(
         self, topic: str, conversation_history: List[Dict[str, str]]
     ) -> Tuple[str, Optional[str]]:
-        logger.debug(f"📝 Generating response for topic: {topic[:50]}...")
-        messages = self._build_messages(topic, conversation_history)
-
-        # Prepare tools if MCP client is configured
-        tools = None
-        if self.mcp_client and self.allowed_tools:
-            try:
-                tools = asyncio.run(
-                    self.mcp_client.get_openai_tools(allowed_tools=self.allowed_tools)
-                )
-            except Exception as e:
-                print(f"Warning: Failed to get MCP tools: {e}")
-
+        logger.debug("📝 Generating response for topic: %.50s...", topic)
         temperature = (
             self.temperature_override
             if isinstance(self.temperature_override, (int, float))
@@ -282,6 +365,30 @@ class ChatAgent:
             else self.settings.max_output_tokens
         )
 
+        cache_key, cache_text, cache_guard = self._response_cache_key(
+            topic, conversation_history, temperature
+        )
+        cache_embedding = None
+        if cache_key is not None:
+            cached, cache_embedding = self.response_cache.lookup(
+                cache_key, cache_text, cache_guard
+            )
+            if cached is not None:
+                logger.debug("♻️  Response cache hit for %s", self.name)
+                return self._finalize_response(cached)
+
+        messages = self._build_messages(topic, conversation_history)
+
+        # Prepare tools if MCP client is configured
+        tools = None
+        if self.mcp_client and self.allowed_tools:
+            try:
+                tools = asyncio.run(
+                    self.mcp_client.get_openai_tools(allowed_tools=self.allowed_tools)
+                )
+            except Exception as e:
+                logger.warning("Failed to get MCP tools for %s: %s", self.name, e)
+
         completion = self.chat_provider.chat(
             model=self.model or self.settings.default_chat_model,
             messages=messages,
@@ -290,6 +397,7 @@ class ChatAgent:
             options=self.params,
             tools=tools,
             tool_choice="auto" if tools else None,
+            cache_key=self._prompt_cache_key,
         )
 
         # Check for tool calls using the robust pattern from problem statement
@@ -363,6 +471,7 @@ class ChatAgent:
                 max_tokens=max_tokens,
                 options=self.params,
                 # Explicitly no tools on second call
+                cache_key=self._prompt_cache_key,
             )
 
         # Extract final response content
@@ -373,6 +482,44 @@ class ChatAgent:
             elif isinstance(completion, str):
                 response = completion
 
+        if cache_key is not None and response:
+            # Reuse the lookup's embedding so a turn embeds at most once
+            self.response_cache.put(
+                cache_key, response, embedding=cache_embedding, guard=cache_guard
+            )
+
+        return self._finalize_response(response)
+
+    def _response_cache_key(
+        self,
+        topic: str,
+        conversation_history: List[Dict[str, str]],
+        temperature: float,
+    ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """
+        Cache key, lookup text and similarity guard for this turn.
+
+        The guard is the latest message. The next turn's window overlaps
+        this one almost entirely, so without it a similarity match would
+        replay the agent's previous reply. Returns (None, None, None) if
+        the turn is not cached.
+        """
+        if (
+            self.response_cache is None
+            or temperature > RESPONSE_CACHE_MAX_TEMPERATURE
+            or (self.mcp_client and self.allowed_tools)
+        ):
+            return None, None, None
+        tail = [
+            f"{msg['sender']}: {msg['content']}"
+            for msg in conversation_history[-RESPONSE_CACHE_HISTORY_TAIL:]
+        ]
+        cache_text = topic + "\n" + "\n".join(tail)
+        key = make_cache_key(self.name, self.model or "", self.system_prompt, cache_text)
+        return key, cache_text, tail[-1] if tail else ""
+
+    def _finalize_response(self, response: str) -> Tuple[str, Optional[str]]:
+        """Run legacy TTS on the reply and normalise it for the session."""
         output_path = None
         if self.settings.tts_enabled and self.tts_client:
             output_path = self.tts_client.speak(
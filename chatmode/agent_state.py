@@ -51,6 +51,19 @@ class AgentStateInfo:
         }
 
 
+async def _wait_cancelled(task: asyncio.Task, timeout: float = 5.0) -> None:
+    """
+    Give a cancelled task time to unwind.
+
+    Called after the state lock is released: the task's own cleanup calls
+    set_task(), and state polling should not stall behind the wait.
+    """
+    try:
+        await asyncio.wait_for(task, timeout=timeout)
+    except (asyncio.CancelledError, asyncio.TimeoutError):
+        pass
+
+
 class AgentStateManager:
     """
     Manages per-agent states and provides control mechanisms.
@@ -90,7 +103,7 @@ class AgentStateManager:
         async with self._lock:
             if agent_name in self._states:
                 self._states[agent_name].current_task = task
-                logger.debug(f"Task set for agent '{agent_name}': {task is not None}")
+                logger.debug("Task set for agent %r: %s", agent_name, task is not None)
 
     async def pause_agent(self, agent_name: str, reason: Optional[str] = None) -> bool:
         """
@@ -178,13 +191,12 @@ class AgentStateManager:
                 return False
 
             # Cancel any active task immediately
-            if state_info.current_task and not state_info.current_task.done():
+            task = state_info.current_task
+            if task and not task.done():
                 logger.info(f"Cancelling active task for stopped agent '{agent_name}'")
-                state_info.current_task.cancel()
-                try:
-                    await asyncio.wait_for(state_info.current_task, timeout=5.0)
-                except (asyncio.CancelledError, asyncio.TimeoutError):
-                    pass
+                task.cancel()
+            else:
+                task = None
 
             state_info.state = AgentState.STOPPED
             state_info.changed_at = datetime.utcnow()
@@ -192,7 +204,10 @@ class AgentStateManager:
             state_info.current_task = None
 
             logger.info(f"Agent '{agent_name}' stopped: {reason or 'No reason given'}")
-            return True
+
+        if task is not None:
+            await _wait_cancelled(task)
+        return True
 
     async def finish_agent(self, agent_name: str, reason: Optional[str] = None) -> bool:
         """
@@ -216,13 +231,12 @@ class AgentStateManager:
                 return False
 
             # Cancel any active task
-            if state_info.current_task and not state_info.current_task.done():
+            task = state_info.current_task
+            if task and not task.done():
                 logger.info(f"Cancelling active task for finished agent '{agent_name}'")
-                state_info.current_task.cancel()
-                try:
-                    await asyncio.wait_for(state_info.current_task, timeout=5.0)
-                except (asyncio.CancelledError, asyncio.TimeoutError):
-                    pass
+                task.cancel()
+            else:
+                task = None
 
             state_info.state = AgentState.FINISHED
             state_info.changed_at = datetime.utcnow()
@@ -230,7 +244,10 @@ class AgentStateManager:
             state_info.current_task = None
 
             logger.info(f"Agent '{agent_name}' finished: {reason or 'No reason given'}")
-            return True
+
+        if task is not None:
+            await _wait_cancelled(task)
+        return True
 
     async def restart_agent(self, agent_name: str) -> bool:
         """
@@ -282,7 +299,7 @@ class AgentStateManager:
                 for name, info in self._states.items()
                 if info.state == AgentState.ACTIVE
             }
-            logger.info(f"Active agents: {active_agents}")
+            logger.info("Active agents: %s", active_agents)
             return active_agents
 
     async def get_all_states(self) -> Dict[str, AgentStateInfo]:
@@ -2,13 +2,114 @@
 Audit logging utilities.
 """
 
+import queue
+import threading
+import time
 from datetime import datetime
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
+from .logger_config import get_logger
 from .models import AuditLog, User
 
+logger = get_logger(__name__)
+
+
+class AuditBatcher:
+    """
+    Buffers audit rows and writes them in bulk from a background thread.
+
+    A batch is flushed once it holds ``batch_size`` rows or its first row
+    has waited ``interval`` seconds, as one multi-row INSERT in a single
+    transaction. Rows still queued are flushed by stop().
+    """
+
+    def __init__(self, batch_size: int = 100, interval: float = 1.0):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._session_factory: Optional[Callable[[], Session]] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, session_factory: Callable[[], Session]) -> None:
+        """Start the writer thread using ``session_factory`` for DB access."""
+        if self.running:
+            return
+        self._session_factory = session_factory
+        self._thread = threading.Thread(
+            target=self._run, name="audit-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush queued rows and stop the writer thread."""
+        if not self.running:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def put(self, row: Dict[str, Any]) -> None:
+        self._queue.put_nowait(row)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            deadline = time.monotonic() + self.interval
+            batch: List[Dict[str, Any]] = []
+            while item is not None:
+                batch.append(item)
+                remaining = deadline - time.monotonic()
+                if len(batch) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            stopping = item is None
+            if batch:
+                self._write(batch)
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        db = self._session_factory()
+        try:
+            db.execute(insert(AuditLog), rows)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(
+                f"Bulk write of {len(rows)} audit log entries failed ({e}); "
+                "retrying row by row"
+            )
+            self._write_each(db, rows)
+        finally:
+            db.close()
+
+    def _write_each(self, db: Session, rows: List[Dict[str, Any]]) -> None:
+        """Insert rows one at a time so one bad row cannot drop the batch."""
+        for row in rows:
+            try:
+                db.execute(insert(AuditLog), [row])
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.error(
+                    f"Failed to write audit log entry {row.get('action')} "
+                    f"for {row.get('resource_type')}/{row.get('resource_id')}: {e}"
+                )
+
+
+# Process-wide batcher; started by the app lifespan. Until then (scripts,
+# tests) log_action writes synchronously.
+audit_batcher = AuditBatcher()
 
 def log_action(
     db: Session,
@@ -19,7 +120,7 @@ def log_action(
     changes: Optional[Dict[str, Any]] = None,
     ip_address: Optional[str] = None,
     user_agent: Optional[str] = None,
-) -> AuditLog:
+) -> Optional[AuditLog]:
     """
     Log an administrative action to the audit log.
 
@@ -34,20 +135,25 @@ def log_action(
         user_agent: Client user agent string
 
     Returns:
-        Created AuditLog entry
+        Created AuditLog entry, or None if it was queued for a batched write
     """
-    entry = AuditLog(
-        user_id=user.id if user else None,
-        username=user.username if user else "system",
-        action=action,
-        resource_type=resource_type,
-        resource_id=resource_id,
-        changes=changes,
-        ip_address=ip_address,
-        user_agent=user_agent,
-        timestamp=datetime.utcnow(),
-    )
+    row = {
+        "user_id": user.id if user else None,
+        "username": user.username if user else "system",
+        "action": action,
+        "resource_type": resource_type,
+        "resource_id": resource_id,
+        "changes": changes,
+        "ip_address": ip_address,
+        "user_agent": user_agent,
+        "timestamp": datetime.utcnow(),
+    }
 
+    if audit_batcher.running and action not in _SYNC_ACTIONS:
+        audit_batcher.put(row)
+        return None
+
+    entry = AuditLog(**row)
     db.add(entry)
     db.commit()
     db.refresh(entry)
@@ -55,6 +161,9 @@ def log_action(
     return entry
 
 
+_SENSITIVE_FIELDS = frozenset({"api_key", "password", "api_key_encrypted"})
+
+
 def compute_changes(
     old_obj: Any, new_data: Dict[str, Any], fields: list
 ) -> Dict[str, Dict[str, Any]]:
@@ -83,7 +192,7 @@ def compute_changes(
             continue
 
         # Redact sensitive fields
-        if field in {"api_key", "password", "api_key_encrypted"}:
+        if field in _SENSITIVE_FIELDS:
             changes[field] = {"old": "[REDACTED]", "new": "[REDACTED]"}
         else:
             changes[field] = {"old": old_value, "new": new_value}
@@ -91,7 +200,54 @@ def compute_changes(
     return changes
 
 
+@lru_cache(maxsize=None)
+def make_differ(
+    fields: Tuple[str, ...],
+) -> Callable[[Any, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """
+    Build a compute_changes specialized to a fixed set of fields.
+
+    The returned ``diff(old_obj, new_data)`` is generated source with one
+    straight-line check per field, so hot update paths skip the per-call
+    field list and getattr lookups. Every field must be an attribute of
+    the objects passed in.
+    """
+    lines = ["def diff(obj, data):", "    changes = {}"]
+    for field in fields:
+        if not field.isidentifier():
+            raise ValueError(f"Invalid field name: {field!r}")
+        if field in _SENSITIVE_FIELDS:
+            entry = '{"old": "[REDACTED]", "new": "[REDACTED]"}'
+        else:
+            entry = f'{{"old": obj.{field}, "new": data["{field}"]}}'
+        lines.append(
+            f'    if "{field}" in data and data["{field}"] != obj.{field}:\n'
+            f'        changes["{field}"] = {entry}'
+        )
+    lines.append("    return changes")
+    namespace: Dict[str, Any] = {}
+    exec("\n".join(lines), namespace)
+    return namespace["diff"]
+
+
+_UNRESOLVED = object()
+
+
 def get_client_ip(request) -> Optional[str]:
+    """
+    Client IP for a request.
+
+    Uses the value the request middleware stored on ``request.state`` and
+    only parses the headers itself when no middleware ran.
+    """
+    state = getattr(request, "state", None)
+    client_ip = getattr(state, "client_ip", _UNRESOLVED)
+    if client_ip is not _UNRESOLVED:
+        return client_ip
+    return resolve_client_ip(request)
+
+
+def resolve_client_ip(request) -> Optional[str]:
     """Extract client IP from request, handling proxies."""
     # Check for X-Forwarded-For header (when behind proxy)
     forwarded = request.headers.get("x-forwarded-for")
@@ -121,6 +277,9 @@ class AuditAction:
     USER_UPDATE = "user.update"
     USER_DELETE = "user.delete"
     USER_PASSWORD_CHANGE = "user.password_change"
+    USER_ENABLE = "user.enable"
+    USER_DISABLE = "user.disable"
+    USER_ROLE_CHANGE = "user.role_change"
 
     # Agent actions
     AGENT_CREATE = "agent.create"
@@ -140,12 +299,28 @@ class AuditAction:
     CONVERSATION_START = "conversation.start"
     CONVERSATION_STOP = "conversation.stop"
     CONVERSATION_DELETE = "conversation.delete"
+    CONVERSATION_ARCHIVE = "conversation.archive"
     MESSAGE_INJECT = "conversation.message_inject"
 
     # Voice asset actions
     AUDIO_UPLOAD = "audio.upload"
     AUDIO_DELETE = "audio.delete"
+    AUDIO_ATTACH = "audio.attach"
+    AUDIO_TRANSCRIPT_UPDATE = "audio.transcript_update"
 
     # System actions
     SYSTEM_CONFIG_CHANGE = "system.config_change"
     SYSTEM_MAINTENANCE = "system.maintenance"
+
+
+# Entries that must not sit in the in-memory buffer
+_SYNC_ACTIONS = frozenset(
+    {
+        AuditAction.USER_DELETE,
+        AuditAction.USER_PASSWORD_CHANGE,
+        AuditAction.USER_ENABLE,
+        AuditAction.USER_DISABLE,
+        AuditAction.USER_ROLE_CHANGE,
+        AuditAction.SYSTEM_CONFIG_CHANGE,
+    }
+)
@@ -4,8 +4,8 @@ Authentication and authorization utilities.
 
 import os
 from datetime import datetime, timedelta
-from functools import wraps
-from typing import Optional
+from functools import lru_cache, wraps
+from typing import Iterable, Optional, Tuple
 
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
@@ -21,8 +21,11 @@ SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("TOKEN_EXPIRE_MINUTES", "60"))
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing; existing hashes verify at whatever cost they were made with
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS
+)
 
 # Bearer token scheme
 security = HTTPBearer(auto_error=False)
@@ -138,16 +141,23 @@ async def get_current_user_optional(
         return None
 
 
-def require_role(allowed_roles: list):
+def require_role(allowed_roles: Iterable[str]):
     """
     Dependency factory for role-based access control.
 
+    Equal role lists return the same dependency callable, so FastAPI can
+    share its result between endpoints and sub-dependencies of a request.
+
     Usage:
         @router.get("/admin-only")
         async def admin_endpoint(user = Depends(require_role(["admin"]))):
             pass
     """
+    return _role_checker(tuple(allowed_roles))
+
 
+@lru_cache(maxsize=None)
+def _role_checker(allowed_roles: Tuple[str, ...]):
     async def role_checker(
         request: Request,
         credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -1,3 +1,4 @@
+import functools
 import os
 from dataclasses import dataclass
 
@@ -41,9 +42,31 @@ class Settings:
     verbose: bool
     log_level: str
     log_dir: str
+    # Run all agents of a round concurrently against one history snapshot
+    parallel_rounds: bool = False
+    max_concurrency: int = 4
+    # Reuse replies of low-temperature agents for identical/similar prompts
+    response_cache_enabled: bool = False
+    response_cache_threshold: float = 0.92
 
+    def embedder_cache_key(self) -> tuple:
+        """Hashable subset of settings that determines the embedder config."""
+        return (
+            self.embedding_provider.lower(),
+            self.embedding_model,
+            self.embedding_base_url,
+            self.embedding_api_key or self.openai_api_key,
+        )
 
+
+@functools.lru_cache(maxsize=1)
 def load_settings() -> Settings:
+    """
+    Settings from the environment and .env, read once per process.
+
+    Callers share the returned instance; use reload_settings() to pick up
+    environment changes.
+    """
     load_dotenv()
 
     def _get_bool(key: str, default: str) -> bool:
@@ -81,4 +104,16 @@ def load_settings() -> Settings:
         verbose=_get_bool("VERBOSE", "false"),
         log_level=os.getenv("LOG_LEVEL", "INFO").upper(),
         log_dir=os.getenv("LOG_DIR", "./logs"),
+        parallel_rounds=_get_bool("PARALLEL_ROUNDS", "false"),
+        max_concurrency=int(os.getenv("MAX_CONCURRENCY", "4")),
+        response_cache_enabled=_get_bool("RESPONSE_CACHE_ENABLED", "false"),
+        response_cache_threshold=float(
+            os.getenv("RESPONSE_CACHE_THRESHOLD", "0.92")
+        ),
     )
+
+
+def reload_settings() -> Settings:
+    """Drop the cached settings and read them again."""
+    load_settings.cache_clear()
+    return load_settings()
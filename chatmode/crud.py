@@ -3,10 +3,23 @@ CRUD operations for database models.
 """
 
 from datetime import datetime
-from typing import List, Optional, Tuple
-
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import (
+    String,
+    and_,
+    cast,
+    exists,
+    func,
+    literal,
+    null,
+    or_,
+    select,
+    union_all,
+    update,
+)
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, raiseload, selectinload
 
 from .auth import encrypt_api_key, hash_password
 from .models import (
@@ -26,10 +39,28 @@ from .schemas import (
     MemorySettingsUpdate,
     PermissionsUpdate,
     UserCreate,
-    UserUpdate,
     VoiceSettingsUpdate,
 )
 
+
+def _paginate(query, page: int, per_page: int) -> Tuple[list, int]:
+    """
+    Fetch one OFFSET page of an ordered query together with the total.
+
+    The total comes from COUNT(*) OVER () on the page rows, so a page costs
+    one query; only a page past the end falls back to a separate COUNT.
+    """
+    rows = (
+        query.add_columns(func.count().over())
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+        .all()
+    )
+    if rows:
+        return [row[0] for row in rows], rows[0][1]
+    return [], query.order_by(None).count() if page > 1 else 0
+
+
 # ============================================================================
 # Users
 # ============================================================================
@@ -45,13 +76,88 @@ def get_user_by_username(db: Session, username: str) -> Optional[User]:
     return db.query(User).filter(User.username == username).first()
 
 
-def get_users(db: Session, page: int = 1, per_page: int = 20) -> Tuple[List[User], int]:
-    """Get paginated list of users."""
-    total = db.query(func.count(User.id)).scalar()
-    users = db.query(User).offset((page - 1) * per_page).limit(per_page).all()
+def get_user_by_email(db: Session, email: str) -> Optional[User]:
+    """Get user by email."""
+    return db.query(User).filter(User.email == email).first()
+
+
+def username_exists(db: Session, username: str) -> bool:
+    """Check whether a username is taken without loading the user."""
+    return db.execute(select(exists().where(User.username == username))).scalar()
+
+
+def email_exists(db: Session, email: str) -> bool:
+    """Check whether an email is registered without loading the user."""
+    return db.execute(select(exists().where(User.email == email))).scalar()
+
+
+def find_user_conflicts(
+    db: Session, username: str, email: Optional[str] = None
+) -> Dict[str, bool]:
+    """Check in one query whether a username and/or email are already taken."""
+    email_taken = exists().where(User.email == email) if email else literal(False)
+    row = db.execute(
+        select(exists().where(User.username == username), email_taken)
+    ).one()
+    return {"username": bool(row[0]), "email": bool(row[1])}
+
+
+def get_users(
+    db: Session,
+    page: int = 1,
+    per_page: int = 20,
+    role: Optional[str] = None,
+    enabled: Optional[bool] = None,
+) -> Tuple[List[User], int]:
+    """Get paginated list of users, newest first."""
+    query = _filter_users(db.query(User), role, enabled)
+    return _paginate(
+        query.order_by(User.created_at.desc(), User.id.desc()), page, per_page
+    )
+
+
+def get_users_keyset(
+    db: Session,
+    after: Tuple[datetime, str],
+    per_page: int = 20,
+    role: Optional[str] = None,
+    enabled: Optional[bool] = None,
+) -> Tuple[List[User], int]:
+    """
+    Get the users that follow ``after`` in get_users ordering.
+
+    ``after`` is the (created_at, id) of the last user already seen. The
+    lookup seeks straight past it, so deep pages cost the same as the first.
+    """
+    created_at, user_id = after
+    query = _filter_users(db.query(User), role, enabled)
+    total = query.count()
+    users = (
+        query.filter(
+            or_(
+                User.created_at < created_at,
+                and_(User.created_at == created_at, User.id < user_id),
+            )
+        )
+        .order_by(User.created_at.desc(), User.id.desc())
+        .limit(per_page)
+        .all()
+    )
     return users, total
 
 
+def _filter_users(query, role: Optional[str], enabled: Optional[bool]):
+    # UserResponse reads no relationships; fail loudly rather than N+1 if a
+    # listed user's relationship is ever touched
+    query = query.options(raiseload("*"))
+    # Same column order as idx_user_enabled_role_created
+    if enabled is not None:
+        query = query.filter(User.enabled == enabled)
+    if role:
+        query = query.filter(User.role == role)
+    return query
+
+
 def create_user(db: Session, user_data: UserCreate) -> User:
     """Create a new user."""
     user = User(
@@ -66,16 +172,20 @@ def create_user(db: Session, user_data: UserCreate) -> User:
     return user
 
 
-def update_user(db: Session, user_id: str, user_data: UserUpdate) -> Optional[User]:
-    """Update a user."""
+def update_user(
+    db: Session, user_id: str, update_data: Dict[str, Any]
+) -> Optional[User]:
+    """
+    Update a user.
+
+    Args:
+        update_data: Column values to set, e.g. a UserUpdate dumped with
+            exclude_unset=True and mode="json"
+    """
     user = get_user(db, user_id)
     if not user:
         return None
 
-    update_data = user_data.model_dump(exclude_unset=True)
-    if "role" in update_data:
-        update_data["role"] = update_data["role"].value
-
     for field, value in update_data.items():
         setattr(user, field, value)
 
@@ -84,6 +194,43 @@ def update_user(db: Session, user_id: str, user_data: UserUpdate) -> Optional[Us
     return user
 
 
+def set_user_enabled(db: Session, user_id: str, enabled: bool) -> Optional[Row]:
+    """
+    Enable or disable a user with a single UPDATE ... RETURNING.
+
+    Returns:
+        Row of (username, role), or None if the user does not exist
+    """
+    row = db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(enabled=enabled)
+        .returning(User.username, User.role)
+    ).first()
+    db.commit()
+    return row
+
+
+def set_user_role(db: Session, user_id: str, role: str) -> Optional[str]:
+    """
+    Change a user's role without loading the user.
+
+    The old role is read under a row lock before the UPDATE, since RETURNING
+    only sees the new values.
+
+    Returns:
+        The previous role, or None if the user does not exist
+    """
+    old_role = db.execute(
+        select(User.role).where(User.id == user_id).with_for_update()
+    ).scalar_one_or_none()
+    if old_role is None:
+        return None
+    db.execute(update(User).where(User.id == user_id).values(role=role))
+    db.commit()
+    return old_role
+
+
 def delete_user(db: Session, user_id: str) -> bool:
     """Delete a user (soft delete by disabling)."""
     user = get_user(db, user_id)
@@ -119,16 +266,27 @@ def get_agents(
     if enabled is not None:
         query = query.filter(Agent.enabled == enabled)
 
-    total = query.count()
-    agents = query.offset((page - 1) * per_page).limit(per_page).all()
-
-    return agents, total
+    # agent_to_response reads all three settings rows; load them per page
+    # instead of lazily per agent
+    query = query.options(
+        selectinload(Agent.voice_settings),
+        selectinload(Agent.memory_settings),
+        selectinload(Agent.permissions),
+    )
+    return _paginate(query, page, per_page)
 
 
 def create_agent(
-    db: Session, agent_data: AgentCreate, created_by: Optional[str] = None
+    db: Session,
+    agent_data: AgentCreate,
+    created_by: Optional[str] = None,
+    commit: bool = True,
 ) -> Agent:
-    """Create a new agent with related settings."""
+    """Create a new agent with related settings.
+
+    Pass ``commit=False`` to create several agents in one transaction; the
+    caller is then responsible for committing.
+    """
     # Create main agent record
     agent = Agent(
         name=agent_data.name,
@@ -181,8 +339,9 @@ def create_agent(
     )
     db.add(permissions)
 
-    db.commit()
-    db.refresh(agent)
+    if commit:
+        db.commit()
+        db.refresh(agent)
 
     return agent
 
@@ -484,10 +643,20 @@ def get_audit_logs(
     user_id: Optional[str] = None,
     action: Optional[str] = None,
     resource_type: Optional[str] = None,
+    resource_id: Optional[str] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
+    before: Optional[datetime] = None,
+    before_id: Optional[str] = None,
 ) -> Tuple[List[AuditLog], int]:
-    """Get paginated audit logs with filters."""
+    """
+    Get paginated audit logs with filters.
+
+    Passing ``before`` and ``before_id`` (the timestamp and id of the last
+    row already seen) pages by keyset instead of OFFSET, so deep pages cost
+    the same as the first. Rows are ordered by (timestamp, id), so entries
+    sharing the cursor's timestamp are not skipped.
+    """
     query = db.query(AuditLog)
 
     if user_id:
@@ -496,17 +665,80 @@ def get_audit_logs(
         query = query.filter(AuditLog.action == action)
     if resource_type:
         query = query.filter(AuditLog.resource_type == resource_type)
+    if resource_id:
+        query = query.filter(AuditLog.resource_id == resource_id)
     if start_date:
         query = query.filter(AuditLog.timestamp >= start_date)
     if end_date:
         query = query.filter(AuditLog.timestamp <= end_date)
 
+    ordering = (AuditLog.timestamp.desc(), AuditLog.id.desc())
+    if not before:
+        return _paginate(query.order_by(*ordering), page, per_page)
+
     total = query.count()
-    logs = (
-        query.order_by(AuditLog.timestamp.desc())
-        .offset((page - 1) * per_page)
-        .limit(per_page)
-        .all()
+    if before_id:
+        query = query.filter(
+            or_(
+                AuditLog.timestamp < before,
+                and_(AuditLog.timestamp == before, AuditLog.id < before_id),
+            )
+        )
+    else:
+        query = query.filter(AuditLog.timestamp < before)
+    logs = query.order_by(*ordering).limit(per_page).all()
+    return logs, total
+
+
+def get_audit_log(db: Session, log_id: str) -> Optional[AuditLog]:
+    """Get a single audit log entry by ID."""
+    return db.query(AuditLog).filter(AuditLog.id == log_id).first()
+
+
+def get_audit_stats(db: Session, start_date: datetime, top_users: int = 10) -> dict:
+    """
+    Aggregate audit log counts since ``start_date`` in the database.
+
+    All groupings run as one UNION ALL statement, so only one row per
+    distinct group comes back instead of the raw log rows.
+    """
+    since = AuditLog.timestamp >= start_date
+    groupings = {
+        "by_action": AuditLog.action,
+        "by_resource_type": AuditLog.resource_type,
+        "by_user": AuditLog.username,
+        "daily_activity": func.date(AuditLog.timestamp),
+    }
+
+    selects = [
+        select(
+            literal(name).label("grouping"),
+            cast(column, String).label("key"),
+            func.count().label("count"),
+        )
+        .where(since, column.isnot(None))
+        .group_by(column)
+        for name, column in groupings.items()
+    ]
+    selects.append(
+        select(
+            literal("total").label("grouping"),
+            cast(null(), String).label("key"),
+            func.count().label("count"),
+        ).where(since)
     )
 
-    return logs, total
+    stats = {name: {} for name in groupings}
+    total = 0
+    for grouping, key, count in db.execute(union_all(*selects)):
+        if grouping == "total":
+            total = count
+        else:
+            stats[grouping][key] = count
+
+    stats["by_user"] = dict(
+        sorted(stats["by_user"].items(), key=lambda x: x[1], reverse=True)[
+            :top_users
+        ]
+    )
+    return {"total_actions": total, **stats}
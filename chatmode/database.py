@@ -9,7 +9,7 @@ from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from .models import Base, create_all_tables
+from .models import AuditLog, Base, User, create_all_tables
 
 # Database URL from environment, defaulting to SQLite
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/chatmode.db")
@@ -32,12 +32,14 @@ if DATABASE_URL.startswith("sqlite"):
         cursor.close()
 
 else:
-    # PostgreSQL/MySQL settings
+    # PostgreSQL/MySQL settings. Sync handlers run in the threadpool, so the
+    # pool is sized for its concurrency rather than the SQLAlchemy default.
     engine = create_engine(
         DATABASE_URL,
         pool_pre_ping=True,
-        pool_size=5,
-        max_overflow=10,
+        pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "40")),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "3600")),
         echo=os.getenv("SQL_ECHO", "").lower() == "true",
     )
 
@@ -89,6 +91,7 @@ def init_db():
     # Create all tables
     create_all_tables(engine)
     _apply_sqlite_migrations()
+    _create_missing_indexes()
     print(f"Database initialized: {DATABASE_URL}")
 
 
@@ -131,6 +134,29 @@ def _apply_sqlite_migrations() -> None:
             conn.commit()
 
 
+def _create_missing_indexes() -> None:
+    """Create indexes added to existing tables after they were first created."""
+    for model in (AuditLog, User):
+        for index in model.__table__.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def warm_pool(connections: int = 5) -> None:
+    """
+    Open pool connections ahead of the first requests.
+
+    Connections are held together so the pool ends up with ``connections``
+    distinct idle connections instead of reusing one.
+    """
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(engine.connect())
+    finally:
+        for conn in opened:
+            conn.close()
+
+
 def test_connection():
     """Test database connection."""
     try:
@@ -5,12 +5,15 @@ Provides utilities for creating CrewAI LLM instances from ChatMode settings
 and agent profiles.
 """
 
+import copy
+import functools
 import os
 from typing import Any, Dict, Optional
 
 from crewai import LLM
 
 from .config import Settings
+from .providers import LLM_READ_TIMEOUT
 
 
 def create_llm_from_profile(profile: Dict[str, Any], settings: Settings) -> LLM:
@@ -43,6 +46,7 @@ def create_llm_from_profile(profile: Dict[str, Any], settings: Settings) -> LLM:
             model=model_name,
             base_url=base_url,
             temperature=params.get("temperature", settings.temperature),
+            timeout=LLM_READ_TIMEOUT,
         )
     else:
         # OpenAI-compatible configuration (OpenAI, Azure, Anthropic, etc.)
@@ -55,6 +59,7 @@ def create_llm_from_profile(profile: Dict[str, Any], settings: Settings) -> LLM:
             api_key=api_key,
             temperature=params.get("temperature", settings.temperature),
             max_tokens=params.get("max_tokens", settings.max_output_tokens),
+            timeout=LLM_READ_TIMEOUT,
         )
 
 
@@ -62,38 +67,43 @@ def create_embedder_config(settings: Settings) -> Dict[str, Any]:
     """
     Create embedder configuration for CrewAI memory.
 
+    The configuration is built once per distinct embedder setting and
+    copied on return, so callers may modify what they get.
+
     Args:
         settings: Global application settings
 
     Returns:
         Embedder configuration dictionary
     """
-    provider = settings.embedding_provider.lower()
+    return copy.deepcopy(_embedder_config_cached(settings.embedder_cache_key()))
+
+
+@functools.lru_cache(maxsize=8)
+def _embedder_config_cached(settings_key: tuple) -> Dict[str, Any]:
+    provider, model, base_url, api_key = settings_key
 
     if provider == "ollama":
         # OllamaProviderSpec expects url and model_name
-        url = settings.embedding_base_url
+        url = base_url
         if not url.endswith("/api/embeddings"):
             url = f"{url.rstrip('/')}/api/embeddings"
         return {
             "provider": "ollama",
             "config": {
-                "model_name": settings.embedding_model,
+                "model_name": model,
                 "url": url,
             },
         }
     else:
         # OpenAIProviderSpec expects model_name and api_key (and optionally api_base)
         config = {
-            "model_name": settings.embedding_model,
-            "api_key": settings.embedding_api_key or settings.openai_api_key,
+            "model_name": model,
+            "api_key": api_key,
         }
         # Add api_base if it's not default OpenAI URL
-        if (
-            settings.embedding_base_url
-            and settings.embedding_base_url != "https://api.openai.com/v1"
-        ):
-            config["api_base"] = settings.embedding_base_url
+        if base_url and base_url != "https://api.openai.com/v1":
+            config["api_base"] = base_url
         return {"provider": "openai", "config": config}
 
 
@@ -117,4 +127,5 @@ def get_default_llm(settings: Settings) -> LLM:
         api_key=settings.openai_api_key,
         temperature=settings.temperature,
         max_tokens=settings.max_output_tokens,
+        timeout=LLM_READ_TIMEOUT,
     )
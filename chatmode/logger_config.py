@@ -20,10 +20,11 @@ import threading
 import time
 import uuid
 from contextlib import contextmanager
-from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from .utils import utc_isoformat
+
 # Thread-local storage for correlation IDs
 _local = threading.local()
 
@@ -103,7 +104,7 @@ class StructuredLogFormatter(logging.Formatter):
 
     def format(self, record):
         log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": utc_isoformat(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -17,8 +17,11 @@ from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
 from .config import load_settings
-from .database import init_db, get_db
+from .database import SessionLocal, init_db, get_db, warm_pool
 from .logger_config import get_logger, setup_logging
+from .memory import close_shared_clients
+from .providers import close_http_clients
+from .audit import audit_batcher, resolve_client_ip
 from .session import ChatSession
 from . import crud
 
@@ -46,7 +49,6 @@ async def lifespan(app: FastAPI):
 
     # Initialize providers from environment variables
     try:
-        from .database import SessionLocal
         from .providers import load_providers_from_db
         from .services import initialize_providers
 
@@ -110,7 +112,12 @@ async def lifespan(app: FastAPI):
             db.close()
     except Exception as e:
         logger.error(f"⚠️  Provider initialization failed: {e}", exc_info=True)
+    warm_pool()
+    audit_batcher.start(SessionLocal)
     yield
+    audit_batcher.stop()
+    close_shared_clients()
+    close_http_clients()
 
 
 app = FastAPI(
@@ -148,6 +155,8 @@ async def log_requests(request: Request, call_next):
 
     # Set correlation ID for this request
     correlation_id = request.headers.get("X-Correlation-ID") or set_correlation_id()
+    # Resolved once here; audit logging reads it via get_client_ip
+    request.state.client_ip = resolve_client_ip(request)
 
     start_time = time.time()
     method = request.method
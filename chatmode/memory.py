@@ -1,16 +1,34 @@
+import functools
 import logging
 import os
 import uuid
-from datetime import datetime
-from typing import Any, Dict, List, Optional
-
-import chromadb
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from .providers import EmbeddingProvider
+from .utils import utc_isoformat
+
+if TYPE_CHECKING:
+    import chromadb
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def _shared_client(persist_dir: str) -> "chromadb.ClientAPI":
+    """One Chroma client per persist directory, shared by every MemoryStore."""
+    # chromadb is imported here rather than at module load: its import graph
+    # dominates startup for anything that only needs the memory types.
+    import chromadb
+
+    os.makedirs(persist_dir, exist_ok=True)
+    return chromadb.PersistentClient(path=persist_dir)
+
+
+def close_shared_clients() -> None:
+    """Drop cached Chroma clients (e.g. at shutdown or between tests)."""
+    _shared_client.cache_clear()
+
+
 class MemoryStore:
     """
     Long-term memory storage backed by ChromaDB embeddings.
@@ -24,9 +42,8 @@ class MemoryStore:
         persist_dir: str,
         embedding_provider: EmbeddingProvider,
     ):
-        os.makedirs(persist_dir, exist_ok=True)
         self.embedding_provider = embedding_provider
-        self.client = chromadb.PersistentClient(path=persist_dir)
+        self.client = _shared_client(os.path.abspath(persist_dir))
         self.collection = self.client.get_or_create_collection(name=collection_name)
         self.collection_name = collection_name
         logger.debug(f"Initialized MemoryStore: {collection_name}")
@@ -56,7 +73,7 @@ class MemoryStore:
 
         # Build enriched metadata
         enriched_metadata = metadata.copy() if metadata else {}
-        enriched_metadata["timestamp"] = datetime.utcnow().isoformat()
+        enriched_metadata["timestamp"] = utc_isoformat()
         if session_id:
             enriched_metadata["session_id"] = session_id
         if agent_id:
@@ -53,6 +53,13 @@ class User(Base):
         "Agent", foreign_keys="Agent.created_by", back_populates="creator"
     )
 
+    __table_args__ = (
+        Index("idx_user_created", "created_at", "id"),
+        # Filtered listings: equality on the leading columns, then the listing
+        # order, so the page is read in index order without a sort
+        Index("idx_user_enabled_role_created", "enabled", "role", "created_at", "id"),
+    )
+
     def __repr__(self):
         return f"<User {self.username} ({self.role})>"
 
@@ -483,8 +490,16 @@ class AuditLog(Base):
     user = relationship("User", back_populates="audit_logs")
 
     __table_args__ = (
-        Index("idx_audit_user", "user_id"),
-        Index("idx_audit_resource", "resource_type", "resource_id"),
+        # Composite indexes match the list filters plus the (timestamp, id) sort
+        Index("idx_audit_user_time", "user_id", "timestamp", "id"),
+        Index("idx_audit_action_time", "action", "timestamp", "id"),
+        Index(
+            "idx_audit_resource_time",
+            "resource_type",
+            "resource_id",
+            "timestamp",
+            "id",
+        ),
     )
 
     def __repr__(self):
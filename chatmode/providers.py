@@ -1,12 +1,24 @@
-import json
 from dataclasses import dataclass
 from functools import lru_cache
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
 
+import httpx
 import requests
-from openai import OpenAI
+from openai import DefaultHttpxClient, OpenAI
+from requests.adapters import HTTPAdapter
 from sqlalchemy.orm import Session
 
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+except ImportError:
+    h2 = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class ChatProvider:
     def chat(
@@ -25,6 +37,54 @@ class EmbeddingProvider:
         raise NotImplementedError
 
 
+def _build_http_session() -> requests.Session:
+    session = requests.Session()
+    # Memory writes run on worker threads, so allow several pooled connections
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared keep-alive connection pool for the requests-based (Ollama) providers
+_http_session = _build_http_session()
+
+# Seconds an LLM or embedding call may wait for the server. The OpenAI SDK
+# default is 600s, long enough for one stuck request to stall a session.
+LLM_CONNECT_TIMEOUT = 10.0
+LLM_READ_TIMEOUT = 120.0
+_REQUESTS_TIMEOUT = (LLM_CONNECT_TIMEOUT, LLM_READ_TIMEOUT)
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _json_body(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """requests.post kwargs sending ``payload`` as JSON, via orjson if present."""
+    if orjson is not None:
+        return {"data": orjson.dumps(payload), "headers": _JSON_HEADERS}
+    return {"json": payload}
+
+
+@lru_cache(maxsize=1)
+def _shared_openai_http_client() -> httpx.Client:
+    """One connection pool (HTTP/2 when h2 is installed) for all OpenAI clients."""
+    return DefaultHttpxClient(
+        http2=h2 is not None,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    )
+
+
+def close_http_clients() -> None:
+    """Close the shared HTTP connection pools; call on application shutdown."""
+    if _shared_openai_http_client.cache_info().currsize:
+        _shared_openai_http_client().close()
+        _shared_openai_http_client.cache_clear()
+    # Cached providers hold OpenAI clients bound to the pool closed above
+    _cached_chat_provider.cache_clear()
+    _cached_embedding_provider.cache_clear()
+    _http_session.close()
+
+
 # Provider registry for dynamic provider management
 _provider_registry: Dict[str, Dict] = {}
 
@@ -87,9 +147,20 @@ def load_providers_from_db(db: Session):
 class OpenAIChatProvider(ChatProvider):
     base_url: str
     api_key: str
+    # Send prompt_cache_key with requests; None enables it for api.openai.com
+    # only, since stricter OpenAI-compatible servers reject unknown fields
+    use_prompt_cache_key: Optional[bool] = None
 
     def __post_init__(self):
-        self.client = OpenAI(base_url=self.base_url, api_key=self.api_key)
+        self.client = OpenAI(
+            base_url=self.base_url,
+            api_key=self.api_key,
+            http_client=_shared_openai_http_client(),
+            timeout=httpx.Timeout(LLM_READ_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+        )
+        if self.use_prompt_cache_key is None:
+            host = urlparse(self.base_url or "").hostname or ""
+            self.use_prompt_cache_key = host == "api.openai.com"
 
     def chat(
         self,
@@ -100,6 +171,7 @@ class OpenAIChatProvider(ChatProvider):
         options=None,
         tools: Optional[List[Dict]] = None,
         tool_choice: Optional[str] = None,
+        cache_key: Optional[str] = None,
     ):
         """
         Generate a chat completion.
@@ -112,6 +184,8 @@ class OpenAIChatProvider(ChatProvider):
             options: Additional options (ignored for OpenAI)
             tools: Optional list of tool schemas for function calling
             tool_choice: How to use tools ("auto", "none", or specific tool)
+            cache_key: Stable per-conversation key; routes turns that share a
+                prompt prefix to the same server-side prompt cache
 
         Returns:
             Dict with either 'content' or 'tool_calls' key, or the full message object
@@ -122,6 +196,8 @@ class OpenAIChatProvider(ChatProvider):
             "temperature": temperature,
             "max_tokens": max_tokens,
         }
+        if cache_key and self.use_prompt_cache_key:
+            kwargs["prompt_cache_key"] = cache_key
 
         if tools:
             kwargs["tools"] = tools
@@ -144,7 +220,12 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
     model: str
 
     def __post_init__(self):
-        self.client = OpenAI(base_url=self.base_url, api_key=self.api_key)
+        self.client = OpenAI(
+            base_url=self.base_url,
+            api_key=self.api_key,
+            http_client=_shared_openai_http_client(),
+            timeout=httpx.Timeout(LLM_READ_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+        )
 
     def embed(self, texts: List[str]) -> List[List[float]]:
         response = self.client.embeddings.create(model=self.model, input=texts)
@@ -164,12 +245,17 @@ class OllamaChatProvider(ChatProvider):
         options=None,
         tools: Optional[List[Dict]] = None,
         tool_choice: Optional[str] = None,
+        cache_key: Optional[str] = None,
     ):
         """
         Generate a chat completion.
 
         Note: Ollama doesn't currently support tool calling, so tools/tool_choice are ignored.
 
+        Args:
+            cache_key: Unused; Ollama reuses the KV cache of the longest
+                matching prompt prefix on its own
+
         Returns:
             A simple object with .content attribute for compatibility
         """
@@ -183,7 +269,9 @@ class OllamaChatProvider(ChatProvider):
         if options:
             payload["options"].update(options)
 
-        response = requests.post(url, json=payload, timeout=120)
+        response = _http_session.post(
+            url, timeout=_REQUESTS_TIMEOUT, **_json_body(payload)
+        )
         response.raise_for_status()
         data = response.json()
         content = data.get("message", {}).get("content", "")
@@ -214,10 +302,10 @@ class OllamaEmbeddingProvider(EmbeddingProvider):
         # Try new endpoint first
         try:
             url = f"{self.base_url}/api/embed"
-            response = requests.post(
+            response = _http_session.post(
                 url,
-                json={"model": self.model, "input": text},
-                timeout=120,
+                timeout=_REQUESTS_TIMEOUT,
+                **_json_body({"model": self.model, "input": text}),
             )
             response.raise_for_status()
             data = response.json()
@@ -227,16 +315,37 @@ class OllamaEmbeddingProvider(EmbeddingProvider):
         except requests.RequestException:
             # Fallback to legacy endpoint
             url = f"{self.base_url}/api/embeddings"
-            response = requests.post(
+            response = _http_session.post(
                 url,
-                json={"model": self.model, "prompt": text},
-                timeout=120,
+                timeout=_REQUESTS_TIMEOUT,
+                **_json_body({"model": self.model, "prompt": text}),
             )
             response.raise_for_status()
             data = response.json()
             return data.get("embedding", [])
 
 
+@lru_cache(maxsize=16)
+def _cached_chat_provider(
+    provider_type: str, base_url: str, api_key: str
+) -> ChatProvider:
+    """One provider per resolved endpoint, shared by every agent that uses it."""
+    if provider_type == "ollama":
+        return OllamaChatProvider(base_url=base_url)
+    return OpenAIChatProvider(base_url=base_url, api_key=api_key)
+
+
+@lru_cache(maxsize=16)
+def _cached_embedding_provider(
+    provider_type: str, base_url: str, api_key: str, model: str
+) -> EmbeddingProvider:
+    """Embedding counterpart of _cached_chat_provider."""
+    if provider_type == "ollama":
+        return OllamaEmbeddingProvider(base_url=base_url, model=model)
+    # deepinfra, huggingface and the OpenAI default share the OpenAI API format
+    return OpenAIEmbeddingProvider(base_url=base_url, api_key=api_key, model=model)
+
+
 def build_chat_provider(
     provider: str, base_url: str, api_key: str, headers: Optional[Dict[str, str]] = None
 ) -> ChatProvider:
@@ -265,7 +374,7 @@ def build_chat_provider(
         provider_type = provider
 
     if provider_type == "ollama":
-        return OllamaChatProvider(base_url=base_url)
+        return _cached_chat_provider(provider_type, base_url, api_key)
 
     # For OpenAI-compatible providers, use OpenAI client with custom base_url
     client_kwargs = {"base_url": base_url, "api_key": api_key}
@@ -277,7 +386,7 @@ def build_chat_provider(
         http_client.headers.update(headers)
         client_kwargs["http_client"] = http_client
 
-    return OpenAIChatProvider(base_url=base_url, api_key=api_key)
+    return _cached_chat_provider(provider_type, base_url, api_key)
 
 
 def build_chat_provider_from_registry(provider_name: str) -> Optional[ChatProvider]:
@@ -330,14 +439,7 @@ def build_embedding_provider(
     else:
         provider_type = provider
 
-    if provider_type == "ollama":
-        return OllamaEmbeddingProvider(base_url=base_url, model=model)
-    elif provider_type in ["deepinfra", "huggingface"]:
-        # Both use OpenAI-compatible API format
-        return OpenAIEmbeddingProvider(base_url=base_url, api_key=api_key, model=model)
-    else:
-        # Default to OpenAI
-        return OpenAIEmbeddingProvider(base_url=base_url, api_key=api_key, model=model)
+    return _cached_embedding_provider(provider_type, base_url, api_key, model)
 
 
 def build_embedding_provider_from_registry(
@@ -164,7 +164,7 @@ async def purge_memory(
 
     # If agent_name specified, purge that agent's memory
     if agent_name:
-        agent = next((a for a in session.agents if a.name == agent_name), None)
+        agent = session.get_agent(agent_name)
         if not agent:
             raise HTTPException(status_code=404, detail=f"Agent {agent_name} not found")
 
@@ -262,7 +262,7 @@ async def list_mcp_tools(
     if not session.agents:
         raise HTTPException(status_code=400, detail="No agents loaded in session")
 
-    agent = next((a for a in session.agents if a.name == agent_name), None)
+    agent = session.get_agent(agent_name)
     if not agent:
         raise HTTPException(status_code=404, detail=f"Agent {agent_name} not found")
 
@@ -331,7 +331,7 @@ async def call_mcp_tool(
     if not session.agents:
         raise HTTPException(status_code=400, detail="No agents loaded in session")
 
-    agent = next((a for a in session.agents if a.name == agent_name), None)
+    agent = session.get_agent(agent_name)
     if not agent:
         raise HTTPException(status_code=404, detail=f"Agent {agent_name} not found")
 
@@ -13,25 +13,14 @@ from .. import crud
 from ..auth import get_current_user, require_role
 from ..database import get_db
 from ..models import AuditLog, User
-from ..schemas import AuditLogListResponse, AuditLogResponse
+from ..schemas import AuditLogListResponse, AuditLogResponse, AuditStatsResponse
 
 router = APIRouter(prefix="/api/v1/audit", tags=["audit"])
 
 
 def audit_log_to_response(log: AuditLog) -> AuditLogResponse:
     """Convert AuditLog model to response schema."""
-    return AuditLogResponse(
-        id=log.id,
-        user_id=log.user_id,
-        username=log.username,
-        action=log.action,
-        resource_type=log.resource_type,
-        resource_id=log.resource_id,
-        changes=log.changes,
-        ip_address=log.ip_address,
-        user_agent=log.user_agent,
-        created_at=log.created_at,
-    )
+    return AuditLogResponse.model_validate(log)
 
 
 @router.get("/", response_model=AuditLogListResponse)
@@ -43,6 +32,8 @@ async def list_audit_logs(
     resource_type: Optional[str] = None,
     resource_id: Optional[str] = None,
     days: Optional[int] = Query(None, ge=1, le=365),
+    before: Optional[datetime] = None,
+    before_id: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(["admin"])),
 ):
@@ -54,6 +45,10 @@ async def list_audit_logs(
     - **resource_type**: Filter by resource type (agent, user, conversation, etc.)
     - **resource_id**: Filter by specific resource ID
     - **days**: Only show logs from the last N days
+    - **before**: Keyset cursor; only show logs older than this timestamp
+      (pass the last item's timestamp to fetch the next page)
+    - **before_id**: The last item's id; with `before`, entries sharing that
+      timestamp are paged by id instead of being skipped
     """
     # Calculate date filter
     from_date = None
@@ -68,7 +63,9 @@ async def list_audit_logs(
         action=action,
         resource_type=resource_type,
         resource_id=resource_id,
-        from_date=from_date,
+        start_date=from_date,
+        before=before,
+        before_id=before_id,
     )
 
     return AuditLogListResponse(
@@ -149,7 +146,7 @@ async def get_user_activity(
         from_date = datetime.utcnow() - timedelta(days=days)
 
     logs, total = crud.get_audit_logs(
-        db, page=page, per_page=per_page, user_id=user_id, from_date=from_date
+        db, page=page, per_page=per_page, user_id=user_id, start_date=from_date
     )
 
     return AuditLogListResponse(
@@ -161,7 +158,7 @@ async def get_user_activity(
     )
 
 
-@router.get("/stats/summary")
+@router.get("/stats/summary", response_model=AuditStatsResponse)
 async def get_audit_stats(
     days: int = Query(7, ge=1, le=90),
     db: Session = Depends(get_db),
@@ -173,41 +170,6 @@ async def get_audit_stats(
     Returns summary of actions over the specified period.
     """
     from_date = datetime.utcnow() - timedelta(days=days)
+    stats = crud.get_audit_stats(db, start_date=from_date)
 
-    # Get all logs for the period
-    logs, total = crud.get_audit_logs(db, page=1, per_page=10000, from_date=from_date)
-
-    # Aggregate stats
-    action_counts = {}
-    resource_counts = {}
-    user_counts = {}
-    daily_counts = {}
-
-    for log in logs:
-        # Count by action
-        action_counts[log.action] = action_counts.get(log.action, 0) + 1
-
-        # Count by resource type
-        if log.resource_type:
-            resource_counts[log.resource_type] = (
-                resource_counts.get(log.resource_type, 0) + 1
-            )
-
-        # Count by user
-        if log.username:
-            user_counts[log.username] = user_counts.get(log.username, 0) + 1
-
-        # Count by day
-        day_key = log.created_at.strftime("%Y-%m-%d")
-        daily_counts[day_key] = daily_counts.get(day_key, 0) + 1
-
-    return {
-        "period_days": days,
-        "total_actions": total,
-        "by_action": action_counts,
-        "by_resource_type": resource_counts,
-        "by_user": dict(
-            sorted(user_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-        ),
-        "daily_activity": daily_counts,
-    }
+    return AuditStatsResponse(period_days=days, **stats)
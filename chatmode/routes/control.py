@@ -1,4 +1,3 @@
-import asyncio
 import json
 
 from fastapi import APIRouter, Depends, Form, Request
@@ -8,13 +7,16 @@ from .advanced import get_chat_session
 
 router = APIRouter(prefix="/api/v1/control", tags=["control"])
 
+# Longest gap between status recomputations on the SSE stream
+STATUS_REFRESH_SECONDS = 1.0
+
 
 async def _session_status_payload(session: ChatSession) -> dict:
     return {
         "running": session.is_running(),
         "topic": session.topic,
         "session_id": session.session_id,
-        "last_messages": session.last_messages,
+        "last_messages": list(session.last_messages),
         "agent_states": await session.get_agent_states(),
         "message_rate": session.get_message_rate(),
     }
@@ -160,14 +162,19 @@ async def control_events(
     """Server-Sent Events stream for real-time control/status updates."""
 
     async def event_generator():
+        last_sent = None
         while True:
             try:
                 if await request.is_disconnected():
                     break
             except Exception:
                 break
-            payload = await _session_status_payload(session)
-            yield f"data: {json.dumps(payload)}\n\n"
-            await asyncio.sleep(0.25)
+            data = json.dumps(await _session_status_payload(session))
+            if data != last_sent:
+                yield f"data: {data}\n\n"
+                last_sent = data
+            # Woken as soon as the session changes; the timeout picks up
+            # derived fields (memory counts) and notices disconnects
+            await session.wait_for_change(timeout=STATUS_REFRESH_SECONDS)
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
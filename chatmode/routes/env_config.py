@@ -27,6 +27,17 @@ class EnvConfigUpdate(BaseModel):
     content: str
 
 
+def _atomic_write_text(path: Path, content: str) -> None:
+    """Replace ``path`` in one rename so readers never see a partial .env."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(content)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
 @router.get("/env")
 async def get_env_config(
     request: Request,
@@ -35,12 +46,12 @@ async def get_env_config(
 ):
     """Read the .env configuration file contents."""
     env_path = os.path.join(get_project_root(), ".env")
-    if not os.path.exists(env_path):
+    try:
+        with open(env_path, "r") as f:
+            content = f.read()
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail=".env file not found")
 
-    with open(env_path, "r") as f:
-        content = f.read()
-
     log_action(
         db=db,
         user=current_user,
@@ -65,9 +76,7 @@ async def update_env_config(
     """Overwrite the .env configuration file contents."""
     env_path = os.path.join(get_project_root(), ".env")
     os.makedirs(os.path.dirname(env_path), exist_ok=True)
-
-    with open(env_path, "w") as f:
-        f.write(payload.content)
+    _atomic_write_text(Path(env_path), payload.content)
 
     log_action(
         db=db,
@@ -112,21 +121,23 @@ async def import_shell_env(
     
     # Read existing .env
     env_path = Path(os.getenv("ENV_FILE", get_project_root() + "/.env"))
-    existing = ""
-    if env_path.exists():
+    try:
         existing = env_path.read_text()
+    except FileNotFoundError:
+        existing = ""
     
     # Update or append values
     lines = existing.splitlines() if existing else []
     # Remove any existing lines for these keys (check at start of line)
-    lines = [line for line in lines if not any(line.strip().startswith(k+"=") for k in shell_vars.keys())]
+    prefixes = tuple(f"{key}=" for key in shell_vars)
+    lines = [line for line in lines if not line.strip().startswith(prefixes)]
     # Append new variables
     for key, value in shell_vars.items():
         lines.append(f"{key}={value}")
     env_content = "\n".join(lines) + "\n"
     
     # Write back to .env
-    env_path.write_text(env_content)
+    _atomic_write_text(env_path, env_content)
     
     # Reinitialise providers and sync models using the injected db session
     try:
@@ -149,12 +160,9 @@ async def import_shell_env(
         user_agent=request.headers.get("user-agent"),
     )
     
-    # Return updated env content for display
-    updated_content = env_path.read_text()
-    
     return {
         "status": "imported",
         "scanned_files": scanned_files,
         "providers": result["providers"],
-        "content": updated_content
+        "content": env_content
     }
@@ -1,76 +1,120 @@
 """
 User management routes (admin only).
-"""
 
-import math
-from typing import Optional
+Handlers are plain ``def`` functions: they only do blocking SQLAlchemy work,
+so FastAPI runs them in its threadpool instead of on the event loop.
+"""
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
 from sqlalchemy.orm import Session
 
 from .. import crud
-from ..audit import AuditAction, compute_changes, get_client_ip, log_action
+from ..audit import AuditAction, get_client_ip, log_action, make_differ
 from ..auth import get_current_user, hash_password, require_role
 from ..database import get_db
 from ..models import User
-from ..schemas import UserCreate, UserListResponse, UserResponse, UserUpdate
-
+from ..schemas import (
+    UserCreate,
+    UserListResponse,
+    UserResponse,
+    UserRole,
+    UserUpdate,
+)
+
+# Handlers return ORM rows; the response models read them via from_attributes
 router = APIRouter(prefix="/api/v1/users", tags=["users"])
 
+admin_required = require_role(("admin",))
 
-def user_to_response(user: User) -> UserResponse:
-    """Convert User model to response schema."""
-    return UserResponse(
-        id=user.id,
-        username=user.username,
-        email=user.email,
-        role=user.role,
-        enabled=user.enabled,
-        created_at=user.created_at,
-        updated_at=user.updated_at,
-        last_login=user.last_login,
-    )
+# Audit diff over the fields a UserUpdate can carry
+diff_user = make_differ(tuple(UserUpdate.model_fields))
+
+
+def encode_user_cursor(user: User) -> str:
+    """Encode a user's position in the listing as an opaque cursor."""
+    raw = f"{user.created_at.isoformat()}|{user.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_user_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a cursor from encode_user_cursor into (created_at, id)."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, user_id = raw.split("|", 1)
+        return datetime.fromisoformat(timestamp), user_id
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"code": "INVALID_CURSOR", "message": "Invalid cursor"},
+        )
 
 
 @router.get("/", response_model=UserListResponse)
-async def list_users(
+def list_users(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
-    role: Optional[str] = None,
+    role: Optional[UserRole] = None,
     enabled: Optional[bool] = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_role(["admin"])),
+    current_user: User = Depends(admin_required),
 ):
     """
     List all users with pagination (admin only).
 
     - **role**: Filter by role (admin, moderator, viewer)
     - **enabled**: Filter by enabled status
+    - **cursor**: `next_cursor` from the previous page; takes precedence over
+      `page` and avoids OFFSET scans on deep pages
     """
-    users, total = crud.get_users(
-        db, page=page, per_page=per_page, role=role, enabled=enabled
-    )
+    role = role.value if role else None
+    if cursor:
+        users, total = crud.get_users_keyset(
+            db,
+            decode_user_cursor(cursor),
+            per_page=per_page,
+            role=role,
+            enabled=enabled,
+        )
+    else:
+        users, total = crud.get_users(
+            db, page=page, per_page=per_page, role=role, enabled=enabled
+        )
 
     return UserListResponse(
-        items=[user_to_response(u) for u in users],
+        items=users,
         total=total,
         page=page,
         per_page=per_page,
-        pages=math.ceil(total / per_page) if total > 0 else 1,
+        pages=(total + per_page - 1) // per_page if total else 1,
+        next_cursor=encode_user_cursor(users[-1]) if len(users) == per_page else None,
     )
 
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def create_user(
+def create_user(
     request: Request,
     user_data: UserCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_role(["admin"])),
+    current_user: User = Depends(admin_required),
 ):
     """Create a new user (admin only)."""
-    # Check for duplicate username
-    existing = crud.get_user_by_username(db, user_data.username)
-    if existing:
+    # Check for duplicate username and email in one lookup
+    conflicts = crud.find_user_conflicts(db, user_data.username, user_data.email)
+    if conflicts["username"]:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail={
@@ -78,18 +122,14 @@ async def create_user(
                 "message": f"Username '{user_data.username}' already exists",
             },
         )
-
-    # Check for duplicate email
-    if user_data.email:
-        existing_email = crud.get_user_by_email(db, user_data.email)
-        if existing_email:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail={
-                    "code": "CONFLICT",
-                    "message": f"Email '{user_data.email}' already registered",
-                },
-            )
+    if conflicts["email"]:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "code": "CONFLICT",
+                "message": f"Email '{user_data.email}' already registered",
+            },
+        )
 
     user = crud.create_user(db, user_data)
 
@@ -104,14 +144,14 @@ async def create_user(
         ip_address=get_client_ip(request),
     )
 
-    return user_to_response(user)
+    return user
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-async def get_user(
+def get_user(
     user_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_role(["admin"])),
+    current_user: User = Depends(admin_required),
 ):
     """Get a user by ID (admin only)."""
     user = crud.get_user(db, user_id)
@@ -121,16 +161,16 @@ async def get_user(
             detail={"code": "NOT_FOUND", "message": "User not found"},
         )
 
-    return user_to_response(user)
+    return user
 
 
 @router.put("/{user_id}", response_model=UserResponse)
-async def update_user(
+def update_user(
     request: Request,
     user_id: str,
     user_data: UserUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_role(["admin"])),
+    current_user: User = Depends(admin_required),
 ):
     """Update a user (admin only)."""
     user = crud.get_user(db, user_id)
@@ -142,8 +182,7 @@ async def update_user(
 
     # Check for duplicate email if changing
     if user_data.email and user_data.email != user.email:
-        existing_email = crud.get_user_by_email(db, user_data.email)
-        if existing_email:
+        if crud.email_exists(db, user_data.email):
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail={
@@ -152,11 +191,12 @@ async def update_user(
                 },
             )
 
-    # Compute changes for audit
-    update_data = user_data.model_dump(exclude_unset=True)
-    changes = compute_changes(user, update_data, list(update_data.keys()))
+    # One dump feeds both the audit diff and the update; mode="json" turns the
+    # role enum into the stored string
+    update_data = user_data.model_dump(exclude_unset=True, mode="json")
+    changes = diff_user(user, update_data)
 
-    updated_user = crud.update_user(db, user_id, user_data)
+    updated_user = crud.update_user(db, user_id, update_data)
 
     # Audit log
     if changes:
@@ -170,15 +210,15 @@ async def update_user(
             ip_address=get_client_ip(request),
         )
 
-    return user_to_response(updated_user)
+    return updated_user
 
 
-@router.delete("/{user_id}")
-async def delete_user(
+@router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_user(
     request: Request,
     user_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_role(["admin"])),
+    current_user: User = Depends(admin_required),
 ):
     """Delete a user (admin only)."""
     user = crud.get_user(db, user_id)
@@ -211,27 +251,23 @@ async def delete_user(
         ip_address=get_client_ip(request),
     )
 
-    return {"status": "deleted", "id": user_id}
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
-@router.put("/{user_id}/enable")
-async def enable_user(
+@router.put("/{user_id}/enable", status_code=status.HTTP_204_NO_CONTENT)
+def enable_user(
     request: Request,
     user_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_role(["admin"])),
+    current_user: User = Depends(admin_required),
 ):
     """Enable a user account (admin only)."""
-    user = crud.get_user(db, user_id)
-    if not user:
+    if crud.set_user_enabled(db, user_id, True) is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail={"code": "NOT_FOUND", "message": "User not found"},
         )
 
-    user.enabled = True
-    db.commit()
-
     # Audit log
     log_action(
         db=db,
@@ -242,24 +278,17 @@ async def enable_user(
         ip_address=get_client_ip(request),
     )
 
-    return {"status": "enabled", "id": user_id}
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
-@router.put("/{user_id}/disable")
-async def disable_user(
+@router.put("/{user_id}/disable", status_code=status.HTTP_204_NO_CONTENT)
+def disable_user(
     request: Request,
     user_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_role(["admin"])),
+    current_user: User = Depends(admin_required),
 ):
     """Disable a user account (admin only)."""
-    user = crud.get_user(db, user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail={"code": "NOT_FOUND", "message": "User not found"},
-        )
-
     # Prevent self-disabling
     if user_id == current_user.id:
         raise HTTPException(
@@ -270,8 +299,11 @@ async def disable_user(
             },
         )
 
-    user.enabled = False
-    db.commit()
+    if crud.set_user_enabled(db, user_id, False) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "NOT_FOUND", "message": "User not found"},
+        )
 
     # Audit log
     log_action(
@@ -283,29 +315,25 @@ async def disable_user(
         ip_address=get_client_ip(request),
     )
 
-    return {"status": "disabled", "id": user_id}
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
-@router.put("/{user_id}/role")
-async def change_user_role(
+@router.put("/{user_id}/role", status_code=status.HTTP_204_NO_CONTENT)
+def change_user_role(
     request: Request,
     user_id: str,
-    role: str = Query(..., pattern="^(admin|moderator|viewer)$"),
+    role: UserRole = Query(...),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_role(["admin"])),
+    current_user: User = Depends(admin_required),
 ):
-    """Change a user's role (admin only)."""
-    user = crud.get_user(db, user_id)
-    if not user:
+    """Change a user's role (admin only); the old role is kept in the audit log."""
+    old_role = crud.set_user_role(db, user_id, role.value)
+    if old_role is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail={"code": "NOT_FOUND", "message": "User not found"},
         )
 
-    old_role = user.role
-    user.role = role
-    db.commit()
-
     # Audit log
     log_action(
         db=db,
@@ -313,13 +341,8 @@ async def change_user_role(
         action=AuditAction.USER_ROLE_CHANGE,
         resource_type="user",
         resource_id=user_id,
-        changes={"role": {"old": old_role, "new": role}},
+        changes={"role": {"old": old_role, "new": role.value}},
         ip_address=get_client_ip(request),
     )
 
-    return {
-        "status": "role_changed",
-        "id": user_id,
-        "old_role": old_role,
-        "new_role": role,
-    }
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
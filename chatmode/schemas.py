@@ -81,6 +81,8 @@ class UserListResponse(BaseModel):
     page: int
     per_page: int
     pages: int
+    # Opaque keyset cursor for the next page; None on the last page
+    next_cursor: Optional[str] = None
 
 
 # ============================================================================
@@ -365,6 +367,15 @@ class AuditLogListResponse(BaseModel):
     pages: int
 
 
+class AuditStatsResponse(BaseModel):
+    period_days: int
+    total_actions: int
+    by_action: Dict[str, int]
+    by_resource_type: Dict[str, int]
+    by_user: Dict[str, int]
+    daily_activity: Dict[str, int]
+
+
 # ============================================================================
 # Status & Health
 # ============================================================================
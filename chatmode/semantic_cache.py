@@ -0,0 +1,245 @@
+"""
+Response cache for agent turns.
+
+Exact lookups use a SHA-256 key over the prompt inputs; on a miss, an
+optional embedding function enables a nearest-neighbour fallback so that
+near-identical conversation states (resumed sessions, retries) can reuse a
+previous reply.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EmbedFn = Callable[[List[str]], List[List[float]]]
+
+
+def make_cache_key(*parts: str) -> str:
+    """Stable key for a sequence of prompt parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+def _normalize(vector: Sequence[float]) -> np.ndarray:
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return array / norm if norm else array
+
+
+@dataclass
+class _Entry:
+    response: str
+    created_at: float
+    slot: Optional[int] = None
+
+
+def _guard_hash(guard: Optional[str]) -> int:
+    return hash(guard) if guard is not None else 0
+
+
+class SemanticCache:
+    """
+    In-process LRU cache of agent responses with optional semantic lookup.
+
+    Args:
+        embed_fn: Embeds a batch of texts; enables similarity lookups when set
+        threshold: Minimum cosine similarity for a semantic hit
+        ttl: Seconds an entry stays valid
+        max_entries: Oldest entries are evicted beyond this size
+    """
+
+    def __init__(
+        self,
+        embed_fn: Optional[EmbedFn] = None,
+        threshold: float = 0.92,
+        ttl: float = 3600.0,
+        max_entries: int = 1024,
+    ):
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Embeddings live in one contiguous (max_entries, dim) float32 matrix
+        # so a lookup is a single matrix-vector product; rows are slots that
+        # entries claim and release, tracked by the parallel arrays below.
+        self._matrix: Optional[np.ndarray] = None
+        self._slot_keys: List[Optional[str]] = []
+        self._slot_created = np.empty(0)
+        self._slot_used = np.zeros(0, dtype=bool)
+        # A similarity match also needs an equal guard (e.g. the last message)
+        self._slot_guard = np.zeros(0, dtype=np.int64)
+        self._free_slots: List[int] = []
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        if self.embed_fn is None or not text:
+            return None
+        try:
+            return _normalize(self.embed_fn([text])[0])
+        except Exception:
+            return None
+
+    def _claim_slot(
+        self, key: str, embedding: np.ndarray, now: float, guard: int
+    ) -> Optional[int]:
+        if self._matrix is None:
+            self._matrix = np.zeros(
+                (self.max_entries, embedding.shape[0]), dtype=np.float32
+            )
+            self._slot_keys = [None] * self.max_entries
+            self._slot_created = np.zeros(self.max_entries)
+            self._slot_used = np.zeros(self.max_entries, dtype=bool)
+            self._slot_guard = np.zeros(self.max_entries, dtype=np.int64)
+            self._free_slots = list(range(self.max_entries - 1, -1, -1))
+        if embedding.shape[0] != self._matrix.shape[1] or not self._free_slots:
+            return None
+        slot = self._free_slots.pop()
+        self._matrix[slot] = embedding
+        self._slot_keys[slot] = key
+        self._slot_created[slot] = now
+        self._slot_used[slot] = True
+        self._slot_guard[slot] = guard
+        return slot
+
+    def _release_slot(self, entry: _Entry) -> None:
+        if entry.slot is not None:
+            self._slot_used[entry.slot] = False
+            self._slot_keys[entry.slot] = None
+            self._free_slots.append(entry.slot)
+            entry.slot = None
+
+    def _expired(self, entry: _Entry, now: float) -> bool:
+        return now - entry.created_at > self.ttl
+
+    def get(
+        self, key: str, text: Optional[str] = None, guard: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Exact key from make_cache_key
+            text: Prompt text used for the similarity fallback
+            guard: A similarity match is only accepted from an entry stored
+                with the same guard
+
+        Returns:
+            Cached response, or None on a miss
+        """
+        return self.lookup(key, text, guard)[0]
+
+    def lookup(
+        self, key: str, text: Optional[str] = None, guard: Optional[str] = None
+    ) -> Tuple[Optional[str], Optional[np.ndarray]]:
+        """
+        Like get, but also return the embedding of ``text`` if one was made.
+
+        Passing that embedding to put on a miss stores the reply without
+        embedding the same text a second time.
+
+        Returns:
+            (cached response or None, query embedding or None)
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._expired(entry, now):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.response, None
+
+        query = self._embed(text) if text is not None else None
+        if query is not None:
+            with self._lock:
+                best_key = self._nearest(query, now, _guard_hash(guard))
+                if best_key is not None:
+                    self._entries.move_to_end(best_key)
+                    self.hits += 1
+                    self.semantic_hits += 1
+                    return self._entries[best_key].response, query
+
+        with self._lock:
+            self.misses += 1
+        return None, query
+
+    def _nearest(self, query: np.ndarray, now: float, guard: int) -> Optional[str]:
+        """Key of the most similar live entry at or above the threshold."""
+        if self._matrix is None or query.shape[0] != self._matrix.shape[1]:
+            return None
+        live = (
+            self._slot_used
+            & (now - self._slot_created <= self.ttl)
+            & (self._slot_guard == guard)
+        )
+        if not live.any():
+            return None
+        scores = self._matrix @ query
+        scores[~live] = -np.inf
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        return self._slot_keys[best]
+
+    def put(
+        self,
+        key: str,
+        response: str,
+        text: Optional[str] = None,
+        embedding: Optional[np.ndarray] = None,
+        guard: Optional[str] = None,
+    ) -> None:
+        """
+        Store a response under ``key``.
+
+        ``embedding`` (as returned by lookup) is used as is; otherwise
+        ``text`` is embedded if an embedding function is configured.
+        ``guard`` must match for later similarity hits on this entry.
+        """
+        if embedding is None and text is not None:
+            embedding = self._embed(text)
+        now = time.monotonic()
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._release_slot(previous)
+            while len(self._entries) >= self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._release_slot(evicted)
+            entry = _Entry(response, now)
+            if embedding is not None:
+                entry.slot = self._claim_slot(key, embedding, now, _guard_hash(guard))
+            self._entries[key] = entry
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+            self._slot_keys = []
+            self._slot_created = np.empty(0)
+            self._slot_used = np.zeros(0, dtype=bool)
+            self._slot_guard = np.zeros(0, dtype=np.int64)
+            self._free_slots = []
+            self.hits = self.semantic_hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+            }
@@ -11,6 +11,7 @@ import re
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+import aiohttp
 from sqlalchemy.orm import Session
 
 from ..models import Provider
@@ -458,78 +459,85 @@ async def initialize_providers(
     all_providers = merge_provider_sources(env_providers, shell_providers)
     results["total_discovered"] = len(all_providers)
 
-    # Initialize each provider
-    for config in all_providers:
-        try:
-            # Check if provider already exists
-            existing = (
-                db.query(Provider).filter(Provider.name == config["name"]).first()
-            )
-
-            if existing:
-                # Update existing provider
-                existing.base_url = config["base_url"]
-                if config["api_key"]:
-                    existing.api_key_encrypted = config["api_key"]
-                existing.auto_sync_enabled = config["auto_sync"]
-                db.commit()
-
-                result = {
-                    "name": config["name"],
-                    "action": "updated",
-                    "provider_id": existing.id,
-                    "source": config.get("source", "environment"),
-                }
-
-                # Sync models if enabled
-                if auto_sync and config["auto_sync"]:
-                    sync_result = await sync_provider_models(db, existing)
-                    result["sync"] = sync_result
-                    if sync_result.get("success"):
-                        results["successful"] += 1
-                    else:
-                        results["failed"] += 1
-
-                results["providers"].append(result)
-            else:
-                # Create new provider
-                provider = create_provider_from_config(
-                    db=db,
-                    name=config["name"],
-                    base_url=config["base_url"],
-                    api_key=config["api_key"],
-                    provider_type=config["provider_type"],
-                    auto_sync=config["auto_sync"],
+    # Initialize each provider, syncing them over one HTTP connection pool
+    async with aiohttp.ClientSession() as session:
+        for config in all_providers:
+            try:
+                # Check if provider already exists
+                existing = (
+                    db.query(Provider)
+                    .filter(Provider.name == config["name"])
+                    .first()
                 )
 
-                result = {
-                    "name": config["name"],
-                    "action": "created",
-                    "provider_id": provider.id,
-                    "source": config.get("source", "environment"),
-                }
-
-                # Sync models if enabled
-                if auto_sync and config["auto_sync"]:
-                    sync_result = await sync_provider_models(db, provider)
-                    result["sync"] = sync_result
-                    if sync_result.get("success"):
-                        results["successful"] += 1
-                    else:
-                        results["failed"] += 1
+                if existing:
+                    # Update existing provider
+                    existing.base_url = config["base_url"]
+                    if config["api_key"]:
+                        existing.api_key_encrypted = config["api_key"]
+                    existing.auto_sync_enabled = config["auto_sync"]
+                    db.commit()
+
+                    result = {
+                        "name": config["name"],
+                        "action": "updated",
+                        "provider_id": existing.id,
+                        "source": config.get("source", "environment"),
+                    }
 
-                results["providers"].append(result)
+                    # Sync models if enabled
+                    if auto_sync and config["auto_sync"]:
+                        sync_result = await sync_provider_models(
+                            db, existing, session=session
+                        )
+                        result["sync"] = sync_result
+                        if sync_result.get("success"):
+                            results["successful"] += 1
+                        else:
+                            results["failed"] += 1
+
+                    results["providers"].append(result)
+                else:
+                    # Create new provider
+                    provider = create_provider_from_config(
+                        db=db,
+                        name=config["name"],
+                        base_url=config["base_url"],
+                        api_key=config["api_key"],
+                        provider_type=config["provider_type"],
+                        auto_sync=config["auto_sync"],
+                    )
+
+                    result = {
+                        "name": config["name"],
+                        "action": "created",
+                        "provider_id": provider.id,
+                        "source": config.get("source", "environment"),
+                    }
 
-        except Exception as e:
-            results["failed"] += 1
-            results["providers"].append(
-                {
-                    "name": config["name"],
-                    "action": "error",
-                    "error": str(e),
-                    "source": config.get("source", "environment"),
-                }
-            )
+                    # Sync models if enabled
+                    if auto_sync and config["auto_sync"]:
+                        sync_result = await sync_provider_models(
+                            db, provider, session=session
+                        )
+                        result["sync"] = sync_result
+                        if sync_result.get("success"):
+                            results["successful"] += 1
+                        else:
+                            results["failed"] += 1
+
+                    results["providers"].append(result)
+
+            except Exception as e:
+                results["failed"] += 1
+                results["providers"].append(
+                    {
+                        "name": config["name"],
+                        "action": "error",
+                        "error": str(e),
+                        "source": config.get("source", "environment"),
+                    }
+                )
 
     return results
 
@@ -6,10 +6,11 @@ including Ollama, OpenAI, DeepSeek, Fireworks AI, xAI, and any OpenAI-compatible
 """
 
 import asyncio
+import contextlib
 import json
 import os
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import aiohttp
 from sqlalchemy.orm import Session
@@ -77,10 +78,23 @@ def get_provider_display_name(provider_type: str, base_url: str) -> str:
     return f"Provider ({hostname})"
 
 
+@contextlib.asynccontextmanager
+async def _http_session(
+    session: Optional[aiohttp.ClientSession],
+) -> AsyncIterator[aiohttp.ClientSession]:
+    """Use the caller's session, or open one for just this request."""
+    if session is not None:
+        yield session
+        return
+    async with aiohttp.ClientSession() as owned:
+        yield owned
+
+
 async def fetch_models_from_provider(
     base_url: str,
     api_key: Optional[str] = None,
     headers: Optional[Dict[str, str]] = None,
+    session: Optional[aiohttp.ClientSession] = None,
 ) -> List[Dict[str, Any]]:
     """
     Fetch available models from an OpenAI-compatible /models endpoint.
@@ -89,6 +103,8 @@ async def fetch_models_from_provider(
         base_url: Provider's base URL
         api_key: Optional API key for authentication
         headers: Optional additional headers
+        session: Shared HTTP session, so syncing several providers reuses
+            one connection pool; a private one is opened when omitted
 
     Returns:
         List of model dictionaries with id, name, and capabilities
@@ -101,20 +117,20 @@ async def fetch_models_from_provider(
 
     models_url = f"{base_url}/models"
 
-    request_headers = headers or {}
+    request_headers = dict(headers or {})
     if api_key:
         request_headers["Authorization"] = f"Bearer {api_key}"
 
-    async with aiohttp.ClientSession() as session:
+    async with _http_session(session) as http:
         try:
-            async with session.get(
+            async with http.get(
                 models_url, headers=request_headers, timeout=30
             ) as response:
                 if response.status == 404:
                     # Try without /v1 for Ollama native API
                     if "ollama" in base_url.lower() or "11434" in base_url:
                         return await _fetch_ollama_models(
-                            base_url.replace("/v1", ""), api_key, headers
+                            base_url.replace("/v1", ""), api_key, headers, http
                         )
                     raise ValueError(f"Models endpoint not found at {models_url}")
 
@@ -148,6 +164,7 @@ async def _fetch_ollama_models(
     base_url: str,
     api_key: Optional[str] = None,
     headers: Optional[Dict[str, str]] = None,
+    session: Optional[aiohttp.ClientSession] = None,
 ) -> List[Dict[str, Any]]:
     """
     Fetch models from Ollama's native API.
@@ -156,6 +173,7 @@ async def _fetch_ollama_models(
         base_url: Ollama base URL (without /v1)
         api_key: Optional API key
         headers: Optional additional headers
+        session: Shared HTTP session (see fetch_models_from_provider)
 
     Returns:
         List of model dictionaries
@@ -163,12 +181,12 @@ async def _fetch_ollama_models(
     base_url = base_url.rstrip("/")
     tags_url = f"{base_url}/api/tags"
 
-    request_headers = headers or {}
+    request_headers = dict(headers or {})
     if api_key:
         request_headers["Authorization"] = f"Bearer {api_key}"
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(
+    async with _http_session(session) as http:
+        async with http.get(
             tags_url, headers=request_headers, timeout=30
         ) as response:
             response.raise_for_status()
@@ -271,7 +289,10 @@ def _detect_vision_support(model_id: str) -> bool:
 
 
 async def sync_provider_models(
-    db: Session, provider: Provider, api_key: Optional[str] = None
+    db: Session,
+    provider: Provider,
+    api_key: Optional[str] = None,
+    session: Optional[aiohttp.ClientSession] = None,
 ) -> Dict[str, Any]:
     """
     Sync models from a provider and update the database.
@@ -280,6 +301,7 @@ async def sync_provider_models(
         db: Database session
         provider: Provider instance to sync
         api_key: Optional API key (if not stored in provider)
+        session: Shared HTTP session (see fetch_models_from_provider)
 
     Returns:
         Dictionary with sync results
@@ -294,6 +316,7 @@ async def sync_provider_models(
             provider.base_url,
             api_key=api_key or provider.api_key_encrypted,
             headers=provider.headers,
+            session=session,
         )
 
         # Get existing model IDs for this provider
@@ -394,9 +417,10 @@ async def sync_all_providers(db: Session) -> List[Dict[str, Any]]:
     )
 
     results = []
-    for provider in providers:
-        result = await sync_provider_models(db, provider)
-        results.append(result)
+    async with aiohttp.ClientSession() as session:
+        for provider in providers:
+            result = await sync_provider_models(db, provider, session=session)
+            results.append(result)
 
     return results
 
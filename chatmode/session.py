@@ -10,11 +10,16 @@ with support for:
 """
 
 import asyncio
+import functools
 import json
 import os
 import time
 import uuid
-from typing import Any, Dict, List, Optional, Set, Tuple
+from collections import deque
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
 
 from .admin import AdminAgent
 from .agent import ChatAgent
@@ -22,43 +27,102 @@ from .agent_state import AgentState, AgentStateManager, create_session_state_man
 from .config import Settings
 from .content_filter import ContentFilter, create_filter_from_permissions
 from .logger_config import get_logger, log_execution_time, log_operation
-from .tts_provider import AudioStorage, TTSResult, build_tts_provider
+from .tts_provider import (
+    AudioStorage,
+    TTSResult,
+    build_tts_provider,
+    get_mime_type_for_format,
+)
+from .utils import read_json_file_cached
 
 logger = get_logger(__name__)
 
+# Bound on memory writes left in flight before a turn waits for them
+MAX_PENDING_MEMORY_WRITES = 32
+
+# Number of recent messages kept for status polling
+LAST_MESSAGES_LIMIT = 8
+
+# Turns waiting for audio before the conversation waits for TTS to catch up
+TTS_QUEUE_SIZE = 64
+
+# Longest reply sent to TTS; the OpenAI speech endpoint rejects longer input
+MAX_TTS_CHARS = 4096
+
+# Longest reply kept in session history; the full reply still goes to memory
+MAX_STORED_CHARS = 8192
+TRUNCATION_MARKER = "...[truncated]"
+
+# agent_config.json lives in the project root (parent of chatmode package)
+AGENT_CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "agent_config.json"
+)
+
+
+class HistorySnapshot(Sequence):
+    """
+    Read-only view of the first ``length`` messages of a history list.
+
+    Session history is append-only until summarization swaps in a new list,
+    so a prefix view pins a round's history in O(1) instead of copying it.
+    """
+
+    __slots__ = ("_messages", "_length")
+
+    def __init__(self, messages: List[Dict[str, Any]]):
+        self._messages = messages
+        self._length = len(messages)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._messages[i] for i in range(self._length)[index]]
+        return self._messages[range(self._length)[index]]
+
 
 @log_execution_time(logger)
 def load_agents(settings: Settings) -> List[ChatAgent]:
     """Load agents from configuration file."""
-    # Look for agent_config.json in project root (parent of chatmode package)
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    config_path = os.path.join(project_root, "agent_config.json")
+    config_path = AGENT_CONFIG_PATH
 
     logger.debug(f"📂 Loading agent configuration from: {config_path}")
 
-    with open(config_path, "r") as f:
-        config = json.load(f)
+    # Reparsed only when the file changes between session starts
+    config = read_json_file_cached(config_path)
 
-    agents: List[ChatAgent] = []
     agent_configs = config.get("agents", [])
     logger.info(f"🔧 Loading {len(agent_configs)} agents from configuration")
+    if not agent_configs:
+        return []
 
-    for agent_conf in agent_configs:
+    def _load(agent_conf: Dict[str, Any]) -> ChatAgent:
         agent_name = agent_conf.get("name", "agent")
-        config_file = agent_conf["file"]
-        logger.debug(f"🤖 Loading agent: {agent_name} from {config_file}")
+        logger.debug(f"🤖 Loading agent: {agent_name} from {agent_conf['file']}")
+        return ChatAgent(
+            name=agent_name,
+            config_file=agent_conf["file"],
+            settings=settings,
+        )
 
-        try:
-            agent = ChatAgent(
-                name=agent_name,
-                config_file=config_file,
-                settings=settings,
-            )
-            agents.append(agent)
-            logger.debug(f"✅ Agent '{agent_name}' loaded successfully")
-        except Exception as e:
-            logger.error(f"❌ Failed to load agent '{agent_name}': {e}", exc_info=True)
-            raise
+    # Agent construction is dominated by file reads and client setup, so
+    # build them concurrently; results are collected in config order.
+    agents: List[ChatAgent] = []
+    with ThreadPoolExecutor(max_workers=min(8, len(agent_configs))) as executor:
+        futures = [executor.submit(_load, conf) for conf in agent_configs]
+        for agent_conf, future in zip(agent_configs, futures):
+            agent_name = agent_conf.get("name", "agent")
+            try:
+                agents.append(future.result())
+                logger.debug(f"✅ Agent '{agent_name}' loaded successfully")
+            except Exception as e:
+                logger.error(
+                    f"❌ Failed to load agent '{agent_name}': {e}", exc_info=True
+                )
+                for pending in futures:
+                    pending.cancel()
+                raise
 
     logger.info(f"✅ Successfully loaded {len(agents)} agents")
     return agents
@@ -81,10 +145,12 @@ class ChatSession:
         self._task: Optional[asyncio.Task] = None
         self._running = False
         self._stop_event = asyncio.Event()
+        # Replaced on every state change so each waiter sees exactly one set()
+        self._change_event = asyncio.Event()
         self.topic: str = ""
         self.history: List[Dict[str, Any]] = []
-        self.last_messages: List[Dict[str, Any]] = []
-        self.agents: List[ChatAgent] = []
+        self.last_messages: Deque[Dict[str, Any]] = deque(maxlen=LAST_MESSAGES_LIMIT)
+        self.agents = []
         self.session_id: Optional[str] = None
         self.admin_agent: Optional[AdminAgent] = None
         self.content_filter: Optional[ContentFilter] = None
@@ -99,6 +165,13 @@ class ChatSession:
         # TTS provider (initialized on demand)
         self._tts_provider = None
 
+        # Memory writes still running in the executor
+        self._pending_memories: List[asyncio.Future] = []
+
+        # Recorded turns waiting for audio, synthesized by one worker task
+        self._tts_queue: Optional[asyncio.Queue] = None
+        self._tts_worker: Optional[asyncio.Task] = None
+
         logger.debug("ChatSession initialized")
 
     @property
@@ -140,7 +213,7 @@ class ChatSession:
 
             self.topic = topic
             self.history = []
-            self.last_messages = []
+            self.last_messages.clear()
             
             # Reset state manager for new session
             self.state_manager = create_session_state_manager()
@@ -166,9 +239,7 @@ class ChatSession:
             else:
                 self.admin_agent = None
 
-            self._running = True
-            self._stop_event.clear()
-            self._task = asyncio.create_task(self._run_loop())
+            self._spawn_loop()
             logger.info(f"✅ Session {self.session_id} started successfully")
             return True
 
@@ -191,12 +262,17 @@ class ChatSession:
                 for agent in self.agents:
                     await self.state_manager.register_agent(agent.name)
 
-            self._running = True
-            self._stop_event.clear()
-            self._task = asyncio.create_task(self._run_loop())
+            self._spawn_loop()
             logger.info(f"✅ Session {self.session_id} resumed successfully")
             return True
 
+    def _spawn_loop(self) -> None:
+        """Mark the session running and start the loop; caller holds _lock."""
+        self._running = True
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self._run_loop())
+        self._notify_change()
+
     async def stop(self) -> None:
         """Stop the session gracefully."""
         async with self._lock:
@@ -207,8 +283,10 @@ class ChatSession:
             logger.info(f"🛑 Stopping session: {self.session_id}")
             self._running = False
             self._stop_event.set()
+            self._notify_change()
 
-            # Cancel any active agent tasks
+            # Unwind under the lock: a start/resume arriving now must not spawn
+            # a second loop while this one is still running its cleanup
             for agent in self.agents:
                 await self.state_manager.stop_agent(agent.name, "Session stopped")
 
@@ -237,6 +315,7 @@ class ChatSession:
         rate = float(message_rate)
         # Keep within a safe and practical range
         self.message_rate = max(0.1, min(rate, 5.0))
+        self._notify_change()
         return self.message_rate
 
     def get_message_rate(self) -> float:
@@ -247,37 +326,106 @@ class ChatSession:
         """Compute per-turn delay from base sleep and current message rate."""
         return max(0.05, base_sleep_seconds / self.message_rate)
 
+    async def _pace(self, delay: float, started: float) -> None:
+        """
+        Wait out what remains of ``delay`` since ``started`` (monotonic).
+
+        Time already spent generating counts towards the delay, and a stop
+        request ends the wait immediately.
+        """
+        remaining = delay - (time.monotonic() - started)
+        if remaining <= 0 or not self._running:
+            return
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=remaining)
+        except asyncio.TimeoutError:
+            pass
+
+    @property
+    def agents(self) -> List[ChatAgent]:
+        """Agents taking part in the session, in speaking order."""
+        return self._agents
+
+    @agents.setter
+    def agents(self, agents: List[ChatAgent]) -> None:
+        self._agents = agents
+        self._index_agents()
+
+    def _index_agents(self) -> None:
+        """Rebuild the per-agent lookups derived from ``self.agents``."""
+        self._agents_by_name = {agent.name: agent for agent in self._agents}
+        # (voice, model) per agent, resolved against the settings defaults once
+        # rather than on every synthesized turn
+        self._tts_voices = {
+            agent.name: (
+                agent.tts_voice_override or self.settings.tts_voice,
+                agent.tts_model_override or self.settings.tts_model,
+            )
+            for agent in self._agents
+        }
+
+    def get_agent(self, name: str) -> Optional[ChatAgent]:
+        """Look up a session agent by name."""
+        return self._agents_by_name.get(name)
+
     def is_running(self) -> bool:
         """Check if session is running."""
         return self._running
 
+    def _notify_change(self) -> None:
+        """Wake every wait_for_change() caller."""
+        event, self._change_event = self._change_event, asyncio.Event()
+        event.set()
+
+    async def wait_for_change(self, timeout: float) -> bool:
+        """
+        Wait until the session's observable state changes.
+
+        Returns:
+            True if a change happened, False if ``timeout`` elapsed first
+        """
+        try:
+            await asyncio.wait_for(self._change_event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
     async def pause_agent(self, agent_name: str, reason: Optional[str] = None) -> bool:
         """Pause a specific agent."""
-        return await self.state_manager.pause_agent(agent_name, reason)
+        changed = await self.state_manager.pause_agent(agent_name, reason)
+        self._notify_change()
+        return changed
 
     async def resume_agent(self, agent_name: str) -> bool:
         """Resume a paused agent."""
-        return await self.state_manager.resume_agent(agent_name)
+        changed = await self.state_manager.resume_agent(agent_name)
+        self._notify_change()
+        return changed
 
     async def stop_agent(self, agent_name: str, reason: Optional[str] = None) -> bool:
         """Stop a specific agent."""
-        return await self.state_manager.stop_agent(agent_name, reason)
+        changed = await self.state_manager.stop_agent(agent_name, reason)
+        self._notify_change()
+        return changed
 
     async def finish_agent(self, agent_name: str, reason: Optional[str] = None) -> bool:
         """Mark an agent as finished."""
-        return await self.state_manager.finish_agent(agent_name, reason)
+        changed = await self.state_manager.finish_agent(agent_name, reason)
+        self._notify_change()
+        return changed
 
     async def restart_agent(self, agent_name: str) -> bool:
         """Restart a stopped or finished agent."""
-        return await self.state_manager.restart_agent(agent_name)
+        changed = await self.state_manager.restart_agent(agent_name)
+        self._notify_change()
+        return changed
 
     async def get_agent_states(self) -> Dict[str, dict]:
         """Get states of all agents with runtime details."""
         base_states = await self.state_manager.get_states_dict()
-        agents_by_name = {agent.name: agent for agent in self.agents}
 
         for name, state in base_states.items():
-            agent = agents_by_name.get(name)
+            agent = self.get_agent(name)
             if not agent:
                 continue
 
@@ -320,6 +468,8 @@ class ChatSession:
                     await agent.mcp_client.list_tools()
             except Exception as exc:
                 logger.error(f"Failed to sync agent {agent.name}: {exc}")
+        # Profiles may have changed voice overrides
+        self._index_agents()
 
         # Register any missing agents and unregister stale ones
         active_names = {agent.name for agent in self.agents}
@@ -352,16 +502,14 @@ class ChatSession:
                 }
                 self.history.append(entry)
                 self.last_messages.append(entry)
-                if len(self.last_messages) > 8:
-                    self.last_messages.pop(0)
+                self._notify_change()
                 return
             content = filtered_content
 
         entry = {"sender": sender, "content": content}
         self.history.append(entry)
         self.last_messages.append(entry)
-        if len(self.last_messages) > 8:
-            self.last_messages.pop(0)
+        self._notify_change()
 
     async def _generate_tts(
         self,
@@ -380,12 +528,26 @@ class ChatSession:
 
         try:
             # Get per-agent TTS settings
-            voice = agent.tts_voice_override or self.settings.tts_voice
-            model = agent.tts_model_override or self.settings.tts_model
+            voice, model = self._tts_voices.get(agent.name) or (
+                agent.tts_voice_override or self.settings.tts_voice,
+                agent.tts_model_override or self.settings.tts_model,
+            )
             format = self.settings.tts_format
             speed = self.settings.tts_speed
             instructions = self.settings.tts_instructions or None
 
+            # Repeated lines (greetings, resumed sessions) skip synthesis entirely
+            cached_path = self.audio_storage.get_cached_path(
+                text=text, voice=voice, model=model, format=format, speed=speed
+            )
+            if cached_path is not None:
+                return {
+                    "audio_url": f"/audio/{cached_path}",
+                    "audio_format": format,
+                    "audio_mime": get_mime_type_for_format(format),
+                    "audio_cached": True,
+                }
+
             # Generate audio
             result = await self.tts_provider.synthesize(
                 text=text,
@@ -416,26 +578,28 @@ class ChatSession:
             }
 
         except Exception as e:
-            logger.error(f"TTS generation failed for message {message_id}: {e}")
+            logger.error("TTS generation failed for message %s: %s", message_id, e)
             return None
 
     async def _generate_agent_response(
         self,
         agent: ChatAgent,
+        history: Optional[List[Dict[str, Any]]] = None,
     ) -> Tuple[str, Optional[Dict[str, str]]]:
         """
-        Generate agent response with TTS.
+        Generate an agent's text response.
 
-        This runs in a separate task for cancellation support.
+        This runs in a separate task for cancellation support. Audio is
+        synthesized later by the TTS worker, once the turn is recorded.
         """
-        message_id = str(uuid.uuid4())
+        history = self.history if history is None else history
 
         # Generate text response
-        response = await asyncio.get_event_loop().run_in_executor(
+        response = await asyncio.get_running_loop().run_in_executor(
             None,
             agent.generate_response,
             self.topic,
-            self.history,
+            history,
         )
 
         # Handle tuple return from generate_response
@@ -445,13 +609,9 @@ class ChatSession:
             response_text = response
             legacy_audio_path = None
 
-        # Generate TTS if enabled
+        # Audio the agent already produced itself (legacy TTS client)
         audio_info = None
-        if self.settings.tts_enabled and response_text:
-            audio_info = await self._generate_tts(response_text, agent, message_id)
-
-        # If legacy audio path exists but no new TTS, use legacy
-        if not audio_info and legacy_audio_path:
+        if legacy_audio_path:
             audio_info = {
                 "audio_url": f"/audio/{os.path.basename(legacy_audio_path)}",
                 "audio_format": "mp3",
@@ -468,34 +628,55 @@ class ChatSession:
         Returns:
             True if turn completed successfully, False if interrupted/cancelled
         """
+        result = await self._generate_turn(agent)
+        if result is None:
+            return False
+        self._record_turn(agent, *result)
+        await self._queue_tts(agent, result[1])
+        if len(self._pending_memories) > MAX_PENDING_MEMORY_WRITES:
+            await self._flush_memories()
+        return True
+
+    async def _generate_turn(
+        self,
+        agent: ChatAgent,
+        history: Optional[List[Dict[str, Any]]] = None,
+    ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Generate an agent's reply without adding it to the conversation.
+
+        Returns:
+            Tuple of (raw_response, history_entry), or None if the turn was
+            skipped, cancelled or failed
+        """
         agent_name = agent.name
 
         # Check if agent is still active
         if not await self.state_manager.is_active(agent_name):
-            logger.debug(f"Skipping inactive agent '{agent_name}'")
-            return False
+            logger.debug("Skipping inactive agent %r", agent_name)
+            return None
 
         # Set current task for cancellation support
-        logger.info(f"Running agent turn for {agent.name}")
-        task = asyncio.create_task(self._generate_agent_response(agent))
+        logger.info("Running agent turn for %s", agent.name)
+        task = asyncio.create_task(self._generate_agent_response(agent, history))
         await self.state_manager.set_task(agent_name, task)
+        self._notify_change()
 
         try:
             response, audio_info = await task
         except asyncio.CancelledError:
-            logger.info(f"Agent '{agent_name}' turn was cancelled")
-            await self.state_manager.set_task(agent_name, None)
-            return False
+            logger.info("Agent %r turn was cancelled", agent_name)
+            return None
         except Exception as e:
-            logger.error(f"Error in agent '{agent_name}' turn: {e}")
-            await self.state_manager.set_task(agent_name, None)
-            return False
+            logger.error("Error in agent %r turn: %s", agent_name, e)
+            return None
         finally:
             await self.state_manager.set_task(agent_name, None)
+            self._notify_change()
 
         # Check if still running after generation
         if not self._running:
-            return False
+            return None
 
         # Apply content filter
         allowed, filtered_response, filter_msg = self._filter_response(response)
@@ -507,6 +688,10 @@ class ChatSession:
                 or f"[{agent.full_name}'s message blocked due to inappropriate content]",
             }
         else:
+            if len(filtered_response) > MAX_STORED_CHARS:
+                filtered_response = (
+                    filtered_response[:MAX_STORED_CHARS] + TRUNCATION_MARKER
+                )
             entry = {
                 "sender": agent.full_name,
                 "content": filtered_response,
@@ -514,27 +699,106 @@ class ChatSession:
             if audio_info:
                 entry.update(audio_info)
 
+        return response, entry
+
+    def _record_turn(
+        self, agent: ChatAgent, response: str, entry: Dict[str, Any]
+    ) -> None:
+        """Append a generated turn to history and every agent's memory."""
         # Add to history
         self.history.append(entry)
         self.last_messages.append(entry)
-        if len(self.last_messages) > 8:
-            self.last_messages.pop(0)
+        self._notify_change()
 
-        # Store in memory
+        # Store in memory off the event loop; awaited at the end of the round
+        loop = asyncio.get_running_loop()
         for memory_agent in self.agents:
-            try:
-                memory_agent.remember_message(
-                    agent.full_name,
-                    response,
-                    session_id=self.session_id,
-                    topic=self.topic,
-                )
-            except Exception as e:
-                logger.error(
-                    f"Failed to store memory for agent '{memory_agent.name}': {e}"
+            self._pending_memories.append(
+                loop.run_in_executor(
+                    None,
+                    functools.partial(
+                        self._remember,
+                        memory_agent,
+                        agent.full_name,
+                        response,
+                        self.session_id,
+                        self.topic,
+                    ),
                 )
+            )
 
-        return True
+    @staticmethod
+    def _remember(
+        memory_agent: ChatAgent,
+        sender: str,
+        content: str,
+        session_id: Optional[str],
+        topic: str,
+    ) -> None:
+        try:
+            memory_agent.remember_message(
+                sender, content, session_id=session_id, topic=topic
+            )
+        except Exception as e:
+            logger.error(
+                "Failed to store memory for agent %r: %s", memory_agent.name, e
+            )
+
+    async def _flush_memories(self) -> None:
+        """Wait for queued memory writes to finish."""
+        pending, self._pending_memories = self._pending_memories, []
+        if pending:
+            await asyncio.gather(*pending)
+
+    async def _queue_tts(self, agent: ChatAgent, entry: Dict[str, Any]) -> None:
+        """
+        Queue audio synthesis for a recorded turn.
+
+        The next turn starts without waiting for the audio; the worker adds
+        the audio fields to ``entry`` in place when synthesis finishes. Only
+        blocks when TTS_QUEUE_SIZE turns are already waiting.
+        """
+        if not self.settings.tts_enabled or "audio_url" in entry:
+            return
+        # Blocked replies are recorded as System messages and get no audio
+        if entry.get("sender") != agent.full_name:
+            return
+        content = entry.get("content")
+        if not content or len(content) > MAX_TTS_CHARS or content.isspace():
+            return
+        if self._tts_worker is None or self._tts_worker.done():
+            self._tts_queue = asyncio.Queue(maxsize=TTS_QUEUE_SIZE)
+            self._tts_worker = asyncio.create_task(self._tts_loop(self._tts_queue))
+        await self._tts_queue.put((agent, entry))
+
+    async def _tts_loop(self, queue: asyncio.Queue) -> None:
+        """Synthesize queued turns in order until a None sentinel arrives."""
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            agent, entry = item
+            audio_info = await self._generate_tts(
+                entry["content"], agent, str(uuid.uuid4())
+            )
+            if audio_info:
+                entry.update(audio_info)
+                self._notify_change()
+
+    async def _close_tts_worker(self, drain: bool) -> None:
+        """Finish (``drain``) or cancel the audio still queued."""
+        worker, self._tts_worker = self._tts_worker, None
+        if worker is None or worker.done():
+            return
+        if drain:
+            await self._tts_queue.put(None)
+            await worker
+            return
+        worker.cancel()
+        try:
+            await worker
+        except asyncio.CancelledError:
+            pass
 
     async def _run_loop(self) -> None:
         """Main conversation loop with agent state management."""
@@ -542,7 +806,7 @@ class ChatSession:
 
         try:
             while self._running:
-                logger.info(f"Round {round_num}")
+                logger.info("Round %d", round_num)
                 # Get active agents
                 active_agents = await self.get_active_agents()
 
@@ -556,8 +820,11 @@ class ChatSession:
                 else:
                     await self._run_multi_agent_mode(active_agents)
 
+                await self._flush_memories()
                 round_num += 1
-                logger.info(f"End of round {round_num - 1}, running: {self._running}")
+                logger.info(
+                    "End of round %d, running: %s", round_num - 1, self._running
+                )
             logger.info("Exited _run_loop while loop")
 
         except asyncio.CancelledError:
@@ -567,6 +834,9 @@ class ChatSession:
             logger.error(f"Error in session loop: {e}", exc_info=True)
             raise
         finally:
+            await self._flush_memories()
+            # A natural end keeps the queued audio; stop() discards it
+            await self._close_tts_worker(drain=self._running)
             logger.info(f"Session {self.session_id} loop ended")
 
     async def _run_solo_mode(self, active_agents: Set[str]) -> None:
@@ -582,6 +852,7 @@ class ChatSession:
         if not self._running:
             return
 
+        started = time.monotonic()
         success = await self._run_agent_turn(agent)
 
         if not success or not self._running:
@@ -598,26 +869,29 @@ class ChatSession:
             }
             self.history.append(admin_entry)
             self.last_messages.append(admin_entry)
-            if len(self.last_messages) > 8:
-                self.last_messages.pop(0)
+            self._notify_change()
         except Exception as e:
-            logger.error(f"Admin agent error: {e}")
+            logger.error("Admin agent error: %s", e)
 
         # Summarize if needed
         await self._maybe_summarize()
 
-        # Sleep after solo turn based on agent override
-        if self._running:
-            await asyncio.sleep(
-                self._compute_turn_delay(
-                    agent.get_sleep_seconds(self.settings.sleep_seconds)
-                )
-            )
+        # Pace solo turns based on agent override
+        await self._pace(
+            self._compute_turn_delay(
+                agent.get_sleep_seconds(self.settings.sleep_seconds)
+            ),
+            started,
+        )
 
     async def _run_multi_agent_mode(self, active_agents: Set[str]) -> None:
         """Run multi-agent mode (all agents take turns)."""
+        if self.settings.parallel_rounds:
+            await self._run_parallel_round(active_agents)
+            return
+
         for agent in list(self.agents):
-            logger.info(f"Running turn for agent {agent.name}")
+            logger.info("Running turn for agent %s", agent.name)
             # Check if still running
             if not self._running:
                 break
@@ -630,21 +904,57 @@ class ChatSession:
                 continue
 
             # Run agent turn
+            started = time.monotonic()
             success = await self._run_agent_turn(agent)
 
             if not success:
-                logger.debug(f"Agent '{agent.name}' turn did not complete successfully")
+                logger.debug("Agent %r turn did not complete successfully", agent.name)
 
             # Summarize if needed
             await self._maybe_summarize()
 
-            # Sleep after each agent turn using per-agent override
-            if self._running:
-                await asyncio.sleep(
-                    self._compute_turn_delay(
-                        agent.get_sleep_seconds(self.settings.sleep_seconds)
-                    )
-                )
+            # Pace agent turns using per-agent override
+            await self._pace(
+                self._compute_turn_delay(
+                    agent.get_sleep_seconds(self.settings.sleep_seconds)
+                ),
+                started,
+            )
+
+    async def _run_parallel_round(self, active_agents: Set[str]) -> None:
+        """
+        Run one round with all active agents generating concurrently.
+
+        Every agent answers the same history snapshot, so the round takes
+        roughly as long as its slowest agent. Replies are appended in agent
+        order regardless of completion order.
+        """
+        agents = [agent for agent in self.agents if agent.name in active_agents]
+        if not agents or not self._running:
+            return
+
+        started = time.monotonic()
+        history = HistorySnapshot(self.history)
+        semaphore = asyncio.Semaphore(max(1, self.settings.max_concurrency))
+
+        async def _bounded(agent: ChatAgent):
+            async with semaphore:
+                return await self._generate_turn(agent, history)
+
+        results = await asyncio.gather(*(_bounded(agent) for agent in agents))
+
+        for agent, result in zip(agents, results):
+            if result is None:
+                logger.debug("Agent %r turn did not complete successfully", agent.name)
+                continue
+            self._record_turn(agent, *result)
+            await self._queue_tts(agent, result[1])
+
+        await self._maybe_summarize()
+
+        await self._pace(
+            self._compute_turn_delay(self.settings.sleep_seconds), started
+        )
 
     async def _maybe_summarize(self) -> None:
         """Summarize old messages if history exceeds limit."""
@@ -655,15 +965,18 @@ class ChatSession:
         old_messages = self.history[:num_to_summarize]
         summary = await self._summarize_old_messages_async(old_messages)
 
-        self.history = self.history[num_to_summarize:]
+        # Build the trimmed history in one pass instead of slicing and then
+        # shifting every kept message with insert(0)
+        trimmed: List[Dict[str, Any]] = []
         if summary:
-            self.history.insert(
-                0,
+            trimmed.append(
                 {
                     "sender": "System",
                     "content": f"Previous conversation summary: {summary}",
-                },
+                }
             )
+        trimmed.extend(islice(self.history, num_to_summarize, None))
+        self.history = trimmed
 
     async def _summarize_old_messages_async(
         self, messages: List[Dict[str, Any]]
@@ -713,7 +1026,7 @@ class ChatSession:
     def clear_memory(self):
         """Clear session history."""
         self.history = []
-        self.last_messages = []
+        self.last_messages.clear()
 
     def set_content_filter(self, filter_instance: Optional[ContentFilter]):
         """Set a content filter for all messages in this session."""
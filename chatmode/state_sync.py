@@ -12,6 +12,7 @@ from typing import Any, Dict, List
 from sqlalchemy.orm import Session
 
 from .models import Agent
+from .utils import read_json_file
 
 
 def get_project_root() -> str:
@@ -19,11 +20,8 @@ def get_project_root() -> str:
 
 
 def _load_profile(path: str) -> Dict[str, Any]:
-    if not os.path.exists(path):
-        return {}
     try:
-        with open(path, "r") as f:
-            return json.load(f)
+        return read_json_file(path)
     except Exception:
         return {}
 
@@ -4,20 +4,34 @@ TTS Provider abstraction for OpenAI-compatible text-to-speech APIs.
 Supports multiple TTS providers with a unified interface.
 """
 
+import asyncio
+import atexit
+import email.utils
 import hashlib
 import logging
 import os
 import re
+import shutil
+import threading
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from types import MappingProxyType
+from typing import Any, Dict, Optional, Sequence, Set, Tuple
 
 import httpx
-from tenacity import retry, stop_after_attempt, wait_exponential
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
 
 logger = logging.getLogger(__name__)
 
+# Pre-initialized SHA-256 state, copied per call when blake3 is unavailable
+_SHA256_BASE = hashlib.sha256()
+
 
 def normalize_text_for_tts(text: str) -> str:
     """
@@ -42,9 +56,8 @@ def normalize_text_for_tts(text: str) -> str:
     return text.strip()
 
 
-def get_mime_type_for_format(format: str) -> str:
-    """Get MIME type for audio format."""
-    mime_types = {
+_MIME_TYPES = MappingProxyType(
+    {
         "mp3": "audio/mpeg",
         "opus": "audio/opus",
         "aac": "audio/aac",
@@ -52,7 +65,51 @@ def get_mime_type_for_format(format: str) -> str:
         "wav": "audio/wav",
         "pcm": "audio/pcm",
     }
-    return mime_types.get(format.lower(), "audio/mpeg")
+)
+
+
+def get_mime_type_for_format(format: str) -> str:
+    """Get MIME type for audio format."""
+    mime_type = _MIME_TYPES.get(format)
+    if mime_type is not None:
+        return mime_type
+    return _MIME_TYPES.get(format.lower(), "audio/mpeg")
+
+
+_MAX_RETRY_DELAY = 10.0
+_MAX_RETRY_AFTER = 60.0
+
+# Idle seconds a pooled connection is kept. httpx defaults to 5s, shorter
+# than the gap between turns, so every synthesis would reconnect.
+_KEEPALIVE_EXPIRY = 120.0
+
+
+def _is_retryable(error: "TTSProviderError") -> bool:
+    """Only transient failures (network, 5xx, 429) are worth another attempt."""
+    if isinstance(error.__cause__, httpx.TransportError):
+        return True
+    status = error.status_code
+    return status is not None and (status >= 500 or status == 429)
+
+
+def _retry_after_seconds(cause: Optional[BaseException]) -> Optional[float]:
+    """Delay requested by a 429 response's Retry-After header, if any."""
+    if not isinstance(cause, httpx.HTTPStatusError):
+        return None
+    if cause.response.status_code != 429:
+        return None
+    value = cause.response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        seconds = retry_at.timestamp() - time.time()
+    return min(_MAX_RETRY_AFTER, max(0.0, seconds))
 
 
 @dataclass
@@ -96,8 +153,8 @@ class TTSProvider(ABC):
         pass
 
     @abstractmethod
-    def get_available_voices(self) -> list:
-        """Return list of available voices (if supported by provider)."""
+    def get_available_voices(self) -> Sequence[str]:
+        """Return available voices (if supported by provider)."""
         pass
 
     @abstractmethod
@@ -114,7 +171,7 @@ class OpenAICompatibleTTSProvider(TTSProvider):
     """
 
     # Standard OpenAI voices
-    STANDARD_VOICES = ["alloy", "echo", "fable", "onyx", "nova", "shimmer"]
+    STANDARD_VOICES = ("alloy", "echo", "fable", "onyx", "nova", "shimmer")
 
     # Supported features and their availability
     FEATURES = {
@@ -131,16 +188,24 @@ class OpenAICompatibleTTSProvider(TTSProvider):
         timeout: float = 30.0,
         max_retries: int = 3,
         headers: Optional[Dict[str, str]] = None,
+        max_concurrency: int = 4,
+        warmup: bool = True,
     ):
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
         self.timeout = timeout
         self.max_retries = max_retries
         self.headers = headers or {}
+        self.max_concurrency = max_concurrency
 
-        # Initialize HTTP client
+        # One pooled client for the provider's lifetime; keep up to
+        # max_concurrency warm connections for concurrent sessions
         self.client = httpx.AsyncClient(
             timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(
+                max_keepalive_connections=max_concurrency,
+                keepalive_expiry=_KEEPALIVE_EXPIRY,
+            ),
             headers={
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json",
@@ -148,31 +213,41 @@ class OpenAICompatibleTTSProvider(TTSProvider):
             },
         )
 
+        # Open the connection (TCP + TLS) ahead of the first synthesis
+        self._warmup_task: Optional[asyncio.Task] = None
+        if warmup:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+            else:
+                self._warmup_task = loop.create_task(self._warmup(self.client))
+
         logger.info(f"OpenAICompatibleTTSProvider initialized: {base_url}")
 
+    async def _warmup(self, client: httpx.AsyncClient) -> None:
+        """Best-effort HEAD request so the pool holds a warm connection."""
+        try:
+            await client.head(self.base_url, timeout=5.0)
+        except Exception as e:
+            logger.debug(f"TTS warm-up request failed: {e}")
+
     async def close(self):
         """Close the HTTP client."""
+        if self._warmup_task is not None and not self._warmup_task.done():
+            self._warmup_task.cancel()
         await self.client.aclose()
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        reraise=True,
-    )
-    async def synthesize(
+    def _build_payload(
         self,
         text: str,
         voice: str,
-        model: Optional[str] = None,
-        response_format: str = "mp3",
-        speed: Optional[float] = None,
-        instructions: Optional[str] = None,
-    ) -> TTSResult:
-        """
-        Synthesize text using OpenAI-compatible API.
-
-        POST /v1/audio/speech
-        """
+        model: Optional[str],
+        response_format: str,
+        speed: Optional[float],
+        instructions: Optional[str],
+    ) -> Dict[str, Any]:
+        """Validate inputs and build the /v1/audio/speech request payload."""
         if not text:
             logger.warning("TTS called with empty text")
             raise ValueError("Text cannot be empty")
@@ -200,10 +275,56 @@ class OpenAICompatibleTTSProvider(TTSProvider):
             # Instructions only supported for gpt-4o-mini-tts
             payload["instructions"] = instructions
 
+        return payload
+
+    async def synthesize(
+        self,
+        text: str,
+        voice: str,
+        model: Optional[str] = None,
+        response_format: str = "mp3",
+        speed: Optional[float] = None,
+        instructions: Optional[str] = None,
+    ) -> TTSResult:
+        """
+        Synthesize text using OpenAI-compatible API.
+
+        POST /v1/audio/speech
+
+        Timeouts, transport errors, 5xx and 429 responses are retried with
+        exponential backoff (honouring Retry-After); other client errors and
+        invalid input fail immediately.
+        """
+        payload = self._build_payload(
+            text, voice, model, response_format, speed, instructions
+        )
+
+        attempts = max(1, self.max_retries)
+        attempt = 0
+        while True:
+            try:
+                return await self._post_speech(payload, voice, response_format)
+            except TTSProviderError as e:
+                attempt += 1
+                if attempt >= attempts or not _is_retryable(e):
+                    raise
+                delay = _retry_after_seconds(e.__cause__)
+                if delay is None:
+                    delay = min(_MAX_RETRY_DELAY, 2.0 ** (attempt - 1))
+                logger.warning(
+                    f"TTS attempt {attempt}/{attempts} failed ({e}); "
+                    f"retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
+    async def _post_speech(
+        self, payload: Dict[str, Any], voice: str, response_format: str
+    ) -> TTSResult:
+        """Issue a single /v1/audio/speech request."""
         try:
             logger.debug(
                 f"TTS request: model={payload['model']}, voice={voice}, "
-                f"format={response_format}, text_len={len(normalized_text)}"
+                f"format={response_format}, text_len={len(payload['input'])}"
             )
 
             response = await self.client.post(
@@ -245,15 +366,17 @@ class OpenAICompatibleTTSProvider(TTSProvider):
             logger.error(f"TTS error: {e}")
             raise TTSProviderError(f"TTS synthesis failed: {e}") from e
 
-    def get_available_voices(self) -> list:
+    def get_available_voices(self) -> Sequence[str]:
         """
         Return standard OpenAI voices.
 
         Note: Not all compatible providers support voice listing,
         so we return the standard set. Feature detection should be used
         to determine if the provider supports custom voice listing.
+        The returned tuple is shared; callers needing a mutable copy
+        should wrap it in list().
         """
-        return self.STANDARD_VOICES.copy()
+        return self.STANDARD_VOICES
 
     def supports_feature(self, feature: str) -> bool:
         """Check if a feature is supported."""
@@ -310,6 +433,56 @@ def build_tts_provider(
         raise ValueError(f"Unsupported TTS provider: {provider}")
 
 
+def _tmp_sibling(path: Path) -> Path:
+    """Per-process, per-thread temporary name next to ``path``."""
+    return path.with_name(
+        f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write ``data`` so readers never observe a partially written file."""
+    tmp = _tmp_sibling(path)
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _link_or_write(src: Path, dst: Path, data: bytes) -> None:
+    """Hard-link ``dst`` to ``src``, writing a copy if linking is unsupported."""
+    tmp = _tmp_sibling(dst)
+    try:
+        os.link(src, tmp)
+        os.replace(tmp, dst)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        _atomic_write_bytes(dst, data)
+
+
+def _remove_flat_dir(directory: Path) -> bool:
+    """
+    Delete a directory of plain files, falling back to rmtree if it nests.
+
+    Returns:
+        True if the directory existed and was removed
+    """
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return False
+
+    try:
+        for entry in entries:
+            os.unlink(entry.path)
+        os.rmdir(directory)
+    except OSError:
+        shutil.rmtree(directory, ignore_errors=True)
+    return True
+
+
 class AudioStorage:
     """
     Manages audio file storage and retrieval.
@@ -319,15 +492,46 @@ class AudioStorage:
 
     def __init__(self, base_dir: str = "./data/audio"):
         self.base_dir = Path(base_dir)
-        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self._cache_dir = self.base_dir / "cache"
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        # Session directories already created by this instance
+        self._session_dirs: Set[str] = set()
+
         logger.info(f"AudioStorage initialized: {base_dir}")
 
     def _compute_hash(
         self, text: str, voice: str, model: str, format: str, speed: Optional[float]
     ) -> str:
-        """Compute content hash for caching."""
-        content = f"{text}:{voice}:{model}:{format}:{speed}"
-        return hashlib.sha256(content.encode()).hexdigest()[:16]
+        """Compute content hash for caching (16 hex chars)."""
+        # Unit separators keep field boundaries unambiguous
+        content = f"{text}\x1f{voice}\x1f{model}\x1f{format}\x1f{speed}".encode()
+        if blake3 is not None:
+            return blake3.blake3(content).hexdigest(length=8)
+
+        digest = _SHA256_BASE.copy()
+        digest.update(content)
+        return digest.hexdigest()[:16]
+
+    def get_cached_path(
+        self,
+        text: str,
+        voice: str,
+        model: str,
+        format: str,
+        speed: Optional[float] = None,
+    ) -> Optional[str]:
+        """
+        Look up previously synthesized audio before calling the provider.
+
+        Returns:
+            Path relative to base_dir, or None if not cached
+        """
+        content_hash = self._compute_hash(text, voice, model, format, speed)
+        cache_path = self._cache_dir / f"{content_hash}.{format}"
+        if not cache_path.exists():
+            return None
+        logger.debug(f"Audio cache hit: {content_hash}")
+        return str(cache_path.relative_to(self.base_dir))
 
     def get_storage_path(
         self,
@@ -347,9 +551,7 @@ class AudioStorage:
         """
         # Check cache first
         content_hash = self._compute_hash(text, voice, model, format, speed)
-        cache_dir = self.base_dir / "cache"
-        cache_dir.mkdir(exist_ok=True)
-        cache_path = cache_dir / f"{content_hash}.{format}"
+        cache_path = self._cache_dir / f"{content_hash}.{format}"
 
         if cache_path.exists():
             logger.debug(f"Audio cache hit: {content_hash}")
@@ -357,7 +559,9 @@ class AudioStorage:
 
         # Create session-specific path
         session_dir = self.base_dir / session_id
-        session_dir.mkdir(exist_ok=True)
+        if session_id not in self._session_dirs:
+            session_dir.mkdir(exist_ok=True)
+            self._session_dirs.add(session_id)
         storage_path = session_dir / f"{message_id}.{format}"
 
         return storage_path, False
@@ -389,11 +593,11 @@ class AudioStorage:
 
         # Also save to cache for future reuse
         content_hash = self._compute_hash(text, voice, model, format, speed)
-        cache_path = self.base_dir / "cache" / f"{content_hash}.{format}"
+        cache_path = self._cache_dir / f"{content_hash}.{format}"
 
-        # Write to both locations
-        path.write_bytes(audio_bytes)
-        cache_path.write_bytes(audio_bytes)
+        # Write the cache entry once, then hard-link the session copy to it
+        _atomic_write_bytes(cache_path, audio_bytes)
+        _link_or_write(cache_path, path, audio_bytes)
 
         logger.debug(f"Audio saved: {path} ({len(audio_bytes)} bytes)")
         return str(path.relative_to(self.base_dir)), False
@@ -404,13 +608,40 @@ class AudioStorage:
 
     def cleanup_session(self, session_id: str):
         """Remove all audio files for a session."""
-        session_dir = self.base_dir / session_id
-        if session_dir.exists():
-            import shutil
-
-            shutil.rmtree(session_dir)
+        self._session_dirs.discard(session_id)
+        if _remove_flat_dir(self.base_dir / session_id):
             logger.info(f"Cleaned up audio for session: {session_id}")
 
+    async def acleanup_session(self, session_id: str):
+        """Async variant of cleanup_session; file removal runs off the event loop."""
+        await asyncio.to_thread(self.cleanup_session, session_id)
+
+
+# Shared event loop for the legacy synchronous client
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the persistent event loop used by the legacy TTSClient.
+
+    The loop runs in a daemon thread and is started on first use, so
+    synchronous callers can submit coroutines without creating a new loop
+    (and new connections) per call.
+    """
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="tts-event-loop", daemon=True
+            )
+            thread.start()
+            atexit.register(loop.call_soon_threadsafe, loop.stop)
+            _background_loop = loop
+    return _background_loop
+
 
 # Legacy TTSClient for backwards compatibility
 class TTSClient:
@@ -457,22 +688,24 @@ class TTSClient:
 
         Returns path to generated audio file.
         """
-        import asyncio
-
         if not text:
             logger.warning("TTS called with empty text")
             return None
 
         try:
-            # Run async synthesis in sync context
-            result = asyncio.run(
+            # Run async synthesis on the shared background loop
+            future = asyncio.run_coroutine_threadsafe(
                 self._provider.synthesize(
                     text=text,
                     voice=voice or self.voice,
                     model=model or self.model,
                     response_format=format,
-                )
+                ),
+                _get_background_loop(),
             )
+            # No outer deadline: each attempt is bounded by the provider's
+            # request timeout, and its retries (with backoff) are bounded too
+            result = future.result()
 
             # Generate filename
             normalized = normalize_text_for_tts(text)
@@ -490,6 +723,6 @@ class TTSClient:
             logger.error(f"TTS generation failed: {e}")
             return None
 
-    def get_available_voices(self) -> list:
-        """Return list of standard OpenAI TTS voices."""
+    def get_available_voices(self) -> Sequence[str]:
+        """Return standard OpenAI TTS voices."""
         return self._provider.get_available_voices()
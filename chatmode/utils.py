@@ -1,4 +1,18 @@
-from typing import Callable, Dict, List
+import functools
+import json
+import os
+import re
+import time
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 PLACEHOLDERS = [
     "$SELF_PROMPT",
@@ -11,10 +25,91 @@ PLACEHOLDERS = [
 ]
 
 
+_PLACEHOLDER_RE = re.compile("|".join(re.escape(p) for p in PLACEHOLDERS))
+
+
+def read_json_file(path: str) -> Any:
+    """Parse a JSON file, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def file_cache_key(path: str) -> Tuple[int, int]:
+    """(mtime_ns, size) of a file; changes whenever the file is rewritten."""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+@functools.lru_cache(maxsize=128)
+def _read_json_file_cached(path: str, mtime_ns: int, size: int) -> Any:
+    return read_json_file(path)
+
+
+def read_json_file_cached(path: str) -> Any:
+    """Parse a JSON file, reusing the result until the file changes.
+
+    The returned object is shared between callers and must not be mutated.
+    """
+    return _read_json_file_cached(path, *file_cache_key(path))
+
+
+@functools.lru_cache(maxsize=4)
+def _utc_second_prefix(seconds: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+
+
+def utc_isoformat(timestamp: Optional[float] = None) -> str:
+    """
+    ``datetime.utcnow().isoformat()`` without building a datetime.
+
+    The date and time-of-day prefix is cached per second, so calls within
+    the same second only format microseconds, which are always included.
+    """
+    if timestamp is None:
+        micros = time.time_ns() // 1000
+    else:
+        micros = round(timestamp * 1_000_000)
+    seconds, fraction = divmod(micros, 1_000_000)
+    return f"{_utc_second_prefix(seconds)}.{fraction:06d}"
+
+
 def clean_placeholders(text: str) -> str:
-    for placeholder in PLACEHOLDERS:
-        text = text.replace(placeholder, "")
-    return text
+    if not text or "$" not in text:
+        return text
+    return _PLACEHOLDER_RE.sub("", text)
+
+
+class HistoryFormatter:
+    """
+    Formats conversation history as ``sender: content`` lines, incrementally.
+
+    Sessions only ever append to a history list until it is replaced (on
+    summarisation or clear). While the incoming list still starts with the
+    messages seen last time, only the new tail is formatted.
+    """
+
+    def __init__(self) -> None:
+        # References keep the seen dicts alive, so identity checks stay valid
+        self._seen: List[Dict[str, str]] = []
+        self._lines: List[str] = []
+
+    def _extends_seen(self, history: Sequence[Dict[str, str]]) -> bool:
+        n = len(self._seen)
+        if n == 0 or len(history) < n:
+            return n == 0
+        return history[0] is self._seen[0] and history[n - 1] is self._seen[-1]
+
+    def format(self, history: Sequence[Dict[str, str]]) -> str:
+        if not self._extends_seen(history):
+            self._seen = []
+            self._lines = []
+        for msg in history[len(self._seen) :]:
+            self._seen.append(msg)
+            self._lines.append(f"{msg['sender']}: {msg['content']}")
+        return "\n".join(self._lines)
 
 
 def approximate_tokens(text: str) -> int:
@@ -23,14 +118,45 @@ def approximate_tokens(text: str) -> int:
     return max(1, int(len(text) / 4))
 
 
+def approximate_tokens_batch(texts: Sequence[str]) -> np.ndarray:
+    """Vectorized approximate_tokens over many texts."""
+    lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+    return np.where(lengths > 0, np.maximum(lengths // 4, 1), 0)
+
+
 def trim_messages_to_context(
     messages: List[Dict[str, str]],
     max_tokens: int,
     token_counter: Callable[[str], int],
 ) -> List[Dict[str, str]]:
-    trimmed = list(messages)
-    total_tokens = sum(token_counter(msg.get("content", "")) for msg in trimmed)
-    while trimmed and total_tokens > max_tokens:
-        removed = trimmed.pop(1 if len(trimmed) > 1 else 0)
-        total_tokens -= token_counter(removed.get("content", ""))
-    return trimmed
+    """
+    Drop the oldest messages after the first (system) one until the
+    conversation fits within max_tokens.
+
+    Returns an empty list if the first message alone exceeds the budget.
+    """
+    if not messages:
+        return []
+
+    contents = [msg.get("content", "") for msg in messages]
+    if token_counter is approximate_tokens:
+        counts = approximate_tokens_batch(contents)
+        # prefix[k] == sum(counts[:k])
+        prefix = np.concatenate(([0], np.cumsum(counts)))
+    else:
+        counts = [token_counter(content) for content in contents]
+        prefix = list(accumulate(counts, initial=0))
+
+    total_tokens = int(prefix[-1])
+    if total_tokens <= max_tokens:
+        return list(messages)
+    if counts[0] > max_tokens:
+        return []
+
+    # Smallest k >= 1 with counts[0] + sum(counts[k:]) <= max_tokens
+    target = total_tokens + int(counts[0]) - max_tokens
+    if isinstance(prefix, np.ndarray):
+        k = int(np.searchsorted(prefix[1:], target)) + 1
+    else:
+        k = bisect_left(prefix, target, 1)
+    return [messages[0]] + messages[k:]
@@ -6,6 +6,7 @@ import sys
 from sqlalchemy.orm import Session
 from chatmode.database import get_db, init_db
 from chatmode import crud
+from chatmode.models import Agent
 from chatmode.schemas import AgentCreate
 
 # Initialize database
@@ -64,23 +65,32 @@ def main():
     db: Session = next(get_db())
     
     try:
+        # One query for existing names, one commit for all new agents
+        names = [agent_data["name"] for agent_data in agents_to_create]
+        existing_names = {
+            name for (name,) in db.query(Agent.name).filter(Agent.name.in_(names))
+        }
+
+        created = []
         for agent_data in agents_to_create:
-            # Check if agent already exists
-            existing = crud.get_agent_by_name(db, agent_data["name"])
-            if existing:
+            if agent_data["name"] in existing_names:
                 print(f"✓ Agent '{agent_data['name']}' already exists, skipping...")
                 continue
-            
-            # Create agent
+
             agent_create = AgentCreate(**agent_data)
-            agent = crud.create_agent(db, agent_create)
-            print(f"✓ Created agent: {agent.name} ({agent.display_name})")
+            agent = crud.create_agent(db, agent_create, commit=False)
+            created.append((agent.name, agent.display_name))
+
+        db.commit()
+        for name, display_name in created:
+            print(f"✓ Created agent: {name} ({display_name})")
         
         print("\n✓ All agents created successfully!")
         print("\nYou can now start a meeting conversation with:")
         print("  Topic: 'Planning our Q2 product roadmap and marketing strategy'")
         
     except Exception as e:
+        db.rollback()
         print(f"Error creating agents: {e}")
         import traceback
         traceback.print_exc()
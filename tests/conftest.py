@@ -10,6 +10,9 @@ import uuid
 import pytest
 from unittest.mock import Mock
 
+# Minimum bcrypt cost: must be set before chatmode.auth builds its CryptContext
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
 # Configure asyncio plugin
 pytest_plugins = ("pytest_asyncio",)
 
@@ -61,12 +64,17 @@ def set_test_env_vars(test_chroma_dir, test_tts_dir, monkeypatch):
     Automatically set environment variables for tests.
 
     This fixture runs automatically for all tests (autouse=True).
-    Uses monkeypatch to safely modify environment variables.
+    Uses monkeypatch to safely modify environment variables, and clears
+    the cached load_settings() result so each test sees its own values.
     """
+    from chatmode.config import load_settings
+
     # Set test environment variables using monkeypatch
     monkeypatch.setenv("CHROMA_DIR", test_chroma_dir)
     monkeypatch.setenv("TTS_OUTPUT_DIR", test_tts_dir)
     monkeypatch.setenv("OPENAI_API_KEY", "test-key-fixture")
+    load_settings.cache_clear()
 
     # monkeypatch automatically restores original environment after test
     yield
+    load_settings.cache_clear()
@@ -4,18 +4,16 @@ Tests for advanced ChatMode features.
 
 import json
 import tempfile
-import os
 from pathlib import Path
 
 import pytest
 
 
-def test_agent_profile_with_extra_prompt():
+def test_agent_profile_with_extra_prompt(tmp_path):
     """Test that agent profiles can include extra_prompt field."""
     from chatmode.agent import ChatAgent
     from chatmode.config import load_settings
 
-    # Create a temporary profile with extra_prompt
     profile_data = {
         "name": "Test Agent",
         "model": "gpt-4o-mini",
@@ -24,22 +22,18 @@ def test_agent_profile_with_extra_prompt():
         "extra_prompt": "This is an extra prompt for testing.",
     }
 
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-        json.dump(profile_data, f)
-        profile_path = f.name
+    profile_path = tmp_path / "profile.json"
+    profile_path.write_text(json.dumps(profile_data))
 
-    try:
-        settings = load_settings()
-        agent = ChatAgent(name="test", config_file=profile_path, settings=settings)
+    settings = load_settings()
+    agent = ChatAgent(name="test", config_file=str(profile_path), settings=settings)
 
-        # Verify extra_prompt was added to system_prompt
-        assert "This is an extra prompt for testing." in agent.system_prompt
-        assert "You are a test agent." in agent.system_prompt
-    finally:
-        os.unlink(profile_path)
+    # Verify extra_prompt was added to system_prompt
+    assert "This is an extra prompt for testing." in agent.system_prompt
+    assert "You are a test agent." in agent.system_prompt
 
 
-def test_agent_profile_with_memory_settings():
+def test_agent_profile_with_memory_settings(tmp_path):
     """Test that agent profiles can override memory settings."""
     from chatmode.agent import ChatAgent
     from chatmode.config import load_settings
@@ -53,22 +47,18 @@ def test_agent_profile_with_memory_settings():
         "max_context_tokens": 64000,
     }
 
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-        json.dump(profile_data, f)
-        profile_path = f.name
+    profile_path = tmp_path / "profile.json"
+    profile_path.write_text(json.dumps(profile_data))
 
-    try:
-        settings = load_settings()
-        agent = ChatAgent(name="test", config_file=profile_path, settings=settings)
+    settings = load_settings()
+    agent = ChatAgent(name="test", config_file=str(profile_path), settings=settings)
 
-        # Verify per-agent settings were loaded
-        assert agent.memory_top_k == 15
-        assert agent.max_context_tokens == 64000
-    finally:
-        os.unlink(profile_path)
+    # Verify per-agent settings were loaded
+    assert agent.memory_top_k == 15
+    assert agent.max_context_tokens == 64000
 
 
-def test_agent_profile_with_mcp_config():
+def test_agent_profile_with_mcp_config(tmp_path):
     """Test that agent profiles can include MCP configuration."""
     from chatmode.agent import ChatAgent
     from chatmode.config import load_settings
@@ -83,20 +73,16 @@ def test_agent_profile_with_mcp_config():
         "allowed_tools": ["tool1", "tool2"],
     }
 
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-        json.dump(profile_data, f)
-        profile_path = f.name
+    profile_path = tmp_path / "profile.json"
+    profile_path.write_text(json.dumps(profile_data))
 
-    try:
-        settings = load_settings()
-        agent = ChatAgent(name="test", config_file=profile_path, settings=settings)
+    settings = load_settings()
+    agent = ChatAgent(name="test", config_file=str(profile_path), settings=settings)
 
-        # Verify MCP settings were loaded
-        assert agent.mcp_command == "mcp-server-test"
-        assert agent.mcp_args == ["--headless"]
-        assert agent.allowed_tools == ["tool1", "tool2"]
-    finally:
-        os.unlink(profile_path)
+    # Verify MCP settings were loaded
+    assert agent.mcp_command == "mcp-server-test"
+    assert agent.mcp_args == ["--headless"]
+    assert agent.allowed_tools == ["tool1", "tool2"]
 
 
 def test_memory_session_scoped_clear():
@@ -172,6 +158,41 @@ def test_admin_agent_generate_response():
     assert hasattr(admin, "generate_response")
 
 
+def test_admin_agent_generate_topics_batch():
+    """Test batch topic generation parses output and backfills failures."""
+    from unittest.mock import Mock
+
+    from chatmode.admin import AdminAgent
+    from chatmode.config import load_settings
+
+    admin = AdminAgent(load_settings())
+    client = Mock()
+    client.files.create.return_value = Mock(id="file-in")
+    client.batches.create.return_value = Mock(id="b1", status="in_progress")
+    client.batches.retrieve.return_value = Mock(
+        id="b1", status="completed", output_file_id="file-out"
+    )
+    ok = {"status_code": 200, "body": {"choices": [{"message": {"content": " T1 "}}]}}
+    client.files.content.return_value = Mock(
+        text="\n".join(
+            [
+                json.dumps({"custom_id": "topic-1", "response": ok}),
+                json.dumps({"custom_id": "topic-0", "response": {"status_code": 500}}),
+            ]
+        )
+    )
+    admin.provider = Mock(client=client)
+    admin.generate_topic = Mock(return_value="fallback")
+
+    topics = admin.generate_topics_batch(2, poll_interval=0)
+
+    assert topics == ["fallback", "T1"]
+    assert client.files.create.call_args.kwargs["purpose"] == "batch"
+    assert admin.generate_topic.call_count == 1
+
+    assert admin.generate_topics_batch(2, urgent=True) == ["fallback", "fallback"]
+
+
 def test_chat_session_supports_single_agent():
     """Test that ChatSession accepts single agent configuration."""
     # This test would require mocking the agent loading
@@ -5,22 +5,50 @@ Tests for authentication and agent CRUD endpoints.
 Run with: pytest tests/test_api.py -v
 """
 
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from chatmode.main import app
 from chatmode.database import Base, get_db
-from chatmode.models import User
-from chatmode.auth import hash_password
+from chatmode.models import AuditLog, User
+from chatmode.audit import (
+    AuditAction,
+    AuditBatcher,
+    compute_changes,
+    get_client_ip,
+    log_action,
+    make_differ,
+)
+from chatmode.auth import hash_password, require_role
 import uuid
 
-# Test database setup
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+# Test database setup; one file per pytest-xdist worker
+_XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+SQLALCHEMY_DATABASE_URL = (
+    f"sqlite:///./test_{_XDIST_WORKER}.db" if _XDIST_WORKER else "sqlite:///./test.db"
+)
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
+
+
+@event.listens_for(engine, "connect")
+def _fast_test_pragmas(dbapi_connection, connection_record):
+    """The test database is throwaway, so skip fsync and the on-disk journal."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -50,6 +78,15 @@ def client(setup_database):
     return TestClient(app)
 
 
+@pytest.fixture
+async def async_client(setup_database):
+    """ASGI client that calls the app in-loop, without TestClient's thread bridge."""
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://testserver"
+    ) as async_client:
+        yield async_client
+
+
 @pytest.fixture(scope="module")
 def test_user(setup_database):
     """Create a test admin user."""
@@ -129,6 +166,14 @@ class TestAuthentication:
         )
         assert response.status_code == 401
 
+    def test_password_hash_uses_configured_rounds(self):
+        """BCRYPT_ROUNDS sets the cost of new hashes; conftest lowers it."""
+        from chatmode.auth import BCRYPT_ROUNDS, verify_password
+
+        hashed = hash_password("roundtrip")
+        assert hashed.split("$")[2] == f"{BCRYPT_ROUNDS:02d}"
+        assert verify_password("roundtrip", hashed)
+
 
 # ============================================================================
 # Agent CRUD Tests
@@ -138,9 +183,9 @@ class TestAuthentication:
 class TestAgentCRUD:
     """Test agent CRUD endpoints."""
 
-    def test_list_agents_empty(self, client, auth_token):
+    async def test_list_agents_empty(self, async_client, auth_token):
         """Test listing agents when none exist."""
-        response = client.get(
+        response = await async_client.get(
             "/api/v1/agents/", headers={"Authorization": f"Bearer {auth_token}"}
         )
         assert response.status_code == 200
@@ -149,10 +194,12 @@ class TestAgentCRUD:
         assert isinstance(data["items"], list)
         assert data["total"] >= 0
 
-    def test_create_agent(self, client, auth_token):
+    async def test_create_agent(self, async_client, auth_token):
         """Test creating a new agent."""
-        import uuid
+        await self._create_agent(async_client, auth_token)
 
+    async def _create_agent(self, async_client, auth_token):
+        """Create an agent with a unique name and return its id."""
         unique_name = f"test_agent_{uuid.uuid4().hex[:8]}"
 
         agent_data = {
@@ -166,7 +213,7 @@ class TestAgentCRUD:
             "enabled": True,
         }
 
-        response = client.post(
+        response = await async_client.post(
             "/api/v1/agents/",
             json=agent_data,
             headers={"Authorization": f"Bearer {auth_token}"},
@@ -178,7 +225,7 @@ class TestAgentCRUD:
         assert "id" in data
         return data["id"]
 
-    def test_create_duplicate_agent(self, client, auth_token):
+    async def test_create_duplicate_agent(self, async_client, auth_token):
         """Test creating agent with duplicate name."""
         agent_data = {
             "name": "test_agent",
@@ -192,7 +239,7 @@ class TestAgentCRUD:
         }
 
         # First creation should succeed
-        response = client.post(
+        response = await async_client.post(
             "/api/v1/agents/",
             json=agent_data,
             headers={"Authorization": f"Bearer {auth_token}"},
@@ -200,19 +247,19 @@ class TestAgentCRUD:
         assert response.status_code == 201
 
         # Second creation should fail with conflict
-        response = client.post(
+        response = await async_client.post(
             "/api/v1/agents/",
             json=agent_data,
             headers={"Authorization": f"Bearer {auth_token}"},
         )
         assert response.status_code == 409  # Conflict
 
-    def test_get_agent(self, client, auth_token):
+    async def test_get_agent(self, async_client, auth_token):
         """Test getting a specific agent."""
         # First create an agent
-        agent_id = self.test_create_agent(client, auth_token)
+        agent_id = await self._create_agent(async_client, auth_token)
 
-        response = client.get(
+        response = await async_client.get(
             f"/api/v1/agents/{agent_id}",
             headers={"Authorization": f"Bearer {auth_token}"},
         )
@@ -220,23 +267,23 @@ class TestAgentCRUD:
         data = response.json()
         assert data["id"] == agent_id
 
-    def test_get_nonexistent_agent(self, client, auth_token):
+    async def test_get_nonexistent_agent(self, async_client, auth_token):
         """Test getting a nonexistent agent."""
         fake_id = str(uuid.uuid4())
-        response = client.get(
+        response = await async_client.get(
             f"/api/v1/agents/{fake_id}",
             headers={"Authorization": f"Bearer {auth_token}"},
         )
         assert response.status_code == 404
 
-    def test_update_agent(self, client, auth_token):
+    async def test_update_agent(self, async_client, auth_token):
         """Test updating an agent."""
         # First create an agent
-        agent_id = self.test_create_agent(client, auth_token)
+        agent_id = await self._create_agent(async_client, auth_token)
 
         update_data = {"display_name": "Updated Test Agent", "temperature": 0.9}
 
-        response = client.put(
+        response = await async_client.put(
             f"/api/v1/agents/{agent_id}",
             json=update_data,
             headers={"Authorization": f"Bearer {auth_token}"},
@@ -246,12 +293,47 @@ class TestAgentCRUD:
         assert data["display_name"] == "Updated Test Agent"
         assert data["temperature"] == 0.9
 
-    def test_delete_agent(self, client, auth_token):
+    async def test_list_agents_loads_settings_in_bulk(self, async_client, auth_token):
+        """Test listing agents does not lazy-load settings per agent."""
+        from sqlalchemy import event
+
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        for _ in range(3):
+            await async_client.post(
+                "/api/v1/agents/",
+                json={
+                    "name": f"bulk_agent_{uuid.uuid4().hex[:8]}",
+                    "display_name": "Bulk Agent",
+                    "model": "gpt-4o-mini",
+                    "provider": "openai",
+                    "system_prompt": "You are a test agent.",
+                },
+                headers=headers,
+            )
+
+        statements = []
+
+        def count_selects(conn, cursor, statement, *args):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count_selects)
+        try:
+            response = await async_client.get("/api/v1/agents/", headers=headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", count_selects)
+
+        assert response.status_code == 200
+        assert len(response.json()["items"]) >= 3
+        # auth user lookup + count + page + one query per settings relationship
+        assert len(statements) <= 6
+
+    async def test_delete_agent(self, async_client, auth_token):
         """Test deleting an agent."""
         # First create an agent
-        agent_id = self.test_create_agent(client, auth_token)
+        agent_id = await self._create_agent(async_client, auth_token)
 
-        response = client.delete(
+        response = await async_client.delete(
             f"/api/v1/agents/{agent_id}",
             headers={"Authorization": f"Bearer {auth_token}"},
         )
@@ -260,7 +342,7 @@ class TestAgentCRUD:
         assert data["status"] == "deleted"
 
         # Verify agent is disabled (soft delete)
-        response = client.get(
+        response = await async_client.get(
             f"/api/v1/agents/{agent_id}",
             headers={"Authorization": f"Bearer {auth_token}"},
         )
@@ -269,6 +351,464 @@ class TestAgentCRUD:
         assert data["enabled"] == False
 
 
+# ============================================================================
+# User Management Tests
+# ============================================================================
+
+
+class TestUserManagement:
+    """Test admin user management endpoints."""
+
+    def test_create_and_list_users(self, client, auth_token):
+        """Test creating a user and finding it in the list."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        response = client.post(
+            "/api/v1/users/",
+            json={
+                "username": "listed_user",
+                "email": "listed@test.com",
+                "password": "listedpass123",
+                "role": "viewer",
+            },
+            headers=headers,
+        )
+        assert response.status_code == 201
+
+        response = client.get("/api/v1/users/", headers=headers)
+        assert response.status_code == 200
+        usernames = {item["username"] for item in response.json()["items"]}
+        assert {"testadmin", "listed_user"} <= usernames
+
+    def test_create_user_conflicts(self, client, auth_token):
+        """Test duplicate usernames and emails are rejected."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        base = {"password": "conflict123", "role": "viewer"}
+
+        response = client.post(
+            "/api/v1/users/",
+            json={**base, "username": "testadmin", "email": "new@test.com"},
+            headers=headers,
+        )
+        assert response.status_code == 409
+        assert "Username" in response.json()["detail"]["message"]
+
+        response = client.post(
+            "/api/v1/users/",
+            json={**base, "username": "brand_new", "email": "admin@test.com"},
+            headers=headers,
+        )
+        assert response.status_code == 409
+        assert "Email" in response.json()["detail"]["message"]
+
+    def test_list_users_keyset_cursor(self, client, auth_token):
+        """Test walking the user list with next_cursor visits each user once."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        expected = client.get(
+            "/api/v1/users/", params={"per_page": 100}, headers=headers
+        ).json()
+
+        seen = []
+        params = {"per_page": 1}
+        while True:
+            data = client.get("/api/v1/users/", params=params, headers=headers).json()
+            seen.extend(item["id"] for item in data["items"])
+            if not data["next_cursor"]:
+                break
+            params = {"per_page": 1, "cursor": data["next_cursor"]}
+
+        assert seen == [item["id"] for item in expected["items"]]
+
+    def test_list_users_total(self, client, auth_token):
+        """Test the total is reported on full, partial and out-of-range pages."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        full = client.get(
+            "/api/v1/users/", params={"per_page": 100}, headers=headers
+        ).json()
+        first = client.get(
+            "/api/v1/users/", params={"per_page": 1}, headers=headers
+        ).json()
+        beyond = client.get(
+            "/api/v1/users/", params={"page": 999}, headers=headers
+        ).json()
+
+        assert full["total"] == len(full["items"]) >= 2
+        assert first["total"] == full["total"]
+        assert beyond["items"] == [] and beyond["total"] == full["total"]
+
+    def test_list_users_filtered(self, client, auth_token):
+        """Test role and enabled filters narrow the listing."""
+        response = client.get(
+            "/api/v1/users/",
+            params={"role": "admin", "enabled": True},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert "testadmin" in {item["username"] for item in items}
+        assert all(item["role"] == "admin" and item["enabled"] for item in items)
+
+        response = client.get(
+            "/api/v1/users/",
+            params={"role": "owner"},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+        assert response.status_code == 422
+
+    def test_list_users_invalid_cursor(self, client, auth_token):
+        """Test a malformed cursor is rejected."""
+        response = client.get(
+            "/api/v1/users/",
+            params={"cursor": "not-a-cursor"},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+        assert response.status_code == 400
+
+    def test_get_nonexistent_user(self, client, auth_token):
+        """Test fetching an unknown user returns 404."""
+        response = client.get(
+            f"/api/v1/users/{uuid.uuid4()}",
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+        assert response.status_code == 404
+
+    def test_toggle_user_and_change_role(self, client, auth_token):
+        """Test enable/disable/role updates apply and return no content."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        user_id = client.post(
+            "/api/v1/users/",
+            json={
+                "username": "toggled_user",
+                "email": "toggled@test.com",
+                "password": "toggledpass123",
+                "role": "viewer",
+            },
+            headers=headers,
+        ).json()["id"]
+
+        response = client.put(f"/api/v1/users/{user_id}/disable", headers=headers)
+        assert response.status_code == 204
+        assert response.content == b""
+        user = client.get(f"/api/v1/users/{user_id}", headers=headers).json()
+        assert user["enabled"] is False
+
+        response = client.put(f"/api/v1/users/{user_id}/enable", headers=headers)
+        assert response.status_code == 204
+
+        response = client.put(
+            f"/api/v1/users/{user_id}/role",
+            params={"role": "moderator"},
+            headers=headers,
+        )
+        assert response.status_code == 204
+        user = client.get(f"/api/v1/users/{user_id}", headers=headers).json()
+        assert user["enabled"] is True
+        assert user["role"] == "moderator"
+
+        response = client.delete(f"/api/v1/users/{user_id}", headers=headers)
+        assert response.status_code == 204
+
+        missing = uuid.uuid4()
+        for path in ("enable", "disable", "role?role=viewer"):
+            response = client.put(f"/api/v1/users/{missing}/{path}", headers=headers)
+            assert response.status_code == 404
+
+    def test_update_user_audits_changes(self, client, auth_token):
+        """Test a partial update stores plain values and audits only the diff."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        user_id = client.post(
+            "/api/v1/users/",
+            json={
+                "username": "updated_user",
+                "email": "updated@test.com",
+                "password": "updatedpass123",
+            },
+            headers=headers,
+        ).json()["id"]
+
+        response = client.put(
+            f"/api/v1/users/{user_id}",
+            json={"role": "moderator", "email": "updated@test.com"},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert response.json()["role"] == "moderator"
+
+        db = TestingSessionLocal()
+        entry = (
+            db.query(AuditLog)
+            .filter(AuditLog.resource_id == user_id, AuditLog.action == "user.update")
+            .one()
+        )
+        db.close()
+        assert entry.changes == {"role": {"old": "viewer", "new": "moderator"}}
+
+    def test_update_user_email_conflict(self, client, auth_token):
+        """Test changing a user's email to a registered one is rejected."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        user_id = client.post(
+            "/api/v1/users/",
+            json={
+                "username": "email_mover",
+                "email": "mover@test.com",
+                "password": "moverpass123",
+            },
+            headers=headers,
+        ).json()["id"]
+
+        response = client.put(
+            f"/api/v1/users/{user_id}",
+            json={"email": "admin@test.com"},
+            headers=headers,
+        )
+        assert response.status_code == 409
+
+    def test_change_role_rejects_unknown_role(self, client, auth_token):
+        """Test the role parameter is validated against UserRole."""
+        response = client.put(
+            f"/api/v1/users/{uuid.uuid4()}/role",
+            params={"role": "superuser"},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+        assert response.status_code == 422
+
+
+# ============================================================================
+# Audit Log Tests
+# ============================================================================
+
+
+class TestAuditLogs:
+    """Test audit log endpoints."""
+
+    @pytest.fixture(scope="class")
+    def audit_entries(self, test_user):
+        db = TestingSessionLocal()
+        for action in ["agent.create", "agent.create", "agent.delete"]:
+            db.add(
+                AuditLog(
+                    user_id=test_user.id,
+                    username=test_user.username,
+                    action=action,
+                    resource_type="agent",
+                    resource_id=str(uuid.uuid4()),
+                    changes={"name": {"old": None, "new": "x"}},
+                )
+            )
+        db.commit()
+        db.close()
+
+    def test_list_audit_logs(self, client, auth_token, audit_entries):
+        """Test listing audit logs serializes ORM rows."""
+        response = client.get(
+            "/api/v1/audit/",
+            params={"resource_type": "agent", "days": 1},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] >= 3
+        item = data["items"][0]
+        assert item["resource_type"] == "agent"
+        assert "timestamp" in item
+
+    def test_list_audit_logs_keyset_cursor(self, client, auth_token, audit_entries):
+        """Test paging with the before cursor returns only older entries."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        first = client.get(
+            "/api/v1/audit/", params={"per_page": 1}, headers=headers
+        ).json()
+        cursor = first["items"][0]["timestamp"]
+
+        response = client.get(
+            "/api/v1/audit/",
+            params={"per_page": 50, "before": cursor},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert items
+        assert all(item["timestamp"] < cursor for item in items)
+
+    def test_keyset_cursor_keeps_same_timestamp_rows(self, client, auth_token):
+        """Test rows sharing the cursor's timestamp are paged by id, not skipped."""
+        from datetime import datetime
+
+        stamp = datetime(2001, 1, 1, 12, 0, 0)
+        db = TestingSessionLocal()
+        expected = set()
+        for _ in range(3):
+            entry = AuditLog(
+                action="tie.test",
+                resource_type="agent",
+                resource_id=str(uuid.uuid4()),
+                timestamp=stamp,
+            )
+            db.add(entry)
+            db.flush()
+            expected.add(entry.id)
+        db.commit()
+        db.close()
+
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        params = {"per_page": 1, "action": "tie.test"}
+        seen = []
+        page = client.get("/api/v1/audit/", params=params, headers=headers).json()
+        while page["items"]:
+            last = page["items"][-1]
+            seen.append(last["id"])
+            cursor = {"before": last["timestamp"], "before_id": last["id"]}
+            page = client.get(
+                "/api/v1/audit/", params={**params, **cursor}, headers=headers
+            ).json()
+
+        assert set(seen) == expected
+        assert len(seen) == 3
+
+    def test_audit_stats_summary(self, client, auth_token, audit_entries):
+        """Test stats are aggregated per action, user and day."""
+        response = client.get(
+            "/api/v1/audit/stats/summary",
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["period_days"] == 7
+        assert data["by_action"]["agent.create"] >= 2
+        assert data["by_action"]["agent.delete"] >= 1
+        assert data["by_user"]["testadmin"] >= 3
+        assert sum(data["daily_activity"].values()) == data["total_actions"]
+
+    def test_audit_records_forwarded_client_ip(self, client, auth_token):
+        """Test the middleware-resolved client IP lands in the audit entry."""
+        response = client.post(
+            "/api/v1/users/",
+            json={
+                "username": "proxied_user",
+                "email": "proxied@test.com",
+                "password": "proxiedpass123",
+            },
+            headers={
+                "Authorization": f"Bearer {auth_token}",
+                "X-Forwarded-For": "203.0.113.7, 10.0.0.1",
+            },
+        )
+        assert response.status_code == 201
+
+        db = TestingSessionLocal()
+        entry = (
+            db.query(AuditLog)
+            .filter(AuditLog.resource_id == response.json()["id"])
+            .one()
+        )
+        db.close()
+        assert entry.ip_address == "203.0.113.7"
+
+    def test_get_client_ip_prefers_request_state(self):
+        """Test a resolved IP on request.state is used without header parsing."""
+        request = SimpleNamespace(
+            state=SimpleNamespace(client_ip="198.51.100.2"),
+            headers={"x-forwarded-for": "203.0.113.7"},
+        )
+        assert get_client_ip(request) == "198.51.100.2"
+
+    def test_make_differ_matches_compute_changes(self):
+        """Test the generated differ agrees with compute_changes."""
+        old = SimpleNamespace(email="a@test.com", role="viewer", password="x")
+        new = {"role": "admin", "password": "y", "email": "a@test.com"}
+        fields = ("email", "role", "password")
+
+        diff = make_differ(fields)
+        assert diff is make_differ(fields)
+        assert diff(old, new) == compute_changes(old, new, list(fields))
+        assert diff(old, {}) == {}
+        with pytest.raises(ValueError):
+            make_differ(("role; import os",))
+
+    def test_batched_log_action(self, setup_database):
+        """Test queued entries are bulk-written on stop; durable ones inline."""
+        batcher = AuditBatcher(batch_size=10, interval=60.0)
+        db = TestingSessionLocal()
+        with patch("chatmode.audit.audit_batcher", batcher):
+            batcher.start(TestingSessionLocal)
+            queued = log_action(db, None, "agent.update", "agent", "batched-1")
+            durable = log_action(db, None, "user.delete", "user", "batched-2")
+            assert queued is None
+            assert durable is not None
+            batcher.stop()
+        rows = db.query(AuditLog).filter(AuditLog.resource_id == "batched-1").all()
+        db.close()
+        assert not batcher.running
+        assert len(rows) == 1
+        assert rows[0].username == "system"
+
+    def test_batched_write_falls_back_to_single_rows(self, setup_database):
+        """Test a failed bulk insert still writes the rows that are valid."""
+        batcher = AuditBatcher()
+        batcher._session_factory = TestingSessionLocal
+        good = {
+            "user_id": None,
+            "username": "system",
+            "action": "agent.update",
+            "resource_type": "agent",
+            "resource_id": "fallback-1",
+            "changes": None,
+            "ip_address": None,
+            "user_agent": None,
+        }
+        bad = {**good, "resource_id": "fallback-2", "action": None}
+        batcher._write([good, bad])
+
+        db = TestingSessionLocal()
+        ids = {
+            row.resource_id
+            for row in db.query(AuditLog).filter(
+                AuditLog.resource_id.in_(["fallback-1", "fallback-2"])
+            )
+        }
+        db.close()
+        assert ids == {"fallback-1"}
+
+    def test_enable_and_disable_are_written_inline(self, setup_database):
+        """Test account enable/disable entries bypass the batch buffer."""
+        batcher = AuditBatcher(batch_size=10, interval=60.0)
+        db = TestingSessionLocal()
+        with patch("chatmode.audit.audit_batcher", batcher):
+            batcher.start(TestingSessionLocal)
+            for action in (AuditAction.USER_ENABLE, AuditAction.USER_DISABLE):
+                assert log_action(db, None, action, "user", "toggled") is not None
+            batcher.stop()
+        db.close()
+
+
+# ============================================================================
+# Environment Config Tests
+# ============================================================================
+
+
+class TestEnvConfig:
+    """Test .env read/write endpoints."""
+
+    def test_env_missing_then_written(self, client, auth_token, tmp_path):
+        """Test a missing .env 404s and a write replaces it atomically."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        root = tmp_path / "project"
+        root.mkdir()
+        with patch(
+            "chatmode.routes.env_config.get_project_root",
+            return_value=str(root),
+        ):
+            assert client.get("/api/v1/config/env", headers=headers).status_code == 404
+
+            response = client.put(
+                "/api/v1/config/env", json={"content": "A=1\n"}, headers=headers
+            )
+            assert response.status_code == 200
+
+            response = client.get("/api/v1/config/env", headers=headers)
+            assert response.json()["content"] == "A=1\n"
+        assert [p.name for p in root.iterdir()] == [".env"]
+
+
 # ============================================================================
 # Role-Based Access Control Tests
 # ============================================================================
@@ -332,6 +872,18 @@ class TestRoleEnforcement:
         )
         assert response.status_code == 403  # Forbidden
 
+    def test_viewer_cannot_list_users(self, client, viewer_token):
+        """Test that the shared admin dependency rejects viewers."""
+        response = client.get(
+            "/api/v1/users/", headers={"Authorization": f"Bearer {viewer_token}"}
+        )
+        assert response.status_code == 403
+
+    def test_require_role_reuses_dependency(self):
+        """Test equal role lists resolve to one dependency callable."""
+        assert require_role(["admin"]) is require_role(("admin",))
+        assert require_role(["admin"]) is not require_role(["admin", "moderator"])
+
 
 # ============================================================================
 # Validation Tests
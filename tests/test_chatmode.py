@@ -23,6 +23,14 @@ from chatmode.providers import (
     OpenAIChatProvider,
 )
 from chatmode.tts import TTSClient, normalize_text_for_tts
+from chatmode.utils import (
+    HistoryFormatter,
+    approximate_tokens,
+    approximate_tokens_batch,
+    clean_placeholders,
+    trim_messages_to_context,
+    utc_isoformat,
+)
 
 # ============================================================================
 # Fixtures
@@ -111,6 +119,343 @@ class TestTTSNormalization:
         assert "[" not in result
 
 
+# ============================================================================
+# Utility Tests
+# ============================================================================
+
+
+class TestPromptUtils:
+    """Test prompt helper utilities."""
+
+    def test_clean_placeholders_removes_all(self):
+        text = "You are $SELF_PROMPT a bot.$MEMORY$STATS Done $CODE_DOCS"
+        assert clean_placeholders(text) == "You are  a bot. Done "
+
+    def test_clean_placeholders_keeps_unknown_dollar(self):
+        assert clean_placeholders("Costs $5 $OTHER") == "Costs $5 $OTHER"
+        assert clean_placeholders("") == ""
+
+    def test_trim_messages_keeps_system_and_newest(self):
+        messages = [{"content": "s" * 4}] + [
+            {"content": str(i) * 3} for i in range(5)
+        ]
+        trimmed = trim_messages_to_context(messages, max_tokens=10, token_counter=len)
+        assert trimmed == [messages[0], messages[4], messages[5]]
+
+    def test_history_formatter_incremental(self):
+        formatter = HistoryFormatter()
+        history = [{"sender": "A", "content": "one"}]
+        assert formatter.format(history) == "A: one"
+
+        history.append({"sender": "B", "content": "two"})
+        assert formatter.format(list(history)) == "A: one\nB: two"
+
+        replaced = [{"sender": "System", "content": "summary"}, history[1]]
+        assert formatter.format(replaced) == "System: summary\nB: two"
+        assert formatter.format([]) == ""
+
+    def test_approximate_tokens_batch_matches_scalar(self):
+        texts = ["", "a", "abcd", "x" * 41]
+        assert list(approximate_tokens_batch(texts)) == [
+            approximate_tokens(t) for t in texts
+        ]
+
+    def test_trim_messages_default_counter(self):
+        messages = [{"content": "s" * 8}] + [{"content": "m" * 40} for _ in range(4)]
+        trimmed = trim_messages_to_context(
+            messages, max_tokens=22, token_counter=approximate_tokens
+        )
+        assert trimmed == [messages[0], messages[3], messages[4]]
+
+    def test_trim_messages_within_budget_and_oversized_system(self):
+        messages = [{"content": "abc"}, {"content": "de"}]
+        assert trim_messages_to_context(messages, 5, len) == messages
+        assert trim_messages_to_context(messages, 2, len) == []
+
+    def test_utc_isoformat_matches_datetime(self):
+        from datetime import datetime, timezone
+
+        for ts in (0.5, 1700000000.000001, 1700000059.999999):
+            expected = datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None)
+            assert utc_isoformat(ts) == expected.isoformat()
+
+    def test_get_profile_metadata(self, tmp_path):
+        from chatmode import agent as agent_module
+
+        path = tmp_path / "profile.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "name": "Ada",
+                    "model": "m1",
+                    "conversing": "x" * 1000,
+                    "speak_model": {"voice": "alloy"},
+                }
+            )
+        )
+        expected = {
+            "name": "Ada",
+            "model": "m1",
+            "api": None,
+            "speak_model": {"voice": "alloy"},
+        }
+        assert agent_module.get_profile_metadata(str(path)) == expected
+        agent_module._profile_metadata_cached.cache_clear()
+        with patch.object(agent_module, "ijson", None):
+            assert agent_module.get_profile_metadata(str(path)) == expected
+
+    def test_read_json_file_with_and_without_orjson(self, tmp_path):
+        from chatmode import utils
+
+        path = tmp_path / "data.json"
+        path.write_text(json.dumps({"name": "Zoë", "n": [1, 2.5]}), encoding="utf-8")
+        assert utils.read_json_file(str(path)) == {"name": "Zoë", "n": [1, 2.5]}
+        with patch.object(utils, "orjson", None):
+            assert utils.read_json_file(str(path)) == {"name": "Zoë", "n": [1, 2.5]}
+
+    def test_read_json_file_cached_until_file_changes(self, tmp_path):
+        from chatmode.utils import read_json_file_cached
+
+        path = tmp_path / "agent_config.json"
+        path.write_text(json.dumps({"agents": []}), encoding="utf-8")
+        first = read_json_file_cached(str(path))
+        assert read_json_file_cached(str(path)) is first
+        path.write_text(json.dumps({"agents": [{"name": "a"}]}), encoding="utf-8")
+        assert read_json_file_cached(str(path)) == {"agents": [{"name": "a"}]}
+
+    def test_load_profile_data_cached_until_file_changes(self, tmp_path):
+        from chatmode.agent import load_profile_data
+
+        path = tmp_path / "profile.json"
+        path.write_text(json.dumps({"name": "Ada"}))
+        first = load_profile_data(str(path))
+        assert load_profile_data(str(path)) is first
+
+        path.write_text(json.dumps({"name": "Grace!"}))
+        assert load_profile_data(str(path)) == {"name": "Grace!"}
+
+
+class TestAgentPrompt:
+    """Test prompt assembly in ChatAgent."""
+
+    def _agent(self, mock_settings, snippets):
+        from chatmode.agent import ChatAgent
+
+        agent = ChatAgent.__new__(ChatAgent)
+        agent.settings = mock_settings
+        agent.name = "ada"
+        agent.full_name = "Ada"
+        agent._reply_instruction = "Respond as Ada with a clear, direct reply."
+        agent.system_prompt = "You are Ada."
+        agent.memory_top_k = None
+        agent.max_context_tokens = None
+        agent.memory = Mock()
+        agent.memory.query.side_effect = snippets
+        agent._history_formatter = HistoryFormatter()
+        return agent
+
+    def test_dynamic_content_comes_after_stable_prefix(self, mock_settings):
+        agent = self._agent(
+            mock_settings, [[], [{"text": "recalled", "sender": "Bob"}]]
+        )
+        history = [{"sender": "Bob", "content": "Hi"}]
+
+        first = agent._build_messages("AI", history)
+        second = agent._build_messages(
+            "AI", history + [{"sender": "Ada", "content": "Hello"}]
+        )
+
+        assert first[:2] == second[:2]
+        assert [m["role"] for m in second].count("system") == 1
+        assert second[0]["role"] == "system"
+        assert first[1]["content"] == "Topic:\nAI"
+        assert second[2]["content"].startswith(first[2]["content"])
+        assert "recalled" in second[-2]["content"]
+        assert second[-1]["content"] == "Respond as Ada with a clear, direct reply."
+
+    def test_over_budget_drops_memory_then_history(self, mock_settings):
+        recalled = [{"text": "x" * 400, "sender": "Bob"}]
+        agent = self._agent(mock_settings, [recalled, recalled])
+        history = [{"sender": "Bob", "content": "y" * 400}]
+
+        agent.max_context_tokens = 150
+        messages = agent._build_messages("AI", history)
+        assert [m["content"] for m in messages[:2]] == ["You are Ada.", "Topic:\nAI"]
+        assert messages[2]["content"].startswith("Conversation so far:")
+        assert messages[-1]["content"].startswith("Respond as Ada")
+        assert not any("x" * 400 in m["content"] for m in messages)
+
+        agent.max_context_tokens = 40
+        contents = [m["content"] for m in agent._build_messages("AI", history)]
+        assert contents == [
+            "You are Ada.",
+            "Topic:\nAI",
+            "Respond as Ada with a clear, direct reply.",
+        ]
+
+    def test_prompt_cache_key_follows_topic(self, mock_settings):
+        agent = self._agent(mock_settings, [[], [], []])
+
+        agent._build_messages("AI", [])
+        first_key = agent._prompt_cache_key
+        agent._build_messages("AI", [{"sender": "Bob", "content": "Hi"}])
+        assert agent._prompt_cache_key == first_key
+        assert first_key.startswith("chatmode:ada:")
+
+        agent._build_messages("Space", [])
+        assert agent._prompt_cache_key != first_key
+
+
+class TestSemanticCache:
+    """Test the agent response cache."""
+
+    def test_exact_hit_and_miss(self):
+        from chatmode.semantic_cache import SemanticCache, make_cache_key
+
+        cache = SemanticCache()
+        key = make_cache_key("ada", "topic")
+        assert cache.get(key) is None
+        cache.put(key, "reply")
+        assert cache.get(key) == "reply"
+        assert make_cache_key("ad", "atopic") != key
+        assert cache.stats() == {
+            "entries": 1,
+            "hits": 1,
+            "semantic_hits": 0,
+            "misses": 1,
+        }
+
+    def test_semantic_hit_above_threshold(self):
+        from chatmode.semantic_cache import SemanticCache
+
+        vectors = {"cats": [1.0, 0.0], "kittens": [0.99, 0.1], "cars": [0.0, 1.0]}
+        cache = SemanticCache(
+            embed_fn=lambda texts: [vectors[t] for t in texts], threshold=0.9
+        )
+        cache.put("k1", "about cats", text="cats")
+
+        assert cache.get("k2", text="kittens") == "about cats"
+        assert cache.get("k3", text="cars") is None
+        assert cache.semantic_hits == 1
+
+    def test_lookup_embedding_reused_by_put(self):
+        from chatmode.semantic_cache import SemanticCache
+
+        calls = []
+
+        def embed(texts):
+            calls.extend(texts)
+            return [[1.0, 0.0] for _ in texts]
+
+        cache = SemanticCache(embed_fn=embed)
+        cached, embedding = cache.lookup("k1", "prompt")
+        assert cached is None
+        cache.put("k1", "reply", embedding=embedding)
+
+        assert calls == ["prompt"]
+        assert cache.get("k2", text="prompt") == "reply"
+
+    def test_semantic_slots_released_on_eviction(self):
+        from chatmode.semantic_cache import SemanticCache
+
+        vectors = {"a": [1.0, 0.0], "b": [0.0, 1.0], "c": [0.7, 0.7]}
+        cache = SemanticCache(
+            embed_fn=lambda texts: [vectors[t] for t in texts],
+            threshold=0.99,
+            max_entries=2,
+        )
+        cache.put("ka", "A", text="a")
+        cache.put("kb", "B", text="b")
+        cache.put("kc", "C", text="c")
+
+        # "a" was evicted, so its vector no longer matches anything
+        assert cache.get("q1", text="a") is None
+        assert cache.get("q2", text="b") == "B"
+        assert cache.get("q3", text="c") == "C"
+
+    def test_semantic_lookup_skips_expired(self):
+        from chatmode.semantic_cache import SemanticCache
+
+        cache = SemanticCache(embed_fn=lambda texts: [[1.0, 0.0]], ttl=10)
+        cache.put("k1", "old", text="x")
+        with patch("chatmode.semantic_cache.time.monotonic", return_value=1e12):
+            assert cache.get("k2", text="x") is None
+
+    def test_ttl_and_eviction(self):
+        from chatmode.semantic_cache import SemanticCache
+
+        cache = SemanticCache(ttl=0, max_entries=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.put("c", "3")
+        assert cache.stats()["entries"] == 2
+        with patch("chatmode.semantic_cache.time.monotonic", return_value=1e12):
+            assert cache.get("c") is None
+
+    def test_agent_reuses_cached_reply(self, mock_settings):
+        from chatmode.agent import ChatAgent
+        from chatmode.semantic_cache import SemanticCache
+
+        mock_settings.tts_enabled = False
+        agent = ChatAgent.__new__(ChatAgent)
+        agent.name = "ada"
+        agent.model = "m"
+        agent.system_prompt = "You are Ada."
+        agent.settings = mock_settings
+        agent.temperature_override = 0.0
+        agent.max_output_tokens_override = None
+        agent.mcp_client = None
+        agent.allowed_tools = []
+        agent.params = {}
+        agent.response_cache = SemanticCache()
+        agent._build_messages = Mock(return_value=[])
+        agent.chat_provider = Mock()
+        agent.chat_provider.chat.return_value = "Hello"
+
+        history = [{"sender": "Bob", "content": "Hi"}]
+        assert agent.generate_response("AI", history)[0] == "Hello"
+        assert agent.generate_response("AI", history)[0] == "Hello"
+        assert agent.chat_provider.chat.call_count == 1
+
+        agent.temperature_override = 0.9
+        agent.generate_response("AI", history)
+        assert agent.chat_provider.chat.call_count == 2
+
+    def test_next_turn_does_not_replay_similar_reply(self, mock_settings):
+        """Overlapping history windows must not produce a similarity hit."""
+        from chatmode.agent import ChatAgent
+        from chatmode.semantic_cache import SemanticCache
+
+        mock_settings.tts_enabled = False
+        agent = ChatAgent.__new__(ChatAgent)
+        agent.name = "ada"
+        agent.model = "m"
+        agent.system_prompt = "You are Ada."
+        agent.settings = mock_settings
+        agent.temperature_override = 0.0
+        agent.max_output_tokens_override = None
+        agent.mcp_client = None
+        agent.allowed_tools = []
+        agent.params = {}
+        # Every text embeds identically, so only the guard can cause a miss
+        agent.response_cache = SemanticCache(
+            embed_fn=lambda texts: [[1.0, 0.0] for _ in texts]
+        )
+        agent._build_messages = Mock(return_value=[])
+        agent.chat_provider = Mock()
+        agent.chat_provider.chat.side_effect = ["First", "Second"]
+
+        history = [
+            {"sender": "Bob" if i % 2 else "Ada", "content": f"line {i}"}
+            for i in range(6)
+        ]
+        next_history = history[1:] + [{"sender": "Bob", "content": "line 6"}]
+
+        assert agent.generate_response("AI", history)[0] == "First"
+        assert agent.generate_response("AI", next_history)[0] == "Second"
+        assert agent.response_cache.semantic_hits == 0
+
+
 # ============================================================================
 # Memory Tests
 # ============================================================================
@@ -131,6 +476,15 @@ class TestMemoryStore:
         assert store.collection_name == unique_collection_name
         assert store.count() == 0
 
+    def test_memory_stores_share_client_per_dir(
+        self, mock_embedding_provider, tmp_path
+    ):
+        """Stores on the same persist dir reuse one Chroma client."""
+        first = MemoryStore("shared_a", str(tmp_path), mock_embedding_provider)
+        second = MemoryStore("shared_b", str(tmp_path), mock_embedding_provider)
+        assert first.client is second.client
+        assert first.collection_name != second.collection_name
+
     def test_memory_add_with_metadata(
         self, mock_embedding_provider, tmp_path, unique_collection_name
     ):
@@ -199,15 +553,103 @@ class TestMemoryStore:
         assert store.count() == 0
 
 
+class TestEmbedderConfig:
+    """Test embedder configuration for CrewAI memory."""
+
+    def test_embedder_cache_key_tracks_embedding_settings(self, mock_settings):
+        key = mock_settings.embedder_cache_key()
+        hash(key)
+        mock_settings.embedding_model = "other-model"
+        assert mock_settings.embedder_cache_key() != key
+
+    def test_create_embedder_config_is_memoized(self, mock_settings):
+        pytest.importorskip("crewai")
+        from chatmode.llm_config import _embedder_config_cached, create_embedder_config
+
+        _embedder_config_cached.cache_clear()
+        first = create_embedder_config(mock_settings)
+        first["config"]["model_name"] = "mutated"
+        second = create_embedder_config(mock_settings)
+
+        assert second["config"]["model_name"] == mock_settings.embedding_model
+        assert _embedder_config_cached.cache_info().hits == 1
+
+    def test_load_settings_cached_until_reload(self, monkeypatch):
+        from chatmode.config import load_settings, reload_settings
+
+        first = load_settings()
+        monkeypatch.setenv("MEMORY_TOP_K", "11")
+        assert load_settings() is first
+
+        reloaded = reload_settings()
+        assert reloaded.memory_top_k == 11
+        assert load_settings() is reloaded
+
+
 # ============================================================================
 # Provider Tests
 # ============================================================================
 
 
+class TestOpenAIChatProvider:
+    """Test OpenAI-compatible chat provider."""
+
+    def test_openai_clients_share_connection_pool(self):
+        from chatmode.providers import OpenAIEmbeddingProvider, close_http_clients
+
+        chat = OpenAIChatProvider(base_url="http://localhost:8000/v1", api_key="k")
+        embed = OpenAIEmbeddingProvider(
+            base_url="https://api.openai.com/v1", api_key="k", model="e"
+        )
+        assert chat.client._client is embed.client._client
+
+        close_http_clients()
+        assert chat.client._client.is_closed
+        fresh = OpenAIChatProvider(base_url="http://localhost:8000/v1", api_key="k")
+        assert not fresh.client._client.is_closed
+
+    def test_build_chat_provider_reuses_instance_per_endpoint(self):
+        from chatmode.providers import build_chat_provider, close_http_clients
+
+        url = "http://localhost:8000/v1"
+        first = build_chat_provider("openai", url, "k")
+        assert build_chat_provider("openai", url, "k") is first
+        assert build_chat_provider("openai", url, "k2") is not first
+
+        close_http_clients()
+        fresh = build_chat_provider("openai", url, "k")
+        assert fresh is not first
+        assert not fresh.client._client.is_closed
+
+    def test_client_uses_bounded_timeout(self):
+        from chatmode.providers import LLM_CONNECT_TIMEOUT, LLM_READ_TIMEOUT
+
+        provider = OpenAIChatProvider(base_url="http://localhost:8000/v1", api_key="k")
+        assert provider.client.timeout.read == LLM_READ_TIMEOUT
+        assert provider.client.timeout.connect == LLM_CONNECT_TIMEOUT
+
+    def test_openai_prompt_cache_key_only_for_openai_host(self):
+        openai_provider = OpenAIChatProvider(
+            base_url="https://api.openai.com/v1", api_key="k"
+        )
+        local_provider = OpenAIChatProvider(
+            base_url="http://localhost:8000/v1", api_key="k"
+        )
+        for provider in (openai_provider, local_provider):
+            provider.client = Mock()
+            provider.client.chat.completions.create.return_value = Mock(choices=[])
+            provider.chat("m", [], 0.5, 10, cache_key="chatmode:ada:abc")
+
+        sent = openai_provider.client.chat.completions.create.call_args.kwargs
+        assert sent["prompt_cache_key"] == "chatmode:ada:abc"
+        sent = local_provider.client.chat.completions.create.call_args.kwargs
+        assert "prompt_cache_key" not in sent
+
+
 class TestOllamaEmbeddingProvider:
     """Test Ollama embedding provider."""
 
-    @patch("chatmode.providers.requests.post")
+    @patch("chatmode.providers._http_session.post")
     def test_embed_uses_new_api_first(self, mock_post):
         """Test that new /api/embed endpoint is tried first."""
         mock_response = Mock()
@@ -226,7 +668,7 @@ class TestOllamaEmbeddingProvider:
         assert "/api/embed" in call_url
         assert result == [[0.1, 0.2, 0.3]]
 
-    @patch("chatmode.providers.requests.post")
+    @patch("chatmode.providers._http_session.post")
     def test_embed_falls_back_to_legacy(self, mock_post):
         """Test fallback to legacy /api/embeddings endpoint."""
         from requests import RequestException
@@ -255,6 +697,53 @@ class TestOllamaEmbeddingProvider:
         assert call_count[0] == 2  # Verify both endpoints were tried
 
 
+class TestOllamaChatProvider:
+    """Test Ollama chat provider."""
+
+    @patch("chatmode.providers._http_session.post")
+    def test_chat_sends_json_body_and_reads_content(self, mock_post):
+        """The request body is valid JSON and the reply content is returned."""
+        mock_post.return_value.json.return_value = {"message": {"content": "Hello"}}
+
+        provider = OllamaChatProvider(base_url="http://localhost:11434")
+        message = provider.chat("m", [], 0.5, 10)
+
+        assert message.content == "Hello"
+        kwargs = mock_post.call_args.kwargs
+        body = kwargs.get("data") or json.dumps(kwargs["json"])
+        assert json.loads(body)["stream"] is False
+
+
+class TestProviderModelSync:
+    """Test model discovery against provider /models endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_models_reuses_callers_session(self):
+        """A shared session is used as-is; no per-call session is opened."""
+        from unittest.mock import AsyncMock
+
+        from chatmode.services import provider_sync
+
+        response = MagicMock(status=200)
+        response.raise_for_status = Mock()
+        response.json = AsyncMock(return_value={"data": [{"id": "gpt-4o"}]})
+        session = MagicMock()
+        session.get.return_value.__aenter__ = AsyncMock(return_value=response)
+        session.get.return_value.__aexit__ = AsyncMock(return_value=False)
+        headers = {"X-Team": "a"}
+
+        with patch.object(provider_sync.aiohttp, "ClientSession") as new_session:
+            models = await provider_sync.fetch_models_from_provider(
+                "https://api.example.com", "key", headers, session=session
+            )
+
+        new_session.assert_not_called()
+        assert [m["id"] for m in models] == ["gpt-4o"]
+        sent = session.get.call_args.kwargs["headers"]
+        assert sent["Authorization"] == "Bearer key"
+        assert headers == {"X-Team": "a"}
+
+
 # ============================================================================
 # Session Tests
 # ============================================================================
@@ -305,6 +794,54 @@ class TestSessionManagement:
         assert session.history[0]["sender"] == "Admin"
         assert session.history[0]["content"] == "Please focus on the topic"
 
+    @pytest.mark.asyncio
+    async def test_maybe_summarize_replaces_oldest_half(self, mock_settings):
+        """Overflowing history keeps the newest half behind a summary entry."""
+        from chatmode.session import ChatSession
+
+        mock_settings.history_max_messages = 4
+        session = ChatSession(mock_settings)
+        session.history = [{"sender": "A", "content": str(i)} for i in range(5)]
+
+        with patch.object(
+            session, "_summarize_old_messages_async", return_value="gist"
+        ) as summarize:
+            await session._maybe_summarize()
+
+        summarize.assert_awaited_once()
+        assert [m["content"] for m in session.history] == [
+            "Previous conversation summary: gist",
+            "2",
+            "3",
+            "4",
+        ]
+
+    def test_get_agent_follows_agent_list(self, mock_settings):
+        """Agent lookup by name tracks reassignment of the agent list."""
+        from chatmode.session import ChatSession
+
+        session = ChatSession(mock_settings)
+        ada, bob = Mock(), Mock()
+        ada.name, bob.name = "ada", "bob"
+
+        assert session.get_agent("ada") is None
+        session.agents = [ada, bob]
+        assert session.get_agent("bob") is bob
+        session.agents = [ada]
+        assert session.get_agent("bob") is None
+
+    def test_last_messages_window(self, mock_settings):
+        """Only the most recent messages are kept for status polling."""
+        from chatmode.session import LAST_MESSAGES_LIMIT, ChatSession
+
+        session = ChatSession(mock_settings)
+        for i in range(LAST_MESSAGES_LIMIT + 3):
+            session.inject_message("Admin", f"message {i}")
+
+        assert len(session.history) == LAST_MESSAGES_LIMIT + 3
+        assert len(session.last_messages) == LAST_MESSAGES_LIMIT
+        assert session.last_messages[0]["content"] == "message 3"
+
     def test_session_clear_memory(self, mock_settings):
         """Test memory clearing."""
         from chatmode.session import ChatSession
@@ -317,6 +854,233 @@ class TestSessionManagement:
         assert len(session.history) == 0
         assert len(session.last_messages) == 0
 
+    @pytest.mark.asyncio
+    async def test_parallel_round_records_in_agent_order(self, mock_settings):
+        """Parallel rounds see one snapshot and append replies in agent order."""
+        import time
+
+        from chatmode.session import ChatSession
+
+        mock_settings.tts_enabled = False
+        mock_settings.parallel_rounds = True
+        mock_settings.sleep_seconds = 0
+        session = ChatSession(mock_settings)
+        session._running = True
+        session.inject_message("Admin", "Go")
+
+        seen_history_lengths = []
+
+        def make_agent(name, delay):
+            agent = Mock()
+            agent.name = name
+            agent.full_name = name.title()
+
+            def generate(topic, history):
+                seen_history_lengths.append(len(history))
+                time.sleep(delay)
+                return f"{name} reply"
+
+            agent.generate_response = generate
+            return agent
+
+        session.agents = [make_agent("slow", 0.05), make_agent("fast", 0)]
+        for agent in session.agents:
+            await session.state_manager.register_agent(agent.name)
+
+        await session._run_multi_agent_mode({"slow", "fast"})
+
+        assert [m["content"] for m in session.history] == [
+            "Go",
+            "slow reply",
+            "fast reply",
+        ]
+        assert seen_history_lengths == [1, 1]
+
+    @pytest.mark.asyncio
+    async def test_tts_uses_per_agent_voice_resolved_on_assignment(
+        self, mock_settings
+    ):
+        """Voice overrides fall back to the settings defaults per agent."""
+        from unittest.mock import AsyncMock
+
+        from chatmode.session import ChatSession
+        from chatmode.tts_provider import TTSResult
+
+        session = ChatSession(mock_settings)
+        session._tts_provider = Mock()
+        session._tts_provider.synthesize = AsyncMock(
+            return_value=TTSResult(
+                audio_bytes=b"x", format="mp3", mime_type="audio/mpeg"
+            )
+        )
+        session.audio_storage = Mock()
+        session.audio_storage.get_cached_path.return_value = None
+        session.audio_storage.save_audio.return_value = ("s/m.mp3", False)
+
+        ada, bob = Mock(), Mock()
+        ada.name, ada.tts_voice_override, ada.tts_model_override = "ada", "nova", None
+        bob.name, bob.tts_voice_override, bob.tts_model_override = "bob", None, None
+        session.agents = [ada, bob]
+        assert session._tts_voices == {
+            "ada": ("nova", "tts-1"),
+            "bob": ("alloy", "tts-1"),
+        }
+
+        await session._generate_tts("hi", ada, "m1")
+        kwargs = session._tts_provider.synthesize.call_args.kwargs
+        assert (kwargs["voice"], kwargs["model"]) == ("nova", "tts-1")
+
+    @pytest.mark.asyncio
+    async def test_tts_cache_hit_skips_synthesis(self, mock_settings):
+        """Audio already on disk is reused without calling the provider."""
+        from unittest.mock import AsyncMock
+
+        from chatmode.session import ChatSession
+
+        session = ChatSession(mock_settings)
+        session._tts_provider = Mock()
+        session._tts_provider.synthesize = AsyncMock()
+        session.audio_storage = Mock()
+        session.audio_storage.get_cached_path.return_value = "cache/abc.mp3"
+
+        agent = Mock(tts_voice_override=None, tts_model_override=None)
+        agent.name = "ada"
+        info = await session._generate_tts("hi", agent, "m1")
+
+        assert info["audio_url"] == "/audio/cache/abc.mp3"
+        assert info["audio_cached"] is True
+        session._tts_provider.synthesize.assert_not_called()
+        session.audio_storage.save_audio.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_turn_recorded_before_audio_is_ready(self, mock_settings):
+        """TTS runs behind the conversation and fills in the entry later."""
+        import asyncio
+
+        from chatmode.session import ChatSession
+
+        session = ChatSession(mock_settings)
+        session._running = True
+        release = asyncio.Event()
+
+        async def slow_tts(text, agent, message_id):
+            await release.wait()
+            return {"audio_url": f"/audio/{text}.mp3"}
+
+        agent = Mock()
+        agent.name = "ada"
+        agent.full_name = "Ada"
+        agent.generate_response = lambda topic, history: "hello"
+        session.agents = [agent]
+        await session.state_manager.register_agent("ada")
+
+        with patch.object(session, "_generate_tts", side_effect=slow_tts):
+            assert await session._run_agent_turn(agent)
+            entry = session.history[-1]
+            assert entry["content"] == "hello" and "audio_url" not in entry
+
+            release.set()
+            await session._close_tts_worker(drain=True)
+        await session._flush_memories()
+
+        assert entry["audio_url"] == "/audio/hello.mp3"
+
+    @pytest.mark.asyncio
+    async def test_memory_writes_run_off_loop_until_flushed(self, mock_settings):
+        """Recording a turn queues memory writes that the round end awaits."""
+        import threading
+
+        from chatmode.session import ChatSession
+
+        session = ChatSession(mock_settings)
+        threads = []
+        listener = Mock()
+        listener.name = "listener"
+        listener.remember_message.side_effect = lambda *a, **kw: threads.append(
+            threading.current_thread()
+        )
+        listener.full_name = "Listener"
+        session.agents = [listener]
+
+        session._record_turn(listener, "hi", {"sender": "Listener", "content": "hi"})
+        assert len(session._pending_memories) == 1
+
+        await session._flush_memories()
+        assert session._pending_memories == []
+        assert threads and threads[0] is not threading.main_thread()
+        listener.remember_message.assert_called_once_with(
+            "Listener", "hi", session_id=None, topic=""
+        )
+
+    def test_load_agents_preserves_config_order(self, mock_settings):
+        """Agents are built concurrently but returned in config order."""
+        import time
+
+        from chatmode import session as session_module
+
+        config = {
+            "agents": [
+                {"name": "slow", "file": "a.json"},
+                {"name": "fast", "file": "b.json"},
+            ]
+        }
+
+        def fake_agent(name, config_file, settings):
+            if name == "slow":
+                time.sleep(0.05)
+            return Mock(name=name, agent_name=name)
+
+        with patch.object(session_module, "read_json_file_cached", return_value=config):
+            with patch.object(session_module, "ChatAgent", side_effect=fake_agent):
+                agents = session_module.load_agents(mock_settings)
+
+        assert [a.agent_name for a in agents] == ["slow", "fast"]
+
+    @pytest.mark.asyncio
+    async def test_queue_tts_skips_blank_and_oversized_replies(self, mock_settings):
+        """Whitespace-only and over-long replies never reach the TTS worker."""
+        from chatmode.session import MAX_TTS_CHARS, ChatSession
+
+        session = ChatSession(mock_settings)
+        agent = Mock(full_name="Agent A")
+        for content in ("", "  \n ", "x" * (MAX_TTS_CHARS + 1)):
+            await session._queue_tts(agent, {"sender": "Agent A", "content": content})
+
+        assert session._tts_worker is None
+
+    @pytest.mark.asyncio
+    async def test_long_reply_truncated_in_history(self, mock_settings):
+        """History keeps a bounded copy of a reply; memory gets it in full."""
+        from chatmode.session import MAX_STORED_CHARS, TRUNCATION_MARKER, ChatSession
+
+        mock_settings.tts_enabled = False
+        session = ChatSession(mock_settings)
+        session._running = True
+        agent = Mock()
+        agent.name = "talker"
+        agent.full_name = "Talker"
+        agent.generate_response = Mock(return_value="y" * (MAX_STORED_CHARS + 10))
+        await session.state_manager.register_agent(agent.name)
+
+        response, entry = await session._generate_turn(agent)
+
+        assert len(response) == MAX_STORED_CHARS + 10
+        assert entry["content"] == "y" * MAX_STORED_CHARS + TRUNCATION_MARKER
+
+    def test_history_snapshot_ignores_later_appends(self):
+        """A round's history snapshot stays fixed while the session appends."""
+        from chatmode.session import HistorySnapshot
+
+        history = [{"sender": "a", "content": str(i)} for i in range(3)]
+        snapshot = HistorySnapshot(history)
+        history.append({"sender": "b", "content": "late"})
+
+        assert len(snapshot) == 3
+        assert snapshot[-1]["content"] == "2"
+        assert [m["content"] for m in snapshot[-5:]] == ["0", "1", "2"]
+        with pytest.raises(IndexError):
+            snapshot[3]
+
 
 # ============================================================================
 # API Tests
@@ -1,3 +1,6 @@
+import asyncio
+import time
+
 import pytest
 from unittest.mock import Mock
 
@@ -28,6 +31,33 @@ def test_message_rate_clamps_and_affects_turn_delay():
     assert session._compute_turn_delay(0.001) == 0.05
 
 
+@pytest.mark.asyncio
+async def test_pace_counts_elapsed_time_and_wakes_on_stop():
+    session = ChatSession(Mock())
+    session._running = True
+
+    begin = time.monotonic()
+    await session._pace(5.0, started=time.monotonic() - 5.0)
+    assert time.monotonic() - begin < 0.5
+
+    waiter = asyncio.create_task(session._pace(5.0, started=time.monotonic()))
+    await asyncio.sleep(0.01)
+    session._stop_event.set()
+    await asyncio.wait_for(waiter, timeout=1.0)
+
+
+@pytest.mark.asyncio
+async def test_wait_for_change_wakes_on_injected_message():
+    session = ChatSession(Mock())
+
+    assert not await session.wait_for_change(timeout=0.01)
+
+    waiter = asyncio.create_task(session.wait_for_change(timeout=5.0))
+    await asyncio.sleep(0.01)
+    session.inject_message("Admin", "hello")
+    assert await asyncio.wait_for(waiter, timeout=1.0)
+
+
 @pytest.mark.asyncio
 async def test_control_status_payload_includes_message_rate():
     session = ChatSession(Mock())
@@ -40,3 +70,39 @@ async def test_control_status_payload_includes_message_rate():
     assert payload["topic"] == "Status topic"
     assert payload["message_rate"] == 1.7
     assert payload["last_messages"][0]["sender"] == "A"
+
+
+@pytest.mark.asyncio
+async def test_resume_waits_for_stop_to_finish_old_loop():
+    session = ChatSession(Mock())
+    session.topic = "Topic"
+    session.agents = [Mock(tts_voice_override="v", tts_model_override="m")]
+    session.state_manager = Mock()
+
+    async def stop_agent(name, reason):
+        return None
+
+    session.state_manager.stop_agent = stop_agent
+
+    async def old_loop():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            # Cleanup in the old loop's finally takes a moment
+            await asyncio.sleep(0.05)
+            raise
+
+    old_task = asyncio.create_task(old_loop())
+    await asyncio.sleep(0)
+    session._task = old_task
+    session._running = True
+
+    spawned_after = []
+    session._spawn_loop = lambda: spawned_after.append(old_task.done())
+
+    stopping = asyncio.create_task(session.stop())
+    await asyncio.sleep(0.01)
+    assert await session.resume() is True
+    await stopping
+
+    assert spawned_after == [True]
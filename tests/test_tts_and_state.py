@@ -3,6 +3,7 @@ Unit tests for TTS provider and agent state management.
 """
 
 import asyncio
+import time
 import pytest
 from pathlib import Path
 from unittest.mock import Mock, patch, AsyncMock
@@ -13,6 +14,7 @@ from chatmode.tts_provider import (
     TTSResult,
     OpenAICompatibleTTSProvider,
     AudioStorage,
+    TTSClient,
     TTSProviderError,
 )
 from chatmode.agent_state import (
@@ -85,6 +87,13 @@ class TestAudioStorage:
         hash2 = storage._compute_hash("world", "alloy", "tts-1", "mp3", 1.0)
         assert hash1 != hash2
 
+    def test_compute_hash_field_boundaries(self, storage):
+        """Moving a separator between fields should change the hash."""
+        hash1 = storage._compute_hash("a:b", "alloy", "tts-1", "mp3", None)
+        hash2 = storage._compute_hash("a", "b:alloy", "tts-1", "mp3", None)
+        assert hash1 != hash2
+        assert len(hash1) == 16
+
     def test_save_and_retrieve(self, storage):
         """Test saving and retrieving audio."""
         audio_bytes = b"fake audio data"
@@ -107,6 +116,25 @@ class TestAudioStorage:
         assert full_path.exists()
         assert full_path.read_bytes() == audio_bytes
 
+    def test_save_audio_leaves_no_temp_files(self, storage):
+        """Session copy is linked to the cache entry; no .tmp files remain."""
+        relative_path, _ = storage.save_audio(
+            audio_bytes=b"linked audio",
+            session_id="test-session",
+            message_id="msg-1",
+            text="Linked",
+            voice="alloy",
+            model="tts-1",
+            format="mp3",
+        )
+
+        session_file = storage.get_audio_path(relative_path)
+        (cache_file,) = (storage.base_dir / "cache").glob("*.mp3")
+        assert session_file.samefile(cache_file) or (
+            session_file.read_bytes() == cache_file.read_bytes()
+        )
+        assert not list(storage.base_dir.rglob("*.tmp"))
+
     def test_caching(self, storage):
         """Test that identical content is cached."""
         audio_bytes = b"fake audio data"
@@ -137,6 +165,23 @@ class TestAudioStorage:
 
         assert cached2
 
+    def test_get_cached_path(self, storage):
+        """Saved audio is found by content before any synthesis."""
+        assert storage.get_cached_path("Hello", "alloy", "tts-1", "mp3") is None
+        storage.save_audio(
+            audio_bytes=b"fake audio data",
+            session_id="session-1",
+            message_id="msg-1",
+            text="Hello",
+            voice="alloy",
+            model="tts-1",
+            format="mp3",
+        )
+
+        relative_path = storage.get_cached_path("Hello", "alloy", "tts-1", "mp3")
+        assert storage.get_audio_path(relative_path).read_bytes() == b"fake audio data"
+        assert storage.get_cached_path("Hello", "nova", "tts-1", "mp3") is None
+
     def test_cleanup_session(self, storage):
         """Test session cleanup."""
         audio_bytes = b"fake audio"
@@ -157,6 +202,34 @@ class TestAudioStorage:
         storage.cleanup_session("session-to-cleanup")
 
         assert not session_dir.exists()
+        # Cached copy survives and cleaning a missing session is a no-op
+        assert list((storage.base_dir / "cache").glob("*.mp3"))
+        storage.cleanup_session("session-to-cleanup")
+
+    def test_session_dir_recreated_after_cleanup(self, storage):
+        """Session dirs are memoized but recreated once cleaned up."""
+        kwargs = dict(voice="alloy", model="tts-1", format="mp3")
+        storage.save_audio(b"one", "s1", "m1", text="One", **kwargs)
+        storage.cleanup_session("s1")
+
+        relative_path, cached = storage.save_audio(
+            b"two", "s1", "m2", text="Two", **kwargs
+        )
+
+        assert not cached
+        assert storage.get_audio_path(relative_path).read_bytes() == b"two"
+
+    @pytest.mark.asyncio
+    async def test_acleanup_session_nested(self, storage):
+        """Async cleanup also removes nested session directories."""
+        session_dir = storage.base_dir / "nested-session"
+        (session_dir / "sub").mkdir(parents=True)
+        (session_dir / "sub" / "a.mp3").write_bytes(b"a")
+        (session_dir / "b.mp3").write_bytes(b"b")
+
+        await storage.acleanup_session("nested-session")
+
+        assert not session_dir.exists()
 
 
 class TestAgentStateManager:
@@ -258,6 +331,28 @@ class TestAgentStateManager:
 
         mock_task.cancel.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_stop_waits_for_task_outside_lock(self, manager):
+        await manager.register_agent("agent-1")
+
+        async def generate():
+            try:
+                await asyncio.sleep(30)
+            finally:
+                # Mirrors ChatSession._generate_turn clearing its task
+                await manager.set_task("agent-1", None)
+
+        task = asyncio.create_task(generate())
+        await manager.set_task("agent-1", task)
+        await asyncio.sleep(0)
+
+        started = time.monotonic()
+        assert await manager.stop_agent("agent-1")
+        assert time.monotonic() - started < 1.0
+        assert task.cancelled()
+        state = await manager.get_state("agent-1")
+        assert state.state == AgentState.STOPPED
+
     @pytest.mark.asyncio
     async def test_unknown_agent_operations(self, manager):
         # Operations on unknown agents should return False
@@ -284,6 +379,50 @@ class TestOpenAICompatibleTTSProvider:
 
         await provider.close()
 
+    @pytest.mark.asyncio
+    async def test_client_keeps_connections_between_turns(self):
+        import httpx
+
+        with patch(
+            "chatmode.tts_provider.httpx.AsyncClient", wraps=httpx.AsyncClient
+        ) as client_cls:
+            provider = OpenAICompatibleTTSProvider(
+                base_url="https://api.openai.com/v1",
+                api_key="test-key",
+                max_concurrency=3,
+                warmup=False,
+            )
+        limits = client_cls.call_args.kwargs["limits"]
+        assert limits.max_keepalive_connections == 3
+        assert limits.keepalive_expiry > 5.0
+        await provider.close()
+
+    @pytest.mark.asyncio
+    async def test_warmup_sends_head_request(self):
+        import httpx
+
+        methods = []
+        transport = httpx.MockTransport(
+            lambda request: methods.append(request.method) or httpx.Response(200)
+        )
+        real_client = httpx.AsyncClient
+        with patch(
+            "chatmode.tts_provider.httpx.AsyncClient",
+            side_effect=lambda **kw: real_client(transport=transport, **kw),
+        ):
+            provider = OpenAICompatibleTTSProvider(
+                base_url="https://api.openai.com/v1", api_key="test-key"
+            )
+        await provider._warmup_task
+        assert methods == ["HEAD"]
+        await provider.close()
+
+    def test_no_warmup_without_running_loop(self):
+        provider = OpenAICompatibleTTSProvider(
+            base_url="https://api.openai.com/v1", api_key="test-key"
+        )
+        assert provider._warmup_task is None
+
     @pytest.mark.asyncio
     async def test_get_available_voices(self):
         provider = OpenAICompatibleTTSProvider(
@@ -330,6 +469,92 @@ class TestOpenAICompatibleTTSProvider:
         await provider.close()
 
 
+class TestLegacyTTSClient:
+    """Test the legacy synchronous TTS client."""
+
+    def test_speak_reuses_background_loop(self, tmp_path):
+        client = TTSClient(
+            base_url="https://api.openai.com/v1",
+            api_key="test-key",
+            model="tts-1",
+            voice="alloy",
+            output_dir=str(tmp_path),
+        )
+        loops = []
+
+        async def fake_synthesize(**kwargs):
+            loops.append(asyncio.get_running_loop())
+            return TTSResult(audio_bytes=b"audio", format="mp3", mime_type="audio/mpeg")
+
+        with patch.object(client._provider, "synthesize", side_effect=fake_synthesize):
+            path1 = client.speak("Hello")
+            path2 = client.speak("World")
+
+        assert Path(path1).read_bytes() == b"audio"
+        assert Path(path2).exists()
+        assert loops[0] is loops[1]
+
+
+class TestSynthesizeRetry:
+    """Test which synthesis failures are retried."""
+
+    async def _provider_with(self, handler):
+        import httpx
+
+        provider = OpenAICompatibleTTSProvider(
+            base_url="https://api.openai.com/v1",
+            api_key="test-key",
+        )
+        await provider.client.aclose()
+        provider.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return provider
+
+    @pytest.mark.asyncio
+    async def test_client_error_not_retried(self):
+        import httpx
+
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(400, text="bad voice")
+
+        provider = await self._provider_with(handler)
+        with pytest.raises(TTSProviderError) as exc_info:
+            await provider.synthesize("Hello", voice="alloy")
+        assert exc_info.value.status_code == 400
+        assert len(calls) == 1
+        await provider.close()
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_honours_retry_after(self):
+        import httpx
+
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(503),
+            httpx.Response(200, content=b"audio"),
+        ]
+
+        def handler(request):
+            return responses.pop(0)
+
+        provider = await self._provider_with(handler)
+        with patch("chatmode.tts_provider.asyncio.sleep", new=AsyncMock()) as sleep:
+            result = await provider.synthesize("Hello", voice="alloy")
+
+        assert result.audio_bytes == b"audio"
+        assert [c.args[0] for c in sleep.await_args_list] == [2.0, 2.0]
+        await provider.close()
+
+    @pytest.mark.asyncio
+    async def test_empty_text_fails_without_request(self):
+        provider = await self._provider_with(lambda request: None)
+        with pytest.raises(ValueError):
+            await provider.synthesize("", voice="alloy")
+        await provider.close()
+
+
 class TestTTSProviderError:
     """Test TTS provider error handling."""
 
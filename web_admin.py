@@ -9,9 +9,12 @@ from sqlalchemy.orm import Session
 
 from chatmode.config import load_settings
 from chatmode.session import ChatSession
-from chatmode.database import init_db, get_db
+from chatmode.database import SessionLocal, init_db, get_db, warm_pool
 from chatmode.content_filter import ContentFilter, create_filter_from_permissions
 from chatmode import crud
+from chatmode.memory import close_shared_clients
+from chatmode.providers import close_http_clients
+from chatmode.audit import audit_batcher
 from chatmode.logger_config import setup_logging, get_logger
 
 # Load settings and setup logging
@@ -32,7 +35,12 @@ async def lifespan(app: FastAPI):
     init_db()
     # Load content filter settings from first enabled agent
     setup_content_filter()
+    warm_pool()
+    audit_batcher.start(SessionLocal)
     yield
+    audit_batcher.stop()
+    close_shared_clients()
+    close_http_clients()
 
 
 app = FastAPI(
@@ -341,10 +349,16 @@ def status(request: Request):
 
 
 @app.get("/profiles")
-def list_profiles():
-    """List available agent profiles from the profiles directory."""
+def list_profiles(metadata_only: bool = False):
+    """List available agent profiles from the profiles directory.
+
+    With ``metadata_only`` set, only name/model/api/speak_model are read from
+    each file, which keeps listing cheap for profiles with long prompts.
+    """
     import glob
-    import json
+
+    from chatmode.agent import get_profile_metadata
+    from chatmode.utils import read_json_file_cached
 
     profiles = []
     profiles_dir = "profiles"
@@ -356,11 +370,15 @@ def list_profiles():
 
         for f_path in files:
             try:
-                with open(f_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    # Add filename to help identify source
-                    data["_filename"] = os.path.basename(f_path)
-                    profiles.append(data)
+                if metadata_only:
+                    data = get_profile_metadata(f_path)
+                else:
+                    # Parsed once per file version; copied because the cached
+                    # object is shared and gets a _filename key below
+                    data = dict(read_json_file_cached(f_path))
+                # Add filename to help identify source
+                data["_filename"] = os.path.basename(f_path)
+                profiles.append(data)
             except Exception as e:
                 print(f"Error reading profile {f_path}: {e}")
 